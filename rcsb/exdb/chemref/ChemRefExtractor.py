@@ -8,6 +8,7 @@
 #  7-Jan-2019  jdw moved from ChemRefEtlWorker.
 #  3-Sep-2019  jdw moved again to module rcsb.exdb.chemref
 # 14-Aug-2025  dwp rename bird_chem_comp_core to core_chem_comp
+# 17-Oct-2026  dwp group accession mappings with server-side aggregation
 #
 ##
 __docformat__ = "google en"
@@ -46,7 +47,6 @@ class ChemRefExtractor(object):
             databaseName = "dw"
             collectionName = "core_chem_comp"
             selectD = {"rcsb_chem_comp_related.resource_name": referenceResourceName}
-            selectionList = ["rcsb_id", "rcsb_chem_comp_related"]
             logger.info("Searching %s %s with selection query %r", databaseName, collectionName, selectD)
             obEx = ObjectExtractor(
                 self.__cfgOb,
@@ -55,16 +55,14 @@ class ChemRefExtractor(object):
                 keyAttribute="rcsb_id",
                 uniqueAttributes=["rcsb_id"],
                 selectionQuery=selectD,
-                selectionList=selectionList,
                 stripObjectId=True,
+                streamObjects=True,
+            )
+            idD = obEx.getGroupedValues(
+                "rcsb_chem_comp_related.resource_accession_code",
+                "rcsb_chem_comp_related.comp_id",
+                elementQuery={"rcsb_chem_comp_related.resource_name": referenceResourceName},
             )
-            logger.info("Reference data object count %d", obEx.getCount())
-            objD = obEx.getObjects()
-            for _, doc in objD.items():
-                dL = doc["rcsb_chem_comp_related"] if "rcsb_chem_comp_related" in doc else []
-                for dD in dL:
-                    if dD["resource_name"] == referenceResourceName and "resource_accession_code" in dD:
-                        idD.setdefault(dD["resource_accession_code"], []).append(dD["comp_id"])
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return idD
@@ -9,6 +9,9 @@
 # 16-Jul-2020 jdw separate index and reference data management.
 # 23-Jul-2021 jdw Make PubChemDataCacheProvider a subclass of StashableBase()
 # 15-Mar-2023 aae Update default numProc to 2
+# 17-Oct-2026 dwp write reference data updates as batched bulk writes
+# 17-Oct-2026 dwp buffer worker reference data updates in a write-behind BufferedObjectUpdater
+# 17-Oct-2026 dwp skip unchanged objects when reloading dumps
 #
 ##
 __docformat__ = "google en"
@@ -20,6 +23,7 @@ import logging
 import os
 import time
 
+from rcsb.exdb.utils.BufferedObjectUpdater import BufferedObjectUpdater
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
 from rcsb.utils.chemref.PubChemUtils import PubChemUtils, ChemicalIdentifier
@@ -68,52 +72,54 @@ class PubChemDataUpdateWorker(object):
             pcidList = dataList
             numChunks = len(list(self.__chunker(pcidList, chunkSize)))
             logger.info("%s search starting for %d reference definitions (in chunks of length %d)", procName, len(pcidList), chunkSize)
-            for ii, pcidChunk in enumerate(self.__chunker(pcidList, chunkSize), 1):
-                logger.info("%s starting chunk for %d of %d", procName, ii, numChunks)
-                tDL = []
-                timeS = tU.getDateTimeObj(tU.getTimestamp())
-                for pcid in pcidChunk:
-                    #
-                    chemId = ChemicalIdentifier(idCode=pcid, identifierType="cid", identifier=pcid, identifierSource="ccd-match")
-                    #
-                    stA = time.time()
-                    ok, refDL = self.__pcU.assemble(chemId, exportPath=exportPath)
-                    #
-                    if not ok:
-                        etA = time.time()
-                        logger.info("Failing %s search source %s for %s (%.4f secs)", chemId.identifierType, chemId.identifierSource, chemId.idCode, etA - stA)
-
-                    #
-                    if ok and refDL:
-                        successList.append(pcid)
-                        for tD in refDL:
-                            tD.update({"rcsb_id": tD["cid"], "rcsb_last_update": timeS})
-                            tDL.append(tD)
-                    else:
-                        logger.info("No match result for any form of %s", pcid)
-                # --
-                startTimeL = time.time()
-                logger.info("Saving chunk %d (len=%d)", ii, len(pcidChunk))
-                self.__updateObjectStore(self.__databaseName, self.__refDataCollectionName, tDL)
-                endTimeL = time.time()
-                logger.info("Saved chunk %d (len=%d) in %.3f secs", ii, len(pcidChunk), endTimeL - startTimeL)
+            # Chunk updates are written in the background while the following chunks are fetched
+            with BufferedObjectUpdater(self.__cfgOb, self.__databaseName, self.__refDataCollectionName) as bUpd:
+                for ii, pcidChunk in enumerate(self.__chunker(pcidList, chunkSize), 1):
+                    logger.info("%s starting chunk for %d of %d", procName, ii, numChunks)
+                    tDL = []
+                    timeS = tU.getDateTimeObj(tU.getTimestamp())
+                    for pcid in pcidChunk:
+                        #
+                        chemId = ChemicalIdentifier(idCode=pcid, identifierType="cid", identifier=pcid, identifierSource="ccd-match")
+                        #
+                        stA = time.time()
+                        ok, refDL = self.__pcU.assemble(chemId, exportPath=exportPath)
+                        #
+                        if not ok:
+                            etA = time.time()
+                            logger.info("Failing %s search source %s for %s (%.4f secs)", chemId.identifierType, chemId.identifierSource, chemId.idCode, etA - stA)
+
+                        #
+                        if ok and refDL:
+                            successList.append(pcid)
+                            for tD in refDL:
+                                tD.update({"rcsb_id": tD["cid"], "rcsb_last_update": timeS})
+                                tDL.append(tD)
+                        else:
+                            logger.info("No match result for any form of %s", pcid)
+                    # --
+                    logger.info("Buffering chunk %d (len=%d)", ii, len(pcidChunk))
+                    self.__updateObjectStore(bUpd, tDL)
+                try:
+                    startTimeL = time.time()
+                    numUpd = bUpd.close()
+                    endTimeL = time.time()
+                    logger.info("%s saved %d reference data updates (final flush %.3f secs) %r", procName, numUpd, endTimeL - startTimeL, bUpd.getStats()["counts"])
+                except IOError as e:
+                    logger.error("%s reference data updates failing with %s", procName, str(e))
+                    successList = []
         except Exception as e:
             logger.exception("Failing %s for %d data items %s", procName, len(dataList), str(e))
         logger.info("%s dataList length %d success length %d rst1 %d rst2 %d", procName, len(dataList), len(successList), len(retList1), len(retList2))
         #
         return successList, emptyList, emptyList, diagList
 
-    def __updateObjectStore(self, databaseName, collectionName, objDL):
-        updateDL = []
+    def __updateObjectStore(self, bUpd, objDL):
         for objD in objDL:
             try:
-                selectD = {"rcsb_id": objD["rcsb_id"]}
-                updateDL.append({"selectD": selectD, "updateD": objD})
+                bUpd.add({"rcsb_id": objD["rcsb_id"]}, objD)
             except Exception as e:
                 logger.exception("Failing with %s", str(e))
-        obUpd = ObjectUpdater(self.__cfgOb)
-        numUpd = obUpd.update(databaseName, collectionName, updateDL)
-        logger.info("Updated reference count is %d", numUpd)
 
     def __createCollections(self, databaseName, collectionName, indexAttributeNames=None):
         obUpd = ObjectUpdater(self.__cfgOb)
@@ -357,8 +363,8 @@ class PubChemDataCacheProvider(StashableBase):
                 #    obj.pop("_id")
                 selectD = {"rcsb_id": entityKey}
                 updateDL.append({"selectD": selectD, "updateD": obj})
-            #
-            obUpd = ObjectUpdater(self.__cfgOb)
+            # Objects matching the stored content hash are not rewritten
+            obUpd = ObjectUpdater(self.__cfgOb, bulkBatchSize=1000, skipUnchanged=True)
             ok = obUpd.createCollection(databaseName, collectionName, indexAttributeNames=indexAttributeNames, checkExists=True, bsonSchema=None)
             if ok:
                 numUpd = obUpd.update(databaseName, collectionName, updateDL)
@@ -10,6 +10,10 @@
 # 23-Jul-2021 jdw Make PubChemIndexCacheProvider a subclass of StashableBase()
 #  2-Mar-2023 aae Return correct status from Single proc
 #  8-Apr-2025 dwp Let MultiProc handle chunking; add more logging to debug slowness on west coast
+# 17-Oct-2026 dwp share repeated match index reads through the process-wide QueryResultCache
+# 17-Oct-2026 dwp write reference data updates as batched bulk writes
+# 17-Oct-2026 dwp buffer worker match index updates in a write-behind BufferedObjectUpdater
+# 17-Oct-2026 dwp skip unchanged objects when reloading dumps
 #
 ##
 __docformat__ = "google en"
@@ -21,8 +25,10 @@ import logging
 import os
 import time
 
+from rcsb.exdb.utils.BufferedObjectUpdater import BufferedObjectUpdater
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.exdb.utils.QueryResultCache import QueryResultCache
 from rcsb.utils.chem.ChemCompIndexProvider import ChemCompIndexProvider
 from rcsb.utils.chem.ChemCompSearchIndexProvider import ChemCompSearchIndexProvider
 from rcsb.utils.chemref.PubChemUtils import PubChemUtils, ChemicalIdentifier
@@ -115,51 +121,60 @@ class PubChemUpdateWorker(object):
             tU = TimeUtil()
             ccIdList = dataList  # len(dataList) should be of size chunkSize
             logger.info("%s search starting for %d reference definitions (matchIdOnly %r exportPath %r)", procName, len(ccIdList), matchIdOnly, exportPath)
-            tIdxDL = []
             timeS = tU.getDateTimeObj(tU.getTimestamp())
-            for ccId in ccIdList:
-                # Get various forms from the search index -
-                chemIdList = self.__genChemIdList(ccId)
-                tIdxD = {"rcsb_id": ccId, "rcsb_last_update": timeS}
-                #
-                mL = []
-                for chemId in chemIdList:
-                    stA = time.time()
-                    ok, refDL = self.__pcU.assemble(chemId, exportPath=exportPath, matchIdOnly=matchIdOnly)
+            # Match index updates are written in the background while the remaining definitions are searched
+            with BufferedObjectUpdater(self.__cfgOb, self.__databaseName, self.__matchIndexCollectionName) as bUpd:
+                for ccId in ccIdList:
+                    # Get various forms from the search index -
+                    chemIdList = self.__genChemIdList(ccId)
+                    tIdxD = {"rcsb_id": ccId, "rcsb_last_update": timeS}
                     #
-                    if not ok:
-                        etA = time.time()
-                        logger.debug("Failing %s search source %s for %s (%.4f secs)", chemId.identifierType, chemId.identifierSource, chemId.idCode, etA - stA)
+                    mL = []
+                    for chemId in chemIdList:
+                        stA = time.time()
+                        ok, refDL = self.__pcU.assemble(chemId, exportPath=exportPath, matchIdOnly=matchIdOnly)
+                        #
+                        if not ok:
+                            etA = time.time()
+                            logger.debug("Failing %s search source %s for %s (%.4f secs)", chemId.identifierType, chemId.identifierSource, chemId.idCode, etA - stA)
+                        #
+                        if ok and refDL:
+                            for tD in refDL:
+                                pcId = tD["cid"]
+                                inchiKey = (
+                                    self.__searchIdxD[chemId.indexName]["inchi-key"]
+                                    if chemId.indexName in self.__searchIdxD and "inchi-key" in self.__searchIdxD[chemId.indexName]
+                                    else None
+                                )
+                                smiles = (
+                                    self.__searchIdxD[chemId.indexName]["smiles"] if chemId.indexName in self.__searchIdxD and "smiles" in self.__searchIdxD[chemId.indexName] else None
+                                )
+                                mL.append(
+                                    {
+                                        "matched_id": pcId,
+                                        "search_id_type": chemId.identifierType,
+                                        "search_id_source": chemId.identifierSource,
+                                        "source_index_name": chemId.indexName,
+                                        "source_smiles": smiles,
+                                        "source_inchikey": inchiKey,
+                                    }
+                                )
+                    #
+                    if mL:
+                        tIdxD["matched_ids"] = mL
+                        successList.append(ccId)
+                    else:
+                        logger.info("No match result for any form of %s", ccId)
                     #
-                    if ok and refDL:
-                        for tD in refDL:
-                            pcId = tD["cid"]
-                            inchiKey = (
-                                self.__searchIdxD[chemId.indexName]["inchi-key"]
-                                if chemId.indexName in self.__searchIdxD and "inchi-key" in self.__searchIdxD[chemId.indexName]
-                                else None
-                            )
-                            smiles = (
-                                self.__searchIdxD[chemId.indexName]["smiles"] if chemId.indexName in self.__searchIdxD and "smiles" in self.__searchIdxD[chemId.indexName] else None
-                            )
-                            mL.append(
-                                {
-                                    "matched_id": pcId,
-                                    "search_id_type": chemId.identifierType,
-                                    "search_id_source": chemId.identifierSource,
-                                    "source_index_name": chemId.indexName,
-                                    "source_smiles": smiles,
-                                    "source_inchikey": inchiKey,
-                                }
-                            )
-                #
-                if mL:
-                    tIdxD["matched_ids"] = mL
-                    successList.append(ccId)
-                else:
-                    logger.info("No match result for any form of %s", ccId)
-                #
-                tIdxDL.append(tIdxD)
+                    bUpd.add({"rcsb_id": tIdxD["rcsb_id"]}, tIdxD)
+                try:
+                    startTimeL = time.time()
+                    numUpd = bUpd.close()
+                    endTimeL = time.time()
+                    logger.info("%s saved %d match index updates (final flush %.3f secs) %r", procName, numUpd, endTimeL - startTimeL, bUpd.getStats()["counts"])
+                except IOError as e:
+                    logger.error("%s match index updates failing with %s", procName, str(e))
+                    successList = []
             # --
             failList = sorted(set(dataList) - set(successList))
             if failList:
@@ -167,29 +182,12 @@ class PubChemUpdateWorker(object):
             # --
             endTime = time.time()
             logger.info("%s completed updateList len %r duration %.3f secs", procName, len(ccIdList), endTime - startTime)
-            startTimeL = time.time()
-            logger.info("Saving dataList (len=%d)", len(ccIdList))
-            self.__updateObjectStore(self.__databaseName, self.__matchIndexCollectionName, tIdxDL)
-            endTimeL = time.time()
-            logger.info("Saved chunk (len=%d) in %.3f secs", len(ccIdList), endTimeL - startTimeL)
         except Exception as e:
             logger.exception("Failing %s for %d data items %s", procName, len(dataList), str(e))
         logger.info("%s dataList length %d success length %d retList %d", procName, len(dataList), len(successList), len(retList))
         #
         return successList, retList, diagList
 
-    def __updateObjectStore(self, databaseName, collectionName, objDL):
-        updateDL = []
-        for objD in objDL:
-            try:
-                selectD = {"rcsb_id": objD["rcsb_id"]}
-                updateDL.append({"selectD": selectD, "updateD": objD})
-            except Exception as e:
-                logger.exception("Failing with %s", str(e))
-        obUpd = ObjectUpdater(self.__cfgOb)
-        numUpd = obUpd.update(databaseName, collectionName, updateDL)
-        logger.info("Updated reference count is %d", numUpd)
-
     def __createCollections(self, databaseName, collectionName, indexAttributeNames=None):
         obUpd = ObjectUpdater(self.__cfgOb)
         ok = obUpd.createCollection(databaseName, collectionName, indexAttributeNames=indexAttributeNames, checkExists=True, bsonSchema=None)
@@ -495,6 +493,7 @@ class PubChemIndexCacheProvider(StashableBase):
             selectionQuery=selectD,
             selectionList=selectionList,
             stripObjectId=True,
+            useQueryCache=True,
         )
         docCount = obEx.getCount()
         logger.info("Reference data object count %d", docCount)
@@ -521,6 +520,8 @@ class PubChemIndexCacheProvider(StashableBase):
             mpu.set(workerObj=rWorker, workerMethod="updateList")
             ok, failList, resultList, _ = mpu.runMulti(dataList=idList, numProc=numProc, numResults=1, chunkSize=chunkSize)
             logger.info("Multi-proc %r failures %r result lengths %r", ok, len(failList), len(resultList[0]))
+            # The match index is updated by the worker processes
+            QueryResultCache.invalidate(self.__databaseName)
         else:
             successList, _, _ = rWorker.updateList(idList, "SingleProc", optD, self.__dirPath)
             failList = list(set(idList) - set(successList))
@@ -556,8 +557,8 @@ class PubChemIndexCacheProvider(StashableBase):
                     obj.pop("_id")
                 selectD = {"rcsb_id": entityKey}
                 updateDL.append({"selectD": selectD, "updateD": obj})
-            #
-            obUpd = ObjectUpdater(self.__cfgOb)
+            # Objects matching the stored content hash are not rewritten
+            obUpd = ObjectUpdater(self.__cfgOb, bulkBatchSize=1000, skipUnchanged=True)
             ok = obUpd.createCollection(databaseName, collectionName, indexAttributeNames=indexAttributeNames, checkExists=True, bsonSchema=None)
             if ok:
                 numUpd = obUpd.update(databaseName, collectionName, updateDL)
@@ -5,7 +5,7 @@
 # Selected utilities to extract citation data from the core_entry exchange database schema.
 #
 # Updates:
-#
+# 17-Oct-2026  dwp add numProc option for parallel (_id range partitioned) extraction of entry citations
 #
 ##
 __docformat__ = "google en"
@@ -33,6 +33,7 @@ class CitationExtractor(object):
         self.__collectionName = "pdbx_core_entry"
         #
         self.__mU = MarshalUtil()
+        self.__numProc = kwargs.get("numProc", 1)
         #
         self.__entryD = self.__rebuildCache(**kwargs)
         self.__idxD = self.__buildIndices(self.__entryD)
@@ -178,6 +179,7 @@ class CitationExtractor(object):
                 objectLimit=None,
                 selectionQuery={},
                 selectionList=["rcsb_id", "citation"],
+                numProc=self.__numProc,
             )
             eCount = obEx.getCount()
             logger.info("Entry count is %d", eCount)
@@ -3,6 +3,9 @@
 #  Date:           22-Sep-2021 jdw
 #
 #  Updated:
+#  17-Oct-2026 dwp add memory-mapped (fmt="mmap") entry info cache option
+#  17-Oct-2026 dwp use columnar extraction and vectorized polymer entity count selection
+#  17-Oct-2026 dwp store polymer entity counts with the memory-mapped cache and add close()
 #
 ##
 """
@@ -14,6 +17,9 @@ import logging
 import os.path
 import time
 
+import numpy as np
+
+from rcsb.exdb.utils.MappedObjectStore import MappedObjectStore
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.utils.io.MarshalUtil import MarshalUtil
 from rcsb.utils.io.StashableBase import StashableBase
@@ -29,12 +35,15 @@ class EntryInfoProvider(StashableBase):
         self.__version = "0.50"
         cachePath = kwargs.get("cachePath", ".")
         useCache = kwargs.get("useCache", True)
+        # fmt="mmap" stores entry details in a MappedObjectStore decoded lazily on access
+        self.__fmt = kwargs.get("fmt", "json")
         self.__dirName = "rcsb_entry_info"
         self.__dirPath = os.path.join(cachePath, self.__dirName)
         super(EntryInfoProvider, self).__init__(cachePath, [self.__dirName])
         #
         self.__mU = MarshalUtil(workPath=self.__dirPath)
-        self.__entryInfoD = self.__reload(fmt="json", useCache=useCache)
+        self.__entryInfoD = self.__reload(fmt=self.__fmt, useCache=useCache)
+        self.__countColumnT = None
         #
 
     def testCache(self, minCount=1):
@@ -57,27 +66,45 @@ class EntryInfoProvider(StashableBase):
             logger.error("Failing with %r", str(e))
         return {}
 
+    def close(self):
+        """Close the memory-mapped (fmt="mmap") entry info cache."""
+        if self.__entryInfoD and isinstance(self.__entryInfoD.get("entryInfo"), MappedObjectStore):
+            self.__entryInfoD["entryInfo"].close()
+
     def getEntriesByPolymerEntityCount(self, count):
         oL = []
         try:
-            for entryId, eD in self.__entryInfoD["entryInfo"].items():
-                if eD["polymer_entity_count"] == count:
-                    oL.append(entryId)
+            entryIdA, countA = self.__getCountColumns()
+            oL = entryIdA[countA == count].tolist()
         except Exception as e:
             logger.error("Failing with %r", str(e))
         return oL
 
+    def __getCountColumns(self):
+        """Return the (entry id, polymer entity count) arrays built on first use from the current entry details
+        (or from the counts stored with a memory-mapped cache so entry details are not decoded).
+        """
+        if self.__countColumnT is None:
+            countD = self.__entryInfoD.get("polymerEntityCounts")
+            if countD is None:
+                countD = {entryId: eD["polymer_entity_count"] for entryId, eD in self.__entryInfoD["entryInfo"].items()}
+            entryIdA = np.array(list(countD.keys()), dtype=str)
+            countA = np.fromiter(countD.values(), dtype=np.int64, count=len(entryIdA))
+            self.__countColumnT = (entryIdA, countA)
+        return self.__countColumnT
+
     def __getEntryInfoFilePath(self, fmt="json"):
         baseFileName = "entry_info_details"
-        fExt = ".json" if fmt == "json" else ".pic"
+        fExt = {"json": ".json", "mmap": ".dat"}.get(fmt, ".pic")
         fp = os.path.join(self.__dirPath, baseFileName + fExt)
         return fp
 
-    def update(self, cfgOb, fmt="json", indent=3):
+    def update(self, cfgOb, fmt=None, indent=3):
         """Update branched entity glycan accession mapping cache.
 
         Args:
             cfgObj (object): ConfigInfo() object instance
+            fmt (str, optional): cache format (json, pickle or mmap). Defaults to the format set on construction.
 
         Returns:
             (bool): True for success for False otherwise
@@ -89,11 +116,19 @@ class EntryInfoProvider(StashableBase):
             logger.info("Got entry_info for (%d)", len(entryInfoD))
             #
             tS = time.strftime("%Y %m %d %H:%M:%S", time.localtime())
+            self.close()
             self.__entryInfoD = {"version": self.__version, "created": tS, "entryInfo": entryInfoD}
+            self.__countColumnT = None
             #
+            fmt = fmt if fmt else self.__fmt
             infoFilePath = self.__getEntryInfoFilePath(fmt=fmt)
-            kwargs = {"indent": indent} if fmt == "json" else {}
-            ok = self.__mU.doExport(infoFilePath, self.__entryInfoD, fmt=fmt, **kwargs)
+            if fmt == "mmap":
+                # Polymer entity counts are stored with the index so count selections do not decode the entry details
+                countD = {entryId: eD["polymer_entity_count"] for entryId, eD in entryInfoD.items()}
+                ok = MappedObjectStore.write(infoFilePath, entryInfoD, attributes={"version": self.__version, "created": tS, "polymerEntityCounts": countD})
+            else:
+                kwargs = {"indent": indent} if fmt == "json" else {}
+                ok = self.__mU.doExport(infoFilePath, self.__entryInfoD, fmt=fmt, **kwargs)
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return ok
@@ -102,7 +137,9 @@ class EntryInfoProvider(StashableBase):
         """Reload from the current cache file."""
         ok = False
         try:
-            self.__entryInfoD = self.__reload(fmt="json", useCache=True)
+            self.close()
+            self.__entryInfoD = self.__reload(fmt=self.__fmt, useCache=True)
+            self.__countColumnT = None
             ok = self.__entryInfoD is not None
         except Exception as e:
             logger.exception("Failing with %s", str(e))
@@ -115,7 +152,11 @@ class EntryInfoProvider(StashableBase):
 
         if useCache and self.__mU.exists(entryInfoFilePath):
             logger.info("Reading entry-info cached path %r", entryInfoFilePath)
-            pcD = self.__mU.doImport(entryInfoFilePath, fmt=fmt)
+            if fmt == "mmap":
+                mos = MappedObjectStore(entryInfoFilePath)
+                pcD = {**mos.getAttributes(), "entryInfo": mos}
+            else:
+                pcD = self.__mU.doImport(entryInfoFilePath, fmt=fmt)
         return pcD
 
     def __updateEntryInfo(self, cfgOb):
@@ -130,19 +171,16 @@ class EntryInfoProvider(StashableBase):
                 keyAttribute="entry",
                 uniqueAttributes=["rcsb_id"],
                 selectionQuery={},
-                selectionList=["rcsb_id", "rcsb_entry_info.polymer_entity_count"],
+                streamObjects=True,
             )
             #
-            eCount = obEx.getCount()
-            logger.info("Entry count is %d", eCount)
-
-            objD = obEx.getObjects()
-            for _, eD in objD.items():
-                rcsbId = eD["rcsb_id"]
-                try:
-                    rD[rcsbId] = eD["rcsb_entry_info"]
-                except Exception:
-                    pass
+            cD = obEx.getColumns(["rcsb_entry_info.polymer_entity_count"])
+            logger.info("Entry count is %d", len(cD["keys"]))
+            #
+            countA = np.asarray(cD["columns"]["rcsb_entry_info.polymer_entity_count"])
+            isPresentA = ~cD["masks"]["rcsb_entry_info.polymer_entity_count"]
+            for rcsbId, count in zip(cD["keys"][isPresentA].tolist(), countA[isPresentA].tolist()):
+                rD[rcsbId] = {"polymer_entity_count": count}
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return rD
@@ -8,6 +8,8 @@
 # for expansive annotation hierarchies.
 #
 # Updates:
+# 17-Oct-2026  dwp stream polymer entity documents rather than materializing the full selection
+# 17-Oct-2026  dwp compute unique annotation identifiers with server-side aggregation
 #
 ##
 __docformat__ = "google en"
@@ -55,22 +57,11 @@ class AnnotationExtractor(object):
                 uniqueAttributes=["rcsb_id"],
                 cacheKwargs=None,
                 objectLimit=None,
-                # selectionQuery={"rcsb_polymer_entity_annotation.type": annotationType},
-                selectionQuery=None,
-                selectionList=["rcsb_id", "rcsb_polymer_entity_annotation.annotation_id", "rcsb_polymer_entity_annotation.type"],
+                selectionQuery={"rcsb_polymer_entity_annotation.type": annotationType},
+                streamObjects=True,
             )
-            eCount = obEx.getCount()
-            logger.info("For type %r polymer entity annotation object count is %d", annotationType, eCount)
-            idS = set()
-            objD = obEx.getObjects()
-            for _, eD in objD.items():
-                try:
-                    for tD in eD["rcsb_polymer_entity_annotation"]:
-                        if tD["type"] == annotationType:
-                            idS.add(tD["annotation_id"])
-                except Exception:
-                    pass
-            logger.info("Unique identifiers %d", len(idS))
-            return list(idS)
+            idL = obEx.getDistinctValues("rcsb_polymer_entity_annotation.annotation_id", elementQuery={"rcsb_polymer_entity_annotation.type": annotationType})
+            logger.info("For type %r unique identifiers %d", annotationType, len(idL))
+            return idL
         except Exception as e:
             logger.exception("Failing with %s", str(e))
@@ -6,6 +6,7 @@
 #
 # Updates:
 #  17-Jul-2024 dwp Stop fetching and including rcsb_ligand_neighbors.ligand_is_bound, since no longer populating that field
+#  17-Oct-2026 dwp Stream polymer entity instance documents rather than materializing the full selection
 #
 ##
 __docformat__ = "google en"
@@ -60,12 +61,12 @@ class LigandNeighborMappingExtractor(object):
                     "rcsb_polymer_entity_instance_container_identifiers.asym_id",
                     "rcsb_ligand_neighbors.ligand_comp_id",
                 ],
+                streamObjects=True,
             )
-            eCount = obEx.getCount()
-            logger.info("Total neighbor count (%d)", eCount)
+            eCount = 0
             rD = {}
-            objD = obEx.getObjects()
-            for _, peiD in objD.items():
+            for _, peiD in obEx.iterObjects():
+                eCount += 1
                 try:
                     entryId = peiD["rcsb_polymer_entity_instance_container_identifiers"]["entry_id"]
                     entityId = peiD["rcsb_polymer_entity_instance_container_identifiers"]["entity_id"]
@@ -77,6 +78,7 @@ class LigandNeighborMappingExtractor(object):
                             logger.warning("%s %s missing details lnD %r", entryId, entityId, lnD)
                 except Exception as e:
                     logger.exception("Failing with %s", str(e))
+            logger.info("Total neighbor count (%d)", eCount)
             rD = {k: list(v) for k, v in rD.items()}
             logger.info("Unique instance %d", len(rD))
             return rD
@@ -10,6 +10,8 @@
 # 10-Dec-2024 dwp Sort extracted polymer entity sequence data by entity ID (alphabetically), to ensure consistent
 #                 ordering between coasts (order of sequence data influences results of mmseqs2 sequence searching)
 #  2-Feb-2026 dwp Handle case of missing 'rcsb_entity_source_organism.source_type'
+# 17-Oct-2026 dwp Add numProc option for parallel (_id range partitioned) extraction of polymer entity data
+# 17-Oct-2026 dwp Read polymer entity data in server-side sorted entity ID order (replacing the client-side re-sort)
 #
 ##
 __docformat__ = "google en"
@@ -19,7 +21,6 @@ __license__ = "Apache 2.0"
 
 import logging
 import os
-from collections import OrderedDict
 
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.utils.io.MarshalUtil import MarshalUtil
@@ -43,9 +44,9 @@ class PolymerEntityExtractor(object):
     def __init__(self, cfgOb):
         self.__cfgOb = cfgOb
 
-    def exportProteinSequenceDetails(self, filePath, fmt="json", minSeqLen=0):
+    def exportProteinSequenceDetails(self, filePath, fmt="json", minSeqLen=0, numProc=1):
         """Export protein sequence and taxonomy data (required to build protein sequence fasta file)"""
-        rD, missingSrcD = self.getProteinSequenceDetails(minSeqLen=minSeqLen)
+        rD, missingSrcD = self.getProteinSequenceDetails(minSeqLen=minSeqLen, numProc=numProc)
         # ----
         mU = MarshalUtil()
         ok1 = mU.doExport(filePath, rD, fmt=fmt, indent=3)
@@ -55,8 +56,13 @@ class PolymerEntityExtractor(object):
         ok2 = mU.doExport(os.path.join(pth, "missingSrcNames.json"), missingSrcD, fmt="json")
         logger.info("Exporting (%d) protein sequence records with missing source count (%d) status %r", len(rD), len(missingSrcD), ok1 and ok2)
 
-    def getProteinSequenceDetails(self, minSeqLen=0):
-        """Get protein sequence and taxonomy data (required to build protein sequence fasta file)"""
+    def getProteinSequenceDetails(self, minSeqLen=0, numProc=1):
+        """Get protein sequence and taxonomy data (required to build protein sequence fasta file)
+
+        Args:
+            minSeqLen (int, optional): minimum sequence length. Defaults to 0.
+            numProc (int, optional): number of processes used to extract polymer entity data. Defaults to 1.
+        """
         missingSrcD = {}
         rD = {}
         try:
@@ -77,6 +83,9 @@ class PolymerEntityExtractor(object):
                     "entity_poly",
                     "rcsb_polymer_entity_align",
                 ],
+                numProc=numProc,
+                # Entities are read in alphabetical order (by entity ID key) to ensure consistent/reproducible treatment by mmseqs2
+                sortByKey=True,
             )
             #
             eCount = obEx.getCount()
@@ -179,12 +188,9 @@ class PolymerEntityExtractor(object):
                     pass
                 rD[rId] = {"alignmentL": uDL, "sourceOrgL": sL, "partCount": partCount, "taxCount": taxCount, "sequence": seqS, "seqLen": seqLen}
 
-            # Sort the dict in alphabetical order (by entity ID key) to ensure consistent/reproducible treatment by mmseqs2
-            sortedD = OrderedDict((k, rD.pop(k)) for k in sorted(rD))
-
         except Exception as e:
             logger.exception("Failing with %s", str(e))
-        return sortedD, missingSrcD
+        return rD, missingSrcD
 
     def __getSourcePart(self, entityId, sourceOrgL, entityBeg, seqLen):
         """Return the source part containing the input entity range -
@@ -218,13 +224,15 @@ class PolymerEntityExtractor(object):
             #
             return rL[0][0]
 
-    def exportProteinEntityFasta(self, fastaPath, taxonPath, detailsPath, minSeqLen=10):
+    def exportProteinEntityFasta(self, fastaPath, taxonPath, detailsPath, minSeqLen=10, numProc=1):
         """Export protein entity Fasta file and associated taxon mapping file (for mmseqs2)
 
         Args:
             fastaPath (str): protein sequence FASTA output file path
             taxonPath (str): taxon mapping file path (seqid TaxId) (tdd format)
             detailPath (str): protein entity details file path (json)
+            minSeqLen (int, optional): minimum sequence length. Defaults to 10.
+            numProc (int, optional): number of processes used to extract polymer entity data. Defaults to 1.
 
         Returns:
             bool: True for success or False otherwise
@@ -292,7 +300,7 @@ class PolymerEntityExtractor(object):
                 },
         >1ABC_#|prt|<taxid>|beg|end|refdb|refId|refTaxId|refbeg|refend|ref_gn|ref_nm
         """
-        proteinSeqD, _ = self.getProteinSequenceDetails(minSeqLen=minSeqLen)
+        proteinSeqD, _ = self.getProteinSequenceDetails(minSeqLen=minSeqLen, numProc=numProc)
         ok = False
 
         try:
@@ -5,6 +5,8 @@
 # Utilities to cache content required to update referencence sequence assignments.
 #
 # Updates:
+# 17-Oct-2026 dwp add internStrings option to share repeated strings in the reference sequence caches
+# 17-Oct-2026 dwp add key sharded reference sequence data cache option (cacheKwargs={"fmt": "shard"})
 #
 ##
 __docformat__ = "google en"
@@ -14,10 +16,13 @@ __license__ = "Apache 2.0"
 
 import logging
 import os
+import shutil
 from collections import defaultdict
 
 
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
+from rcsb.exdb.utils.ObjectInterner import ObjectInterner
+from rcsb.exdb.utils.ShardedObjectCache import ShardedObjectCache
 from rcsb.utils.ec.EnzymeDatabaseProvider import EnzymeDatabaseProvider
 from rcsb.utils.io.IoUtil import getObjSize
 from rcsb.utils.io.MarshalUtil import MarshalUtil
@@ -243,8 +248,9 @@ class ReferenceSequenceAssignmentProvider(object):
         useCache = kwargs.get("useCache", True)
         saveText = kwargs.get("saveText", False)
         #
-        ext = "pic" if cacheKwargs["fmt"] == "pickle" else "json"
-        fn = refDbName + "-ref-sequence-data-cache" + "." + ext
+        # fmt="shard" stores the reference data in a directory of key sharded files (only changed shards are rewritten)
+        ext = {"pickle": ".pic", "shard": "-shards"}.get(cacheKwargs["fmt"], ".json")
+        fn = refDbName + "-ref-sequence-data-cache" + ext
         dataCacheFilePath = os.path.join(dirPath, fn)
         #
         fn = refDbName + "-ref-sequence-id-cache" + ".json"
@@ -254,12 +260,15 @@ class ReferenceSequenceAssignmentProvider(object):
         if not useCache:
             for fp in [dataCacheFilePath, accCacheFilePath]:
                 try:
-                    os.remove(fp)
+                    if os.path.isdir(fp):
+                        shutil.rmtree(fp)
+                    else:
+                        os.remove(fp)
                 except Exception:
                     pass
         #
         if useCache and accCacheFilePath and self.__mU.exists(accCacheFilePath) and dataCacheFilePath and self.__mU.exists(dataCacheFilePath):
-            dD = self.__mU.doImport(dataCacheFilePath, **cacheKwargs)
+            dD = self.__importDataCache(dataCacheFilePath, cacheKwargs)
             idD = self.__mU.doImport(accCacheFilePath, fmt="json")
             logger.info("Reading cached reference sequence ID and data cache files - cached match reference length %d", len(idD["matchInfo"]))
             idD["matchInfo"] = self.__rebuildReferenceMatchIndex(idList, dD["refDbCache"])
@@ -276,7 +285,7 @@ class ReferenceSequenceAssignmentProvider(object):
                     #
                     if accCacheFilePath and dataCacheFilePath and cacheKwargs:
                         self.__mU.mkdir(dirPath)
-                        ok1 = self.__mU.doExport(dataCacheFilePath, dD, **cacheKwargs)
+                        ok1 = self.__exportDataCache(dataCacheFilePath, dD, cacheKwargs, merge=True)
                         ok2 = self.__mU.doExport(accCacheFilePath, idD, fmt="json", indent=3)
                         logger.info("Cache updated with missing references with status %r", ok1 and ok2)
             #
@@ -285,12 +294,40 @@ class ReferenceSequenceAssignmentProvider(object):
             dD, idD = self.__fetchReferenceEntries(refDbName, idList, saveText=saveText, fetchLimit=fetchLimit)
             if accCacheFilePath and dataCacheFilePath and cacheKwargs:
                 self.__mU.mkdir(dirPath)
-                ok1 = self.__mU.doExport(dataCacheFilePath, dD, **cacheKwargs)
+                ok1 = self.__exportDataCache(dataCacheFilePath, dD, cacheKwargs)
                 ok2 = self.__mU.doExport(accCacheFilePath, idD, fmt="json", indent=3)
                 logger.info("Cache save status %r", ok1 and ok2)
+        #
+        if kwargs.get("internStrings", False):
+            interner = ObjectInterner(cardinalityLimit=kwargs.get("internCardinalityLimit", 1000))
+            interner.internObject(idD["matchInfo"])
+            interner.internObject(dD["refDbCache"])
+            logger.info("Reference cache interning saved %.2f MB (%r)", interner.getStats()["bytesSaved"] / 1000000.0, interner.getStats())
 
         return idD["matchInfo"], dD["refDbCache"]
 
+    def __importDataCache(self, dataCacheFilePath, cacheKwargs):
+        """Read the reference data cache.
+
+        All shards of a sharded cache are loaded, as secondary and variant accessions in the match index are resolved
+        against references stored under other (primary) accessions.
+        """
+        if cacheKwargs["fmt"] == "shard":
+            sC = ShardedObjectCache(dataCacheFilePath)
+            return {"refDbName": sC.getAttributes().get("refDbName"), "refDbCache": sC.load()}
+        return self.__mU.doImport(dataCacheFilePath, **cacheKwargs)
+
+    def __exportDataCache(self, dataCacheFilePath, dD, cacheKwargs, merge=False):
+        """Write the reference data cache.  A sharded cache rewrites only the shards with changed content and
+        with merge=True the input reference data is merged into the existing shards.
+        """
+        if cacheKwargs["fmt"] == "shard":
+            sC = ShardedObjectCache(dataCacheFilePath, numShards=cacheKwargs.get("numShards", 64))
+            if merge:
+                return sC.update(dD["refDbCache"])
+            return sC.write(dD["refDbCache"], attributes={"refDbName": dD["refDbName"]})
+        return self.__mU.doExport(dataCacheFilePath, dD, **cacheKwargs)
+
     def __rebuildReferenceMatchIndex(self, idList, referenceD):
         fobj = UniProtUtils()
         logger.info("Rebuilding match index on idList (%d) using reference data (%d) %r", len(idList), len(referenceD), type(referenceD))
@@ -329,6 +366,8 @@ class ReferenceSequenceAssignmentProvider(object):
         abbreviated = kwargs.get("siftsAbbreviated", "TEST")
         cachePath = kwargs.get("cachePath", ".")
         cacheKwargs = kwargs.get("cacheKwargs", {"fmt": "pickle"})
+        # The sharded format applies only to the reference sequence data cache
+        cacheKwargs = {"fmt": "pickle"} if cacheKwargs.get("fmt") == "shard" else cacheKwargs
         useCache = kwargs.get("useCache", True)
         #
         siftsSummaryDataPath = cfgOb.getPath("SIFTS_SUMMARY_DATA_PATH", sectionName=configName)
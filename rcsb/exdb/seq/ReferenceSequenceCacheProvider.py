@@ -6,6 +6,11 @@
 #
 # Updates:
 # 8-Apr-2020 jdw change testCache() conditions to specifically track missing matched reference Id codes.
+# 17-Oct-2026 dwp add internStrings option to share repeated strings in the reference and match data
+# 17-Oct-2026 dwp share repeated reference data reads through the process-wide QueryResultCache
+# 17-Oct-2026 dwp write reference data updates as batched bulk writes
+# 17-Oct-2026 dwp write worker reference and match updates concurrently through write-behind BufferedObjectUpdaters
+# 17-Oct-2026 dwp skip re-fetched reference and match updates with unchanged content
 #
 ##
 __docformat__ = "google en"
@@ -17,8 +22,10 @@ import logging
 from collections import defaultdict
 
 
+from rcsb.exdb.utils.BufferedObjectUpdater import BufferedObjectUpdater
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.exdb.utils.QueryResultCache import QueryResultCache
 from rcsb.utils.io.IoUtil import getObjSize
 from rcsb.utils.io.TimeUtil import TimeUtil
 from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
@@ -76,8 +83,20 @@ class ReferenceUpdateWorker(object):
                         tD["rcsb_last_update"] = tU.getDateTimeObj(tU.getTimestamp())
                         retList2.append(tD)
                     successList.extend(idList)
-                    self.__updateReferenceData(self.__refDatabaseName, self.__refDataCollectionName, retList2)
-                    self.__updateReferenceData(self.__refDatabaseName, self.__refMatchDataCollectionName, retList1)
+                    # Reference and match data are written concurrently by the background writers of each buffer
+                    # (re-fetched records with unchanged content are not rewritten)
+                    bUpd2 = BufferedObjectUpdater(self.__cfgOb, self.__refDatabaseName, self.__refDataCollectionName, skipUnchanged=True)
+                    bUpd1 = BufferedObjectUpdater(self.__cfgOb, self.__refDatabaseName, self.__refMatchDataCollectionName, skipUnchanged=True)
+                    self.__updateReferenceData(bUpd2, retList2)
+                    bUpd2.flush(wait=False)
+                    self.__updateReferenceData(bUpd1, retList1)
+                    for bUpd in (bUpd2, bUpd1):
+                        try:
+                            numUpd = bUpd.close()
+                            logger.debug("%s updated reference count is %d", procName, numUpd)
+                        except IOError as e:
+                            logger.error("%s reference data updates failing with %s", procName, str(e))
+                            successList = []
                 else:
                     logger.info("Failing with fetch for %d entries with matchD %r", len(idList), matchD)
             else:
@@ -88,17 +107,12 @@ class ReferenceUpdateWorker(object):
         #
         return successList, emptyList, emptyList, diagList
 
-    def __updateReferenceData(self, databaseName, collectionName, objDL):
-        updateDL = []
+    def __updateReferenceData(self, bUpd, objDL):
         for objD in objDL:
             try:
-                selectD = {"rcsb_id": objD["rcsb_id"]}
-                updateDL.append({"selectD": selectD, "updateD": objD})
+                bUpd.add({"rcsb_id": objD["rcsb_id"]}, objD)
             except Exception as e:
                 logger.exception("Failing with %s", str(e))
-        obUpd = ObjectUpdater(self.__cfgOb)
-        numUpd = obUpd.update(databaseName, collectionName, updateDL)
-        logger.debug("Updated reference count is %d", numUpd)
 
     def __createCollections(self, databaseName, collectionName, indexAttributeNames=None):
         obUpd = ObjectUpdater(self.__cfgOb)
@@ -114,6 +128,7 @@ class ReferenceSequenceCacheProvider(object):
         #
         self.__maxChunkSize = maxChunkSize
         self.__numProc = numProc
+        self.__internStrings = kwargs.get("internStrings", False)
         #
         self.__refDatabaseName = "uniprot_exdb"
         self.__refDataCollectionName = "reference_entry"
@@ -239,8 +254,8 @@ class ReferenceSequenceCacheProvider(object):
         else:
             logger.info("No reference sequence updates required")
         #
-        matchD = self.__getReferenceData(self.__refDatabaseName, self.__refMatchDataCollectionName)
-        refD = self.__getReferenceData(self.__refDatabaseName, self.__refDataCollectionName)
+        matchD = self.__getReferenceData(self.__refDatabaseName, self.__refMatchDataCollectionName, internStrings=self.__internStrings)
+        refD = self.__getReferenceData(self.__refDatabaseName, self.__refDataCollectionName, internStrings=self.__internStrings)
         logger.info("Completed - returning match length %d and reference data length %d num missing %d", len(matchD), len(refD), len(failList))
         return matchD, refD, len(failList)
 
@@ -290,7 +305,8 @@ class ReferenceSequenceCacheProvider(object):
             tU = TimeUtil()
             tS = tU.getTimestamp(useUtc=True, before={"days": expireDays})
             selectD = {"rcsb_latest_update": {"$lt": tU.getDateTimeObj(tS)}}
-        matchD = self.__getReferenceData(self.__refDatabaseName, self.__refMatchDataCollectionName, selectD=selectD)
+        # Only the identifiers are read (and not shared through the query result cache)
+        matchD = self.__getReferenceData(self.__refDatabaseName, self.__refMatchDataCollectionName, selectD=selectD, selectionList=["rcsb_id"], useQueryCache=False)
         return sorted(matchD.keys())
 
     def __updateReferenceData(self, idList):
@@ -304,9 +320,11 @@ class ReferenceSequenceCacheProvider(object):
         mpu.set(workerObj=rWorker, workerMethod="updateList")
         ok, failList, resultList, _ = mpu.runMulti(dataList=idList, numProc=numProc, numResults=2, chunkSize=chunkSize)
         logger.info("Multi-proc %r failures %r result lengths %r %r", ok, len(failList), len(resultList[0]), len(resultList[1]))
+        # Reference data is updated by the worker processes
+        QueryResultCache.invalidate(self.__refDatabaseName)
         return ok, failList
 
-    def __getReferenceData(self, databaseName, collectionName, selectD=None):
+    def __getReferenceData(self, databaseName, collectionName, selectD=None, selectionList=None, internStrings=False, useQueryCache=True):
         logger.info("Searching %s %s with selection query %r", databaseName, collectionName, selectD)
         obEx = ObjectExtractor(
             self.__cfgOb,
@@ -315,6 +333,9 @@ class ReferenceSequenceCacheProvider(object):
             keyAttribute="rcsb_id",
             uniqueAttributes=["rcsb_id"],
             selectionQuery=selectD,
+            selectionList=selectionList,
+            internStrings=internStrings,
+            useQueryCache=useQueryCache,
         )
         docCount = obEx.getCount()
         logger.debug("Reference data match count %d", docCount)
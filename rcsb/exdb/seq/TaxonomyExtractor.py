@@ -5,6 +5,8 @@
 # Utilities to extract taxonomy details from the core entity collection.
 #
 # Updates:
+# 17-Oct-2026  dwp stream polymer entity documents rather than materializing the full selection
+# 17-Oct-2026  dwp compute unique taxonomy identifiers with server-side aggregation
 #
 ##
 __docformat__ = "google en"
@@ -46,23 +48,10 @@ class TaxonomyExtractor(object):
                 objectLimit=None,
                 # selectionQuery={"entity.type": "polymer"},
                 selectionQuery=None,
-                selectionList=["rcsb_id", "rcsb_entity_source_organism.ncbi_taxonomy_id", "rcsb_entity_host_organism.ncbi_taxonomy_id"],
+                streamObjects=True,
             )
-            eCount = obEx.getCount()
-            logger.info("Polymer entity count is %d", eCount)
-            taxIdS = set()
-            objD = obEx.getObjects()
-            for _, eD in objD.items():
-                try:
-                    for tD in eD["rcsb_entity_source_organism"]:
-                        taxIdS.add(tD["ncbi_taxonomy_id"])
-                except Exception:
-                    pass
-                try:
-                    for tD in eD["rcsb_entity_host_organism"]:
-                        taxIdS.add(tD["ncbi_taxonomy_id"])
-                except Exception:
-                    pass
+            taxIdS = set(obEx.getDistinctValues("rcsb_entity_source_organism.ncbi_taxonomy_id"))
+            taxIdS.update(obEx.getDistinctValues("rcsb_entity_host_organism.ncbi_taxonomy_id"))
             logger.info("Unique taxons %d", len(taxIdS))
             return list(taxIdS)
         except Exception as e:
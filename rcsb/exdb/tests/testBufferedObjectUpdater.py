@@ -0,0 +1,122 @@
+##
+# File:    testBufferedObjectUpdater.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the write-behind buffered updater (threshold writes, flush on close and error reporting).
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.BufferedObjectUpdater import BufferedObjectUpdater
+from rcsb.exdb.utils.MongoClientRegistry import MongoClientRegistry
+from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.utils.config.ConfigUtil import ConfigUtil
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class BufferedObjectUpdaterTests(unittest.TestCase):
+    def setUp(self):
+        mockTopPath = os.path.join(TOPDIR, "rcsb", "mock-data")
+        configPath = os.path.join(TOPDIR, "rcsb", "mock-data", "config", "dbload-setup-example.yml")
+        configName = "site_info_configuration"
+        self.__cfgOb = ConfigUtil(configPath=configPath, defaultSectionName=configName, mockTopPath=mockTopPath)
+        self.__databaseName = "test_exdb"
+        self.__collectionName = "buffered_update_test"
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testBufferedUpdate(self):
+        """Test case - count threshold writes and flush on close"""
+        try:
+            obUpd = ObjectUpdater(self.__cfgOb)
+            ok = obUpd.createCollection(self.__databaseName, self.__collectionName, indexAttributeNames=["rcsb_id"], checkExists=True)
+            self.assertTrue(ok)
+            obUpd.delete(self.__databaseName, self.__collectionName, {})
+            numDoc = 25
+            with BufferedObjectUpdater(self.__cfgOb, self.__databaseName, self.__collectionName, maxCount=10, maxPending=1) as bUpd:
+                for ii in range(numDoc):
+                    bUpd.add({"rcsb_id": "TEST_%d" % ii}, {"rcsb_id": "TEST_%d" % ii, "value": ii})
+                numUpd = bUpd.close()
+            sD = bUpd.getStats()
+            logger.info("Buffered update statistics %r", sD)
+            self.assertEqual(numUpd, numDoc)
+            self.assertEqual(sD["counts"]["batchesWritten"], 3)
+            self.assertEqual(sD["counts"]["requestsWritten"], numDoc)
+            self.assertEqual(bUpd.getErrors(), [])
+            self.assertEqual(obUpd.count(self.__databaseName, self.__collectionName), numDoc)
+            #
+            with self.assertRaises(ValueError):
+                bUpd.add({"rcsb_id": "TEST_CLOSED"}, {"rcsb_id": "TEST_CLOSED"})
+            self.assertEqual(obUpd.delete(self.__databaseName, self.__collectionName, {}), numDoc)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testBufferedUpdateErrors(self):
+        """Test case - write errors are raised on flush"""
+        bUpd = BufferedObjectUpdater(self.__cfgOb, self.__databaseName, "buffered_update_missing_collection")
+        bUpd.add({"rcsb_id": "TEST_0"}, {"rcsb_id": "TEST_0"})
+        with self.assertRaises(IOError):
+            bUpd.close()
+        self.assertEqual(len(bUpd.getErrors()), 1)
+        self.assertEqual(bUpd.getStats()["counts"]["failedRequests"], 1)
+
+    def testBufferedUpdateUnchangedAfterErrors(self):
+        """Test case - errors of a failed batch are not reported again for a following batch of unchanged updates"""
+        collectionName = "buffered_update_unique_test"
+        try:
+            obUpd = ObjectUpdater(self.__cfgOb)
+            ok = obUpd.createCollection(self.__databaseName, collectionName, indexAttributeNames=["rcsb_id"], checkExists=True)
+            self.assertTrue(ok)
+            obUpd.delete(self.__databaseName, collectionName, {})
+            MongoClientRegistry.getClient(self.__cfgOb)[self.__databaseName][collectionName].create_index("code", unique=True)
+            bUpd = BufferedObjectUpdater(self.__cfgOb, self.__databaseName, collectionName, skipUnchanged=True)
+            bUpd.add({"rcsb_id": "TEST_0"}, {"rcsb_id": "TEST_0", "code": 1})
+            bUpd.add({"rcsb_id": "TEST_1"}, {"rcsb_id": "TEST_1", "code": 1})
+            with self.assertRaises(IOError):
+                bUpd.flush()
+            self.assertEqual(len(bUpd.getErrors()), 1)
+            # The only request of the next batch is unchanged and skipped
+            bUpd.add({"rcsb_id": "TEST_0"}, {"rcsb_id": "TEST_0", "code": 1})
+            self.assertEqual(bUpd.close(), 1)
+            self.assertEqual(len(bUpd.getErrors()), 1)
+            self.assertEqual(bUpd.getStats()["counts"]["failedRequests"], 1)
+            MongoClientRegistry.getClient(self.__cfgOb)[self.__databaseName].drop_collection(collectionName)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def bufferedObjectUpdaterSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(BufferedObjectUpdaterTests("testBufferedUpdate"))
+    suiteSelect.addTest(BufferedObjectUpdaterTests("testBufferedUpdateErrors"))
+    suiteSelect.addTest(BufferedObjectUpdaterTests("testBufferedUpdateUnchangedAfterErrors"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = bufferedObjectUpdaterSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
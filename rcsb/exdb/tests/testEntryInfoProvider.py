@@ -62,6 +62,13 @@ class EntryInfoProviderTests(unittest.TestCase):
         eiP = EntryInfoProvider(cachePath=self.__cachePath, useCache=True)
         ok = eiP.testCache(minCount=minCount)
         self.assertTrue(ok)
+        #
+        ok = eiP.update(self.__cfgOb, fmt="mmap")
+        self.assertTrue(ok)
+        eiP = EntryInfoProvider(cachePath=self.__cachePath, useCache=True, fmt="mmap")
+        self.assertEqual(sorted(eiP.getEntriesByPolymerEntityCount(count=2)), sorted(rL))
+        self.assertEqual(eiP.getEntryInfo("4en8"), riD)
+        eiP.close()
 
     @unittest.skipUnless(doInternal, "Internal full test")
     def testEntryInfoRemote(self):
@@ -0,0 +1,110 @@
+##
+# File:    testMappedObjectStore.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+# 17-Oct-2026 dwp add spilled segment store tests
+#
+##
+"""
+Tests for the memory-mapped lazily decoded object store and the spilled segment store.
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import datetime
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.MappedObjectStore import MappedObjectStore
+from rcsb.exdb.utils.SpilledObjectStore import SpilledObjectStore
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class MappedObjectStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.__filePath = os.path.join(HERE, "test-output", "mapped-object-store-test.dat")
+        self.__objectD = {
+            "%04d" % ii: {"rcsb_id": "%04d" % ii, "citation": [{"journal_abbrev": "J. Mol. Biol.", "year": 2000 + ii % 20}], "date": datetime.datetime(2020, 1, 1 + ii % 28)}
+            for ii in range(500)
+        }
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testWriteRead(self):
+        """Test case - write and lazily read a mapped object store"""
+        try:
+            ok = MappedObjectStore.write(self.__filePath, self.__objectD, attributes={"version": "0.10"})
+            self.assertTrue(ok)
+            with MappedObjectStore(self.__filePath) as mos:
+                self.assertEqual(len(mos), len(self.__objectD))
+                self.assertEqual(mos.getAttributes(), {"version": "0.10"})
+                self.assertTrue("0123" in mos)
+                self.assertFalse("XXXX" in mos)
+                self.assertEqual(mos["0123"], self.__objectD["0123"])
+                self.assertEqual(mos.get("XXXX", {}), {})
+                self.assertEqual(dict(mos.items()), self.__objectD)
+            # Keys remain available after close
+            self.assertEqual(len(mos), len(self.__objectD))
+            with self.assertRaises(ValueError):
+                _ = mos["0123"]
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testReadInvalid(self):
+        """Test case - reject a file that is not a mapped object store"""
+        tPath = os.path.join(HERE, "test-output", "mapped-object-store-invalid.dat")
+        with open(tPath, "wb") as ofh:
+            ofh.write(b"not a mapped object store")
+        with self.assertRaises(ValueError):
+            MappedObjectStore(tPath)
+
+    def testSpilledSegments(self):
+        """Test case - merge objects spilled to sorted segments"""
+        try:
+            sos = SpilledObjectStore()
+            dirPath = sos.getDirPath()
+            kyL = sorted(self.__objectD, reverse=True)
+            for ii in range(0, len(kyL), 120):
+                self.assertTrue(sos.addSegment({ky: self.__objectD[ky] for ky in kyL[ii : ii + 120]}))
+            self.assertEqual(sos.getSegmentCount(), 5)
+            self.assertEqual(len(sos), len(self.__objectD))
+            self.assertEqual(list(sos), sorted(self.__objectD))
+            self.assertEqual(sos["0123"], self.__objectD["0123"])
+            self.assertFalse("XXXX" in sos)
+            with self.assertRaises(KeyError):
+                _ = sos["XXXX"]
+            sos.close()
+            self.assertFalse(os.path.exists(dirPath))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def mappedObjectStoreSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(MappedObjectStoreTests("testWriteRead"))
+    suiteSelect.addTest(MappedObjectStoreTests("testReadInvalid"))
+    suiteSelect.addTest(MappedObjectStoreTests("testSpilledSegments"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = mappedObjectStoreSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
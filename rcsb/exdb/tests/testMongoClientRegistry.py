@@ -0,0 +1,122 @@
+##
+# File:    testMongoClientRegistry.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the process-wide shared client registry (reuse, pool options and forked worker processes).
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.MongoClientRegistry import MongoClientRegistry
+from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.utils.config.ConfigUtil import ConfigUtil
+from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class ClientCountWorker(object):
+    """Count documents with the shared client in a worker process and return the registry statistics."""
+
+    def __init__(self, cfgOb):
+        self.__cfgOb = cfgOb
+
+    def countList(self, dataList, procName, optionsD, workingDir):
+        _ = optionsD
+        _ = workingDir
+        retList = []
+        obUpd = ObjectUpdater(self.__cfgOb)
+        for databaseName, collectionName in dataList:
+            retList.append(obUpd.count(databaseName, collectionName))
+        logger.info("%s registry statistics %r", procName, MongoClientRegistry.getStats())
+        return dataList, retList, [MongoClientRegistry.getStats()]
+
+
+class MongoClientRegistryTests(unittest.TestCase):
+    def setUp(self):
+        mockTopPath = os.path.join(TOPDIR, "rcsb", "mock-data")
+        configPath = os.path.join(TOPDIR, "rcsb", "mock-data", "config", "dbload-setup-example.yml")
+        configName = "site_info_configuration"
+        self.__cfgOb = ConfigUtil(configPath=configPath, defaultSectionName=configName, mockTopPath=mockTopPath)
+        MongoClientRegistry.closeAll()
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        MongoClientRegistry.setPoolOptions()
+        MongoClientRegistry.closeAll()
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testSharedClientReuse(self):
+        """Test case - updaters share one client and pool options apply to new clients"""
+        try:
+            countD = MongoClientRegistry.getStats()["counts"]
+            client = MongoClientRegistry.getClient(self.__cfgOb)
+            self.assertIsNotNone(client)
+            obUpd = ObjectUpdater(self.__cfgOb)
+            for _ in range(3):
+                obUpd.count("pdbx_core", "pdbx_core_entry")
+            self.assertIs(MongoClientRegistry.getClient(self.__cfgOb), client)
+            sD = MongoClientRegistry.getStats()
+            logger.info("Registry statistics %r", sD)
+            self.assertEqual(sD["openClients"], 1)
+            self.assertEqual(sD["counts"]["clientsCreated"] - countD.get("clientsCreated", 0), 1)
+            self.assertEqual(sD["counts"]["clientsReused"] - countD.get("clientsReused", 0), 4)
+            #
+            MongoClientRegistry.setPoolOptions(maxPoolSize=5)
+            pooledClient = MongoClientRegistry.getClient(self.__cfgOb)
+            self.assertIsNot(pooledClient, client)
+            self.assertEqual(pooledClient.options.pool_options.max_pool_size, 5)
+            self.assertEqual(MongoClientRegistry.closeAll(), 2)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testClientAfterFork(self):
+        """Test case - worker processes create their own clients"""
+        try:
+            self.assertIsNotNone(MongoClientRegistry.getClient(self.__cfgOb))
+            dataList = [("pdbx_core", "pdbx_core_entry"), ("pdbx_core", "pdbx_core_polymer_entity")] * 2
+            mpu = MultiProcUtil(verbose=True)
+            mpu.set(workerObj=ClientCountWorker(self.__cfgOb), workerMethod="countList")
+            ok, failList, _, diagList = mpu.runMulti(dataList=dataList, numProc=2, numResults=1, chunkSize=2)
+            self.assertTrue(ok)
+            self.assertEqual(failList, [])
+            for sD in diagList:
+                self.assertNotEqual(sD["pid"], os.getpid())
+                self.assertEqual(sD["openClients"], 1)
+                self.assertEqual(sD["counts"]["clientsCreated"], 1)
+                self.assertGreaterEqual(sD["counts"]["clientsReused"], 1)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+
+def mongoClientRegistrySuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(MongoClientRegistryTests("testSharedClientReuse"))
+    suiteSelect.addTest(MongoClientRegistryTests("testClientAfterFork"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = mongoClientRegistrySuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -0,0 +1,100 @@
+##
+# File:    testObjectDiff.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for field level ($set/$unset) update patches between document object versions.
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import copy
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.ObjectDiff import ObjectDiff
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class ObjectDiffTests(unittest.TestCase):
+    def setUp(self):
+        self.__oldObj = {
+            "rcsb_id": "1ABC_1",
+            "rcsb_polymer_entity": {"pdbx_description": "Lysozyme", "formula_weight": 14.3, "details": "unused"},
+            "rcsb_polymer_entity_container_identifiers": {"entry_id": "1ABC", "reference_sequence_identifiers": [{"database_name": "UniProt", "database_accession": "P00698"}]},
+            "rcsb_polymer_entity_feature": [{"type": "CATH", "name": "1.10.530.10"}],
+            "rcsb_polymer_entity_annotation": [{"type": "GO", "annotation_id": "GO:0003796"}],
+        }
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testNestedPatch(self):
+        """Test case - set and unset nested paths and replace changed lists"""
+        oD = ObjectDiff()
+        newObj = copy.deepcopy(self.__oldObj)
+        self.assertEqual(oD.getPatch(self.__oldObj, newObj), {})
+        #
+        newObj["rcsb_polymer_entity"]["pdbx_description"] = "Lysozyme C"
+        del newObj["rcsb_polymer_entity"]["details"]
+        newObj["rcsb_polymer_entity_feature"].append({"type": "SCOP", "name": "d1abca_"})
+        newObj["rcsb_polymer_entity_container_identifiers"]["uniprot_ids"] = ["P00698"]
+        del newObj["rcsb_polymer_entity_annotation"]
+        patchD = oD.getPatch(self.__oldObj, newObj)
+        logger.info("Patch %r", patchD)
+        self.assertEqual(
+            patchD["$set"],
+            {
+                "rcsb_polymer_entity.pdbx_description": "Lysozyme C",
+                "rcsb_polymer_entity_feature": newObj["rcsb_polymer_entity_feature"],
+                "rcsb_polymer_entity_container_identifiers.uniprot_ids": ["P00698"],
+            },
+        )
+        self.assertEqual(patchD["$unset"], {"rcsb_polymer_entity.details": "", "rcsb_polymer_entity_annotation": ""})
+
+    def testTypedPatch(self):
+        """Test case - type changes, non-addressable keys and patch size limits"""
+        oD = ObjectDiff()
+        newObj = copy.deepcopy(self.__oldObj)
+        newObj["rcsb_polymer_entity"]["formula_weight"] = 14
+        self.assertEqual(oD.getPatch(self.__oldObj, newObj), {"$set": {"rcsb_polymer_entity.formula_weight": 14}})
+        self.assertFalse(oD.isEqual({"a": [1, 2]}, {"a": [1.0, 2]}))
+        self.assertFalse(oD.isEqual(True, 1))
+        #
+        newObj = copy.deepcopy(self.__oldObj)
+        newObj["rcsb_polymer_entity"]["a.b"] = 1
+        self.assertEqual(oD.getPatch(self.__oldObj, newObj), {"$set": {"rcsb_polymer_entity": newObj["rcsb_polymer_entity"]}})
+        self.assertIsNone(oD.getPatch(self.__oldObj, {**newObj, "$bad": 1}))
+        #
+        newObj = {ky: "changed" for ky in self.__oldObj}
+        self.assertIsNone(ObjectDiff(maxPaths=3).getPatch(self.__oldObj, newObj))
+        self.assertEqual(len(ObjectDiff(maxPaths=5).getPatch(self.__oldObj, newObj)["$set"]), 5)
+
+
+def objectDiffSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ObjectDiffTests("testNestedPatch"))
+    suiteSelect.addTest(ObjectDiffTests("testTypedPatch"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = objectDiffSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
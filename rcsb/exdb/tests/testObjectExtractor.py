@@ -16,6 +16,8 @@ __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
 
+import asyncio
+import json
 import logging
 import os
 import platform
@@ -27,6 +29,7 @@ from collections import defaultdict
 
 from rcsb.db.mongo.Connection import Connection
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
+from rcsb.exdb.utils.QueryPlanAdvisor import QueryPlanAdvisor
 from rcsb.utils.config.ConfigUtil import ConfigUtil
 from rcsb.utils.io.TimeUtil import TimeUtil
 
@@ -62,7 +65,7 @@ class ObjectExtractorTests(unittest.TestCase):
     def tearDown(self):
         unitS = "MB" if platform.system() == "Darwin" else "GB"
         rusageMax = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
-        logger.info("Maximum resident memory size %.4f %s", rusageMax / 10 ** 6, unitS)
+        logger.info("Maximum resident memory size %.4f %s", rusageMax / 10**6, unitS)
         endTime = time.time()
         logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
 
@@ -159,6 +162,91 @@ class ObjectExtractorTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testExtractEntriesIncremental(self):
+        """Test case - incremental (watermark) update of cached entry extraction"""
+        try:
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_entry",
+                "cacheFilePath": os.path.join(self.__workPath, "entry-incremental-test-cache.pic"),
+                "keyAttribute": "entry",
+                "uniqueAttributes": ["rcsb_id"],
+                "selectionList": ["rcsb_id", "rcsb_accession_info"],
+                "watermarkAttribute": "rcsb_accession_info.revision_date",
+            }
+            obEx = ObjectExtractor(self.__cfgOb, useCache=False, **kwargs)
+            objD = obEx.getObjects()
+            self.assertGreaterEqual(len(objD), self.__objectLimitTest)
+            self.assertTrue(os.access(os.path.join(self.__workPath, "entry-incremental-test-cache-watermark.pic"), os.R_OK))
+            #
+            obEx = ObjectExtractor(self.__cfgOb, useCache=True, **kwargs)
+            logger.info("Entry count full %d incremental %d", len(objD), obEx.getCount())
+            self.assertEqual(obEx.getObjects(), objD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntriesValidatedCache(self):
+        """Test case - reuse of a cached entry extraction validated by fingerprint"""
+        try:
+            cacheFilePath = os.path.join(self.__workPath, "entry-validated-test-cache.pic")
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_entry",
+                "cacheFilePath": cacheFilePath,
+                "keyAttribute": "entry",
+                "uniqueAttributes": ["rcsb_id"],
+                "selectionList": ["rcsb_id", "rcsb_accession_info"],
+                "validateCache": True,
+                "fingerprintAttribute": "rcsb_accession_info.revision_date",
+            }
+            obEx = ObjectExtractor(self.__cfgOb, useCache=False, **kwargs)
+            objD = obEx.getObjects()
+            self.assertGreaterEqual(len(objD), self.__objectLimitTest)
+            self.assertTrue(os.access(os.path.join(self.__workPath, "entry-validated-test-cache-fingerprint.json"), os.R_OK))
+            #
+            mTime = os.path.getmtime(cacheFilePath)
+            obEx = ObjectExtractor(self.__cfgOb, useCache=True, **kwargs)
+            self.assertEqual(obEx.getObjects(), objD)
+            self.assertEqual(os.path.getmtime(cacheFilePath), mTime)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntriesShardedCache(self):
+        """Test case - key sharded cache selective loading and incremental (merged) shard writes"""
+        try:
+            cacheFilePath = os.path.join(self.__workPath, "entry-sharded-test-cache")
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_entry",
+                "cacheFilePath": cacheFilePath,
+                "cacheKwargs": {"fmt": "shard", "numShards": 4},
+                "keyAttribute": "entry",
+                "uniqueAttributes": ["rcsb_id"],
+                "selectionList": ["rcsb_id", "rcsb_accession_info"],
+            }
+            obEx = ObjectExtractor(self.__cfgOb, useCache=False, **kwargs)
+            objD = obEx.getObjects()
+            self.assertGreaterEqual(len(objD), self.__objectLimitTest)
+            self.assertTrue(os.access(os.path.join(cacheFilePath, "manifest.json"), os.R_OK))
+            #
+            keyList = sorted(objD)[:2] + ["XXXX"]
+            obEx = ObjectExtractor(self.__cfgOb, useCache=True, cacheKeyList=keyList, **kwargs)
+            self.assertEqual(obEx.getObjects(), {ky: objD[ky] for ky in keyList[:2]})
+            #
+            # Incremental updates merge changed objects into the shards (unchanged shards are not rewritten)
+            kwargs["watermarkAttribute"] = "rcsb_accession_info.revision_date"
+            obEx = ObjectExtractor(self.__cfgOb, useCache=False, **kwargs)
+            self.assertEqual(obEx.getObjects(), objD)
+            mTimeD = {fn: os.stat(os.path.join(cacheFilePath, fn)).st_mtime_ns for fn in os.listdir(cacheFilePath) if fn.startswith("shard-")}
+            obEx = ObjectExtractor(self.__cfgOb, useCache=True, **kwargs)
+            self.assertEqual(obEx.getObjects(), objD)
+            self.assertEqual({fn: os.stat(os.path.join(cacheFilePath, fn)).st_mtime_ns for fn in os.listdir(cacheFilePath) if fn.startswith("shard-")}, mTimeD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
     def testExtractEntities(self):
         """Test case - extract entities"""
         try:
@@ -290,6 +378,282 @@ class ObjectExtractorTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testExtractEntitiesBatched(self):
+        """Test case - extract complete entity objects with alternative cursor batch sizes"""
+        try:
+            rD = {}
+            for batchSize in [1, 1000]:
+                obEx = ObjectExtractor(
+                    self.__cfgOb,
+                    databaseName="pdbx_core",
+                    collectionName="pdbx_core_polymer_entity",
+                    useCache=False,
+                    keyAttribute="entity",
+                    uniqueAttributes=["rcsb_id"],
+                    stripObjectId=True,
+                    batchSize=batchSize,
+                )
+                rD[batchSize] = obEx.getObjects()
+                logger.info("Entity count (batchSize %d) is %d", batchSize, obEx.getCount())
+            self.assertGreaterEqual(len(rD[1000]), self.__objectLimitTest)
+            self.assertEqual(rD[1], rD[1000])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntitiesPartitioned(self):
+        """Test case - extract entity objects in parallel over _id key ranges"""
+        try:
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_polymer_entity",
+                "useCache": False,
+                "keyAttribute": "entity",
+                "uniqueAttributes": ["rcsb_id"],
+                "selectionQuery": {"entity_poly.rcsb_entity_polymer_type": "Protein"},
+                "selectionList": ["rcsb_id", "rcsb_polymer_entity_container_identifiers"],
+            }
+            obEx = ObjectExtractor(self.__cfgOb, **kwargs)
+            objD = obEx.getObjects()
+            obEx = ObjectExtractor(self.__cfgOb, numProc=2, numPartitions=4, **kwargs)
+            logger.info("Entity count serial %d partitioned %d", len(objD), obEx.getCount())
+            self.assertGreaterEqual(obEx.getCount(), self.__objectLimitTest)
+            self.assertEqual(obEx.getObjects(), objD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntitiesSpilled(self):
+        """Test case - extract entity objects within a memory budget spilling to disk"""
+        try:
+            kwargs = {
+                "databaseName": "pdbx_core",
+                "collectionName": "pdbx_core_polymer_entity",
+                "useCache": False,
+                "keyAttribute": "entity",
+                "uniqueAttributes": ["rcsb_id"],
+            }
+            obEx = ObjectExtractor(self.__cfgOb, **kwargs)
+            objD = obEx.getObjects()
+            obEx = ObjectExtractor(self.__cfgOb, maxMemoryMB=0.5, spillPath=os.path.join(self.__workPath, "entity-spill"), **kwargs)
+            spD = obEx.getObjects()
+            logger.info("Entity count %d spilled %d (%s)", len(objD), obEx.getCount(), type(spD).__name__)
+            self.assertEqual(obEx.getCount(), len(objD))
+            self.assertEqual(list(spD.keys()), sorted(objD.keys()))
+            self.assertEqual(dict(spD.items()), objD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntitiesStats(self):
+        """Test case - extraction statistics"""
+        try:
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                cacheFilePath=os.path.join(self.__workPath, "entity-stats-data-test-cache.json"),
+                useCache=False,
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                cacheKwargs={"fmt": "json", "indent": 3},
+            )
+            sD = obEx.getStats()
+            logger.info("Extraction statistics %s", json.dumps(sD, indent=3))
+            self.assertEqual(sD["counts"]["documentsRead"], obEx.getCount())
+            self.assertEqual(sD["counts"]["cacheObjectsWritten"], obEx.getCount())
+            self.assertGreater(sD["counts"]["bytesDecoded"], 0)
+            self.assertGreaterEqual(sD["counts"]["roundTrips"], 3)
+            for phase in ["query", "decode", "keyBuilding", "callback", "cacheIo"]:
+                self.assertIn(phase, sD["phaseSeconds"])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExplainEntityQueries(self):
+        """Test case - record selection query plans and recommended indexes"""
+        try:
+            QueryPlanAdvisor.clear()
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                useCache=False,
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                selectionQuery={"entity_poly.rcsb_entity_polymer_type": "Protein"},
+                selectionList=["rcsb_id"],
+                explainQueries=True,
+            )
+            self.assertGreater(obEx.getCount(), 0)
+            pL = QueryPlanAdvisor.getPlans()
+            self.assertEqual(len(pL), 1)
+            self.assertIn(pL[0]["stage"], ["COLLSCAN", "IXSCAN"])
+            self.assertEqual(pL[0]["nReturned"], obEx.getCount())
+            rL = QueryPlanAdvisor.logRecommendations()
+            if pL[0]["stage"] == "COLLSCAN":
+                self.assertEqual(rL[0]["keys"], ["entity_poly.rcsb_entity_polymer_type"])
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractRawBsonBenchmark(self):
+        """Test case - compare decoded and raw BSON extraction of entry and polymer entity objects"""
+        try:
+            for collectionName in ["pdbx_core_entry", "pdbx_core_polymer_entity"]:
+                tD = {}
+                for rawBson in [False, True]:
+                    startTime = time.time()
+                    obEx = ObjectExtractor(self.__cfgOb, databaseName="pdbx_core", collectionName=collectionName, useCache=False, uniqueAttributes=["rcsb_id"], rawBson=rawBson)
+                    objD = obEx.getObjects()
+                    # Touch a single attribute per object as a typical selective consumer
+                    idL = [obj["rcsb_id"] for obj in objD.values()]
+                    tD[rawBson] = (time.time() - startTime, objD, obEx)
+                    logger.info("%s rawBson %r extracted %d objects (%.4f seconds) %r", collectionName, rawBson, len(idL), tD[rawBson][0], obEx.getStats()["counts"])
+                objD, (_, rawD, obEx) = tD[False][1], tD[True]
+                self.assertEqual(len(rawD), len(objD))
+                self.assertEqual({ky: obEx.materializeObject(obj) for ky, obj in rawD.items()}, objD)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractAsyncGather(self):
+        """Test case - concurrent extractions with asyncio.gather()"""
+
+        async def extractAll():
+            return await asyncio.gather(
+                ObjectExtractor.createAsync(self.__cfgOb, databaseName="pdbx_core", collectionName="pdbx_core_entry", useCache=False, uniqueAttributes=["rcsb_id"]),
+                ObjectExtractor.createAsync(self.__cfgOb, databaseName="pdbx_core", collectionName="pdbx_core_polymer_entity", useCache=False, uniqueAttributes=["rcsb_id"]),
+                obEx.getDistinctValuesAsync("rcsb_entity_source_organism.ncbi_taxonomy_id"),
+            )
+
+        try:
+            obEx = ObjectExtractor(self.__cfgOb, databaseName="pdbx_core", collectionName="pdbx_core_polymer_entity", streamObjects=True)
+            entryEx, entityEx, taxIdL = asyncio.run(extractAll())
+            logger.info("Entries %d entities %d taxonomies %d", entryEx.getCount(), entityEx.getCount(), len(taxIdL))
+            self.assertEqual(entryEx.getCount(), ObjectExtractor(self.__cfgOb, databaseName="pdbx_core", collectionName="pdbx_core_entry", useCache=False).getCount())
+            self.assertEqual(sorted(taxIdL), sorted(obEx.getDistinctValues("rcsb_entity_source_organism.ncbi_taxonomy_id")))
+            self.assertGreater(entityEx.getCount(), 0)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testDiscoverEntityPaths(self):
+        """Test case - estimate polymer entity path frequencies from a stratified document sample"""
+        try:
+            obEx = ObjectExtractor(self.__cfgOb, databaseName="pdbx_core", collectionName="pdbx_core_polymer_entity", streamObjects=True)
+            rD = obEx.discoverPaths(sampleSize=50, stratifyAttribute="entity_poly.rcsb_entity_polymer_type", countRarePaths=True, rareFrequency=0.1)
+            logger.info("Sampled %d of %d entities paths %d", rD["sampleSize"], rD["populationSize"], len(rD["paths"]))
+            self.assertGreater(rD["sampleSize"], 0)
+            self.assertLessEqual(rD["sampleSize"], rD["populationSize"])
+            pD = rD["paths"]["rcsb_id"]
+            self.assertAlmostEqual(pD["frequency"], 1.0)
+            self.assertLessEqual(pD["lower"], pD["frequency"])
+            for pD in rD["paths"].values():
+                self.assertTrue(pD["lower"] <= pD["frequency"] <= pD["upper"])
+            self.assertIn("entity_poly.rcsb_entity_polymer_type", obEx.getPathList())
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testStreamEntities(self):
+        """Test case - stream entity objects from a server-side cursor"""
+        try:
+            selectionList = ["rcsb_id", "rcsb_entity_source_organism.ncbi_taxonomy_id"]
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                useCache=False,
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                selectionList=selectionList,
+            )
+            objD = obEx.getObjects()
+            #
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                selectionList=selectionList,
+                streamObjects=True,
+            )
+            self.assertEqual(obEx.getCount(), 0)
+            sD = {ky: obj for ky, obj in obEx.iterObjects(batchSize=2)}
+            logger.info("Streamed entity count is %d", len(sD))
+            self.assertGreaterEqual(len(sD), self.__objectLimitTest)
+            self.assertEqual(sD, objD)
+            #
+            sL = list(obEx.iterObjects(objectLimit=self.__objectLimitTest))
+            self.assertEqual(len(sL), self.__objectLimitTest)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testExtractEntryColumns(self):
+        """Test case - extract scalar entry attributes as columns"""
+        try:
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_entry",
+                useCache=False,
+                keyAttribute="entry",
+                uniqueAttributes=["rcsb_id"],
+                streamObjects=True,
+            )
+            pathL = ["rcsb_entry_info.polymer_entity_count", "rcsb_entry_info.selected_polymer_entity_types"]
+            cD = obEx.getColumns(pathL)
+            numEntries = len(cD["keys"])
+            logger.info("Entry column length is %d", numEntries)
+            self.assertGreaterEqual(numEntries, self.__objectLimitTest)
+            countA = cD["columns"]["rcsb_entry_info.polymer_entity_count"]
+            self.assertEqual(countA.dtype.kind, "i")
+            self.assertEqual(len(cD["columns"]["rcsb_entry_info.selected_polymer_entity_types"]), numEntries)
+            self.assertEqual(len(cD["masks"]["rcsb_entry_info.polymer_entity_count"]), numEntries)
+            #
+            objD = {ky: obj for ky, obj in obEx.iterObjects(selectionList=["rcsb_id"] + pathL)}
+            idL = cD["keys"][countA == 1].tolist()
+            self.assertEqual(sorted(idL), sorted([ky for ky, obj in objD.items() if obj["rcsb_entry_info"]["polymer_entity_count"] == 1]))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testAggregateEntityTaxonomyContent(self):
+        """Test case - compute unique entity source taxonomies on the server"""
+        try:
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                useCache=False,
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                selectionList=["rcsb_id", "rcsb_entity_source_organism.ncbi_taxonomy_id"],
+                streamObjects=True,
+            )
+            taxIdS = set()
+            for _, eD in obEx.iterObjects():
+                for tD in eD.get("rcsb_entity_source_organism", []):
+                    if "ncbi_taxonomy_id" in tD:
+                        taxIdS.add(tD["ncbi_taxonomy_id"])
+            taxIdL = obEx.getDistinctValues("rcsb_entity_source_organism.ncbi_taxonomy_id")
+            logger.info("Unique source taxons %d", len(taxIdL))
+            self.assertGreater(len(taxIdL), 0)
+            self.assertEqual(sorted(taxIdL), sorted(taxIdS))
+            #
+            tD = obEx.getGroupedValues("rcsb_entity_source_organism.ncbi_taxonomy_id", "rcsb_id")
+            self.assertEqual(sorted(tD.keys()), sorted(taxIdS))
+            #
+            # An element query on a path within the selected attribute (overlapping projection paths)
+            orgL = obEx.getDistinctValues("rcsb_entity_source_organism", elementQuery={"rcsb_entity_source_organism.ncbi_taxonomy_id": {"$exists": True}})
+            self.assertEqual({oD["ncbi_taxonomy_id"] for oD in orgL}, taxIdS)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
     def testExtractEntityTaxonomyContent(self):
         """Test case - extract unique entity source and host taxonomies"""
         try:
@@ -334,6 +698,9 @@ def objectExtractorSuite():
     suiteSelect.addTest(ObjectExtractorTests("testExtractEntries"))
     suiteSelect.addTest(ObjectExtractorTests("testExtractEntities"))
     suiteSelect.addTest(ObjectExtractorTests("testExtractSelectedEntityContent"))
+    suiteSelect.addTest(ObjectExtractorTests("testStreamEntities"))
+    suiteSelect.addTest(ObjectExtractorTests("testExtractEntryColumns"))
+    suiteSelect.addTest(ObjectExtractorTests("testAggregateEntityTaxonomyContent"))
     return suiteSelect
 
 
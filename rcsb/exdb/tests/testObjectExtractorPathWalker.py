@@ -0,0 +1,234 @@
+##
+# File:    testObjectExtractorPathWalker.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+# 17-Oct-2026 dwp add path trie leaf filtering and prefix query tests
+#
+##
+"""
+Tests and benchmark for the ObjectExtractor JSON path walker (genPathList/genValueList) compared with
+the previous recursive implementation.  Uses synthetic documents sized like full pdbx_core_entry documents.
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class RecursivePathWalker(object):
+    """Previous (recursive) ObjectExtractor path walker retained as the reference implementation."""
+
+    def __init__(self):
+        self.objPathD = {}
+        self.objValD = {}
+
+    def __toJsonPathString(self, path):
+        pL = [ky if ky else "[]" for ky in path]
+        sp = ".".join(pL)
+        sp = sp.replace(".[", "[")
+        return sp
+
+    def __pathCallBack(self, path, value):
+        sp = self.__toJsonPathString(path)
+        self.objPathD[sp] = self.objPathD[sp] + 1 if sp in self.objPathD else 1
+        return value
+
+    def __saveCallBack(self, path, value):
+        sP = self.__toJsonPathString(path)
+        if sP in self.objPathD:
+            ky = sP.replace("[]", "")
+            if sP.find("[") != -1:  # multivalued
+                if isinstance(value, list):
+                    self.objValD.setdefault(ky, []).extend(value)
+                else:
+                    self.objValD.setdefault(ky, []).append(value)
+            else:
+                self.objValD[ky] = value
+        return value
+
+    def getPathList(self):
+        tL = []
+        for ky in self.objPathD:
+            if ky and (ky.find(".") != -1 or ky.startswith("_")) and ky not in ["_id"] and not ky.endswith("[]"):
+                tL.append(ky)
+        kL = []
+        for ky in tL:
+            for tky in tL:
+                ok = True
+                if ky in tky and ky != tky:
+                    ok = False
+                    break
+            if ok:
+                kL.append(ky)
+        return sorted(kL)
+
+    def genPathList(self, dObj, path=None):
+        return self.__walk(dObj, jsonPath=path, funct=self.__pathCallBack)
+
+    def genValueList(self, dObj, path=None):
+        self.objValD = {}
+        return self.__walk(dObj, jsonPath=path, funct=self.__saveCallBack)
+
+    def __walk(self, jsonObj, jsonPath=None, funct=None):
+        if jsonPath is None:
+            jsonPath = []
+        if isinstance(jsonObj, dict):
+            value = {k: self.__walk(v, jsonPath + [k], funct) for k, v in jsonObj.items()}
+        elif isinstance(jsonObj, list):
+            value = [self.__walk(elem, jsonPath + [[]], funct) for elem in jsonObj]
+        else:
+            value = jsonObj
+        return funct(jsonPath, value)
+
+
+class ObjectExtractorPathWalkerTests(unittest.TestCase):
+    def setUp(self):
+        self.__docList = [self.__makeEntryDocument(ii) for ii in range(20)]
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def __makeEntryDocument(self, idx):
+        """Return a synthetic document with the nesting and size (~25k elements) of a full entry document."""
+        dD = {"rcsb_id": "%04d" % idx, "rcsb_entry_info": {"polymer_entity_count": idx % 4, "resolution_combined": [1.5 + idx / 10.0], "selected_polymer_entity_types": "Protein"}}
+        for jj in range(40):
+            dD["category_%02d" % jj] = [
+                {
+                    "id": str(kk),
+                    "name": "name %d" % kk,
+                    "value": kk * 1.5,
+                    "details": {"provenance_source": "PDB", "database_name": "UniProt", "ordinals": list(range(kk % 5))},
+                    "features": [{"type": "SIFTS", "beg_seq_id": ll, "end_seq_id": ll + 10} for ll in range(3)],
+                }
+                for kk in range(20)
+            ]
+        dD["rcsb_accession_info"] = {"deposit_date": "2020-01-01", "status_code": "REL"}
+        dD["nested_lists"] = [[ii, ii + 1] for ii in range(5)]
+        return dD
+
+    def testPathListEquivalence(self):
+        """Test case - path list and counts match the recursive implementation"""
+        obEx = ObjectExtractor(None, streamObjects=True)
+        rW = RecursivePathWalker()
+        for dD in self.__docList:
+            obEx.genPathList(dD)
+            rW.genPathList(dD)
+        obEx.genPathList(self.__docList[0]["category_01"], path=["category_01"])
+        rW.genPathList(self.__docList[0]["category_01"], path=["category_01"])
+        # The root element (empty path) recorded by the recursive walker is not recorded
+        self.assertEqual(obEx.getPathList(filterList=False), sorted(ky for ky in rW.objPathD if ky))
+        self.assertNotIn("", obEx.getPathCounts())
+        self.assertIn("category_01[].features[].beg_seq_id", obEx.getPathList(filterList=False))
+        self.assertIn("nested_lists[][]", obEx.getPathList(filterList=False))
+
+    def testValueListEquivalence(self):
+        """Test case - saved values match the recursive implementation"""
+        pathL = ["rcsb_id", "rcsb_entry_info.polymer_entity_count", "category_03[].details.ordinals", "category_07[].features[].type", "nested_lists[][]", "rcsb_accession_info"]
+        obEx = ObjectExtractor(None, streamObjects=True)
+        obEx.setPathList(pathL)
+        rW = RecursivePathWalker()
+        rW.objPathD = {k: True for k in pathL}
+        for dD in self.__docList:
+            obEx.genValueList(dD)
+            rW.genValueList(dD)
+            self.assertEqual(obEx.getValues(), rW.objValD)
+        self.assertEqual(len(obEx.getValues()["category_07.features.type"]), 60)
+
+    def testLeafPathList(self):
+        """Test case - trie leaf path filtering matches the previous pairwise filtering"""
+        obEx = ObjectExtractor(None, streamObjects=True)
+        rW = RecursivePathWalker()
+        for dD in self.__docList:
+            obEx.genPathList(dD)
+            rW.genPathList(dD)
+        t0 = time.time()
+        rL = rW.getPathList()
+        t1 = time.time()
+        pL = obEx.getPathList()
+        t2 = time.time()
+        logger.info("getPathList (%d paths) pairwise %.4f trie %.4f seconds", len(obEx.getPathList(filterList=False)), t1 - t0, t2 - t1)
+        self.assertEqual(pL, rL)
+        self.assertIn("category_01[].details.ordinals", pL)
+        self.assertNotIn("category_01[].details", pL)
+
+    def testPathPrefixQueries(self):
+        """Test case - path prefix queries and counts"""
+        obEx = ObjectExtractor(None, streamObjects=True)
+        for dD in self.__docList:
+            obEx.genPathList(dD)
+        pL = obEx.getPathList(prefix="rcsb_entry_info")
+        self.assertEqual(pL, ["rcsb_entry_info.polymer_entity_count", "rcsb_entry_info.resolution_combined", "rcsb_entry_info.selected_polymer_entity_types"])
+        self.assertEqual(
+            obEx.getPathList(filterList=False, prefix="rcsb_accession_info"), ["rcsb_accession_info", "rcsb_accession_info.deposit_date", "rcsb_accession_info.status_code"]
+        )
+        self.assertEqual(obEx.getPathList(prefix="rcsb_missing"), [])
+        cD = obEx.getPathCounts(prefix="category_02[].features[]")
+        self.assertEqual(cD["category_02[].features[].type"], 20 * 20 * 3)
+        self.assertNotIn("", obEx.getPathList(filterList=False, prefix=""))
+        # Leaf paths are path prefixes (not substrings) of other paths
+        obEx = ObjectExtractor(None, streamObjects=True)
+        obEx.genPathList({"entity": {"id": "1"}, "pdbx_entity": {"id": "1", "details": {"name": "x"}}, "_private": 1})
+        self.assertEqual(obEx.getPathList(), ["_private", "entity.id", "pdbx_entity.details.name", "pdbx_entity.id"])
+        #
+        obEx.setPathList(["a.b", "a.b.c"])
+        self.assertEqual(obEx.getPathList(), ["a.b.c"])
+
+    def testWalkerBenchmark(self):
+        """Test case - benchmark iterative and recursive path walkers"""
+        obEx = ObjectExtractor(None, streamObjects=True)
+        rW = RecursivePathWalker()
+        t0 = time.time()
+        for dD in self.__docList:
+            rW.genPathList(dD)
+        t1 = time.time()
+        for dD in self.__docList:
+            obEx.genPathList(dD)
+        t2 = time.time()
+        logger.info("genPathList (%d documents) recursive %.4f iterative %.4f seconds", len(self.__docList), t1 - t0, t2 - t1)
+        #
+        pathL = ["rcsb_id", "rcsb_entry_info.polymer_entity_count", "category_07[].features[].type"]
+        obEx.setPathList(pathL)
+        rW.objPathD = {k: True for k in pathL}
+        t0 = time.time()
+        for dD in self.__docList:
+            rW.genValueList(dD)
+        t1 = time.time()
+        for dD in self.__docList:
+            obEx.genValueList(dD)
+        t2 = time.time()
+        logger.info("genValueList (%d documents %d paths) recursive %.4f compiled %.4f seconds", len(self.__docList), len(pathL), t1 - t0, t2 - t1)
+        self.assertEqual(obEx.getValues(), rW.objValD)
+
+
+def pathWalkerSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ObjectExtractorPathWalkerTests("testPathListEquivalence"))
+    suiteSelect.addTest(ObjectExtractorPathWalkerTests("testValueListEquivalence"))
+    suiteSelect.addTest(ObjectExtractorPathWalkerTests("testLeafPathList"))
+    suiteSelect.addTest(ObjectExtractorPathWalkerTests("testPathPrefixQueries"))
+    suiteSelect.addTest(ObjectExtractorPathWalkerTests("testWalkerBenchmark"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = pathWalkerSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
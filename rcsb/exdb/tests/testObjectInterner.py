@@ -0,0 +1,86 @@
+##
+# File:    testObjectInterner.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for sharing repeated keys and low cardinality string values of extracted objects.
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import copy
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.ObjectInterner import ObjectInterner
+from rcsb.utils.io.IoUtil import getObjSize
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class ObjectInternerTests(unittest.TestCase):
+    def setUp(self):
+        # Build separate string instances for each repeated key and value (as decoded from BSON)
+        def sL(tS):
+            return "".join(list(tS))
+
+        self.__objectD = {
+            "P%05d"
+            % ii: {
+                sL("rcsb_id"): "P%05d" % ii,
+                sL("reference_sequence_identifiers"): [{sL("provenance_source"): sL("PDB"), sL("database_name"): sL("UniProt"), sL("database_accession"): "P%05d" % ii}],
+                sL("names"): ["name %d" % (ii % 5), "alias %d" % (ii % 3)],
+            }
+            for ii in range(2000)
+        }
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testInternObjects(self):
+        """Test case - intern keys and low cardinality values"""
+        refD = copy.deepcopy(self.__objectD)
+        sizeBefore = getObjSize(self.__objectD)
+        oI = ObjectInterner(cardinalityLimit=100)
+        for obj in self.__objectD.values():
+            oI.internObject(obj)
+        sizeAfter = getObjSize(self.__objectD)
+        sD = oI.getStats()
+        logger.info("Object size before %d after %d stats %r", sizeBefore, sizeAfter, sD)
+        self.assertEqual(self.__objectD, refD)
+        self.assertGreater(sD["bytesSaved"], 0)
+        # The estimate excludes the single shared instances retained for each interned string
+        self.assertAlmostEqual(sizeBefore - sizeAfter, sD["bytesSaved"], delta=0.01 * sD["bytesSaved"])
+        #
+        rL = [obj["reference_sequence_identifiers"][0] for obj in self.__objectD.values()]
+        self.assertIs(rL[0]["database_name"], rL[1]["database_name"])
+        self.assertIs(self.__objectD["P00000"]["names"][0], self.__objectD["P00005"]["names"][0])
+        # High cardinality values are not shared
+        self.assertEqual(sD["sharedAttributes"], 3)
+
+
+def objectInternerSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ObjectInternerTests("testInternObjects"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = objectInternerSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
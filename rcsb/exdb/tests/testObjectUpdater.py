@@ -22,6 +22,7 @@ import resource
 import time
 import unittest
 
+from rcsb.exdb.utils.MongoClientRegistry import MongoClientRegistry
 from rcsb.exdb.utils.ObjectExtractor import ObjectExtractor
 from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
 from rcsb.utils.config.ConfigUtil import ConfigUtil
@@ -108,10 +109,116 @@ class ObjectUpdaterTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testBulkUpdateEntityContent(self):
+        """Test case - bulk (batched) update of entity content"""
+        try:
+            databaseName = "pdbx_core"
+            collectionName = "pdbx_core_polymer_entity"
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName=databaseName,
+                collectionName=collectionName,
+                useCache=False,
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                objectLimit=self.__objectLimitTest,
+                selectionList=["rcsb_id"],
+            )
+            # A time stamp value ensures every selected document is modified
+            tS = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime()) + "-%d" % os.getpid()
+            updateDL = [{"selectD": {"rcsb_id": entityKey}, "updateD": {"rcsb_polymer_entity_container_identifiers.rcsb_bulk_update_test": tS}} for entityKey in obEx.getObjects()]
+            obUpd = ObjectUpdater(self.__cfgOb, bulkBatchSize=7)
+            numUpd = obUpd.update(databaseName, collectionName, updateDL)
+            logger.info("Bulk update count is %d statistics %r", numUpd, obUpd.getStats()["counts"])
+            self.assertEqual(numUpd, len(updateDL))
+            self.assertEqual(obUpd.getBatchErrors(), [])
+            self.assertEqual(obUpd.getStats()["counts"]["documentsMatched"], len(updateDL))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testSkipUnchangedEntityContent(self):
+        """Test case - repeated updates with unchanged content are reduced to the volatile time stamp"""
+        try:
+            databaseName = "pdbx_core"
+            collectionName = "pdbx_core_polymer_entity"
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName=databaseName,
+                collectionName=collectionName,
+                useCache=False,
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                objectLimit=self.__objectLimitTest,
+                selectionList=["rcsb_id"],
+            )
+            # Only the volatile time stamp differs between the two update passes
+            tag = "skip-unchanged-test-%d" % os.getpid()
+            obUpd = ObjectUpdater(self.__cfgOb, bulkBatchSize=7, skipUnchanged=True)
+            for ii in range(2):
+                tS = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime()) + "-%d" % ii
+                updateD = {"rcsb_polymer_entity_container_identifiers.rcsb_skip_test": tag, "rcsb_last_update": tS}
+                updateDL = [{"selectD": {"rcsb_id": entityKey}, "updateD": updateD} for entityKey in obEx.getObjects()]
+                obUpd.update(databaseName, collectionName, updateDL)
+            cD = obUpd.getStats()["counts"]
+            logger.info("Update statistics %r", cD)
+            self.assertEqual(cD["updateRequests"], 2 * len(updateDL))
+            self.assertEqual(cD["updatesReduced"], len(updateDL))
+            self.assertNotIn("updatesSkipped", cD)
+            dD = MongoClientRegistry.getClient(self.__cfgOb)[databaseName][collectionName].find_one(updateDL[0]["selectD"])
+            self.assertEqual(dD["rcsb_last_update"], tS)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
+    def testSkipUnchangedAfterExternalUpdate(self):
+        """Test case - updates written without skipUnchanged remove the stored content hash so reloads are applied"""
+        try:
+            databaseName = "pdbx_core"
+            collectionName = "pdbx_core_polymer_entity"
+            obEx = ObjectExtractor(
+                self.__cfgOb,
+                databaseName=databaseName,
+                collectionName=collectionName,
+                useCache=False,
+                keyAttribute="entity",
+                uniqueAttributes=["rcsb_id"],
+                objectLimit=self.__objectLimitTest,
+                selectionList=["rcsb_id"],
+            )
+            tag = "skip-unchanged-external-test-%d" % os.getpid()
+            updateDL = [{"selectD": {"rcsb_id": entityKey}, "updateD": {"rcsb_polymer_entity_container_identifiers.rcsb_skip_test": tag}} for entityKey in obEx.getObjects()]
+            obUpd = ObjectUpdater(self.__cfgOb, skipUnchanged=True)
+            obUpd.update(databaseName, collectionName, updateDL)
+            clt = MongoClientRegistry.getClient(self.__cfgOb)[databaseName][collectionName]
+            self.assertIsNotNone(clt.find_one(updateDL[0]["selectD"]).get("rcsb_content_hash"))
+            #
+            # An update by a writer without skipUnchanged modifies the content and removes the stored hash
+            extUpdateDL = [{"selectD": tD["selectD"], "updateD": {"rcsb_polymer_entity_container_identifiers.rcsb_skip_test": "external"}} for tD in updateDL]
+            ObjectUpdater(self.__cfgOb, bulkBatchSize=7).update(databaseName, collectionName, extUpdateDL)
+            self.assertNotIn("rcsb_content_hash", clt.find_one(updateDL[0]["selectD"]))
+            #
+            # Reloading the original content is applied (rather than skipped as matching an out of date hash)
+            obUpd = ObjectUpdater(self.__cfgOb, skipUnchanged=True)
+            obUpd.update(databaseName, collectionName, updateDL)
+            cD = obUpd.getStats()["counts"]
+            logger.info("Update statistics %r", cD)
+            self.assertNotIn("updatesSkipped", cD)
+            self.assertNotIn("updatesReduced", cD)
+            dD = clt.find_one(updateDL[0]["selectD"])
+            self.assertEqual(dD["rcsb_polymer_entity_container_identifiers"]["rcsb_skip_test"], tag)
+            self.assertIsNotNone(dD.get("rcsb_content_hash"))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def objectUpdaterSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ObjectUpdaterTests("testUpdateSelectedEntityContent"))
+    suiteSelect.addTest(ObjectUpdaterTests("testBulkUpdateEntityContent"))
+    suiteSelect.addTest(ObjectUpdaterTests("testSkipUnchangedEntityContent"))
+    suiteSelect.addTest(ObjectUpdaterTests("testSkipUnchangedAfterExternalUpdate"))
     return suiteSelect
 
 
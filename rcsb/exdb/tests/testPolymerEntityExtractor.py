@@ -65,6 +65,7 @@ class PolymerEntityExtractorTests(unittest.TestCase):
             pD, _ = pEx.getProteinSequenceDetails()
             #
             self.assertGreaterEqual(len(pD), 70)
+            self.assertEqual(list(pD.keys()), sorted(pD.keys()))
             logger.info("Polymer entity count %d", len(pD))
         except Exception as e:
             logger.exception("Failing with %s", str(e))
@@ -0,0 +1,97 @@
+##
+# File:    testQueryPlanAdvisor.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the query plan summaries and index recommendations.
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.QueryPlanAdvisor import QueryPlanAdvisor
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class QueryPlanAdvisorTests(unittest.TestCase):
+    def setUp(self):
+        QueryPlanAdvisor.clear()
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        QueryPlanAdvisor.clear()
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testPlanSummaryRecommendations(self):
+        """Test case - plan summaries and recommended indexes"""
+        collScanD = {
+            "queryPlanner": {"winningPlan": {"stage": "PROJECTION_SIMPLE", "inputStage": {"stage": "COLLSCAN"}}},
+            "executionStats": {"nReturned": 40, "totalDocsExamined": 1000, "totalKeysExamined": 0},
+        }
+        ixScanD = {
+            "queryPlanner": {"winningPlan": {"queryPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "primary"}}}},
+            "executionStats": {"nReturned": 1, "totalDocsExamined": 1, "totalKeysExamined": 1},
+        }
+        q1 = {"entity_poly.rcsb_entity_polymer_type": "Protein", "rcsb_entry_info.resolution_combined": {"$lt": 2.0}}
+        q2 = {"$and": [{"rcsb_chem_comp_related.resource_name": {"$eq": "DrugBank"}}, {"rcsb_id": {"$in": ["ATP", "HEM"]}}]}
+        pD = QueryPlanAdvisor.record("pdbx_core", "pdbx_core_polymer_entity", q1, collScanD)
+        self.assertEqual(pD["stage"], "COLLSCAN")
+        self.assertEqual(pD["docsExamined"], 1000)
+        pD = QueryPlanAdvisor.record("pdbx_core", "pdbx_core_entry", {"rcsb_id": "1ABC"}, ixScanD)
+        self.assertEqual((pD["stage"], pD["indexName"]), ("IXSCAN", "primary"))
+        QueryPlanAdvisor.record("bird_chem_comp_core", "bird_chem_comp_core", q2, collScanD)
+        self.assertEqual(QueryPlanAdvisor.getIndexKeys(q1), ["entity_poly.rcsb_entity_polymer_type", "rcsb_entry_info.resolution_combined"])
+        self.assertEqual(QueryPlanAdvisor.getIndexKeys(q2), ["rcsb_chem_comp_related.resource_name", "rcsb_id"])
+        self.assertEqual(QueryPlanAdvisor.getIndexKeys({"_id": {"$gt": 0}}), [])
+        #
+        rL = QueryPlanAdvisor.logRecommendations()
+        self.assertEqual(len(rL), 2)
+        self.assertEqual({rD["collectionName"] for rD in rL}, {"pdbx_core_polymer_entity", "bird_chem_comp_core"})
+        rD = QueryPlanAdvisor.getReport()
+        self.assertEqual(len(rD["plans"]), 3)
+        self.assertTrue(json.dumps(rD))
+
+    def testMergePlans(self):
+        """Test case - merge plan summaries recorded in worker processes"""
+        explainD = {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}, "executionStats": {"nReturned": 2, "totalDocsExamined": 100}}
+        q1 = {"rcsb_entry_info.polymer_entity_count": {"$gt": 1}}
+        q2 = {"rcsb_id": "1ABC"}
+        QueryPlanAdvisor.record("pdbx_core", "pdbx_core_entry", q1, explainD)
+        pD = QueryPlanAdvisor.getPlan("pdbx_core", "pdbx_core_entry", q1)
+        self.assertEqual(pD["queryCount"], 1)
+        self.assertIsNone(QueryPlanAdvisor.getPlan("pdbx_core", "pdbx_core_entry", q2))
+        QueryPlanAdvisor.merge([pD, {**pD, "query": q2}])
+        self.assertEqual(QueryPlanAdvisor.getPlan("pdbx_core", "pdbx_core_entry", q1)["queryCount"], 2)
+        self.assertEqual(QueryPlanAdvisor.getPlan("pdbx_core", "pdbx_core_entry", q2)["queryCount"], 1)
+        self.assertEqual(len(QueryPlanAdvisor.getPlans()), 2)
+
+
+def queryPlanAdvisorSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(QueryPlanAdvisorTests("testPlanSummaryRecommendations"))
+    suiteSelect.addTest(QueryPlanAdvisorTests("testMergePlans"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = queryPlanAdvisorSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
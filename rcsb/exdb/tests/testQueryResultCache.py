@@ -0,0 +1,100 @@
+##
+# File:    testQueryResultCache.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the process-wide query result cache.
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import time
+import unittest
+
+from rcsb.exdb.utils.QueryResultCache import QueryResultCache
+from rcsb.utils.io.IoUtil import getObjSize
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class QueryResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__limitD = QueryResultCache.getLimits()
+        QueryResultCache.clear()
+        self.__resultSize = getObjSize({"id%d" % ii: {} for ii in range(10)})
+        QueryResultCache.setLimits(maxEntries=3, maxBytes=4 * self.__resultSize)
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        QueryResultCache.clear()
+        QueryResultCache.setLimits(**self.__limitD)
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def testCacheEvictionInvalidation(self):
+        """Test case - cache lookup, LRU eviction and collection invalidation"""
+        k1 = QueryResultCache.getKey("uniprot_exdb", "reference_match", query={"b": 1, "a": 2}, projection=["rcsb_id"])
+        self.assertEqual(k1, QueryResultCache.getKey("uniprot_exdb", "reference_match", query={"a": 2, "b": 1}, projection=["rcsb_id"]))
+        k2 = QueryResultCache.getKey("uniprot_exdb", "reference_entry")
+        k3 = QueryResultCache.getKey("pubchem_exdb", "reference_match_index")
+        k4 = QueryResultCache.getKey("pubchem_exdb", "reference_match_index", query={"matched_ids": {"$exists": True}})
+        self.assertIsNone(QueryResultCache.get(k1))
+        for ky in [k1, k2, k3]:
+            self.assertTrue(QueryResultCache.set(ky, {"id%d" % ii: {} for ii in range(10)}))
+        self.assertEqual(len(QueryResultCache.get(k1)), 10)
+        # k2 is least recently used
+        QueryResultCache.set(k4, {"x": {}})
+        self.assertIsNone(QueryResultCache.get(k2))
+        self.assertIsNotNone(QueryResultCache.get(k1))
+        self.assertFalse(QueryResultCache.set(k2, {"id%d" % ii: {} for ii in range(100)}))
+        #
+        self.assertEqual(QueryResultCache.invalidate("pubchem_exdb"), 2)
+        self.assertEqual(QueryResultCache.invalidate("uniprot_exdb", "reference_match"), 1)
+        sD = QueryResultCache.getStats()
+        logger.info("Cache stats %r", sD)
+        self.assertEqual(sD["entries"], 0)
+        self.assertEqual(sD["bytes"], 0)
+        self.assertEqual(sD["evictions"], 1)
+        self.assertEqual(sD["invalidations"], 3)
+
+    def testCacheSizeLimit(self):
+        """Test case - results are bounded by their estimated size in bytes and caching may be disabled"""
+        keyL = [QueryResultCache.getKey("uniprot_exdb", "reference_entry", query={"id": ii}) for ii in range(3)]
+        for ky in keyL[:2]:
+            self.assertTrue(QueryResultCache.set(ky, {"id%d" % ii: {} for ii in range(10)}))
+        self.assertEqual(QueryResultCache.getStats()["bytes"], 2 * self.__resultSize)
+        # A larger result evicts the least recently used results to stay within the size limit
+        self.assertTrue(QueryResultCache.set(keyL[2], {"id%d" % ii: {} for ii in range(30)}))
+        self.assertIsNone(QueryResultCache.get(keyL[0]))
+        self.assertLessEqual(QueryResultCache.getStats()["bytes"], 4 * self.__resultSize)
+        #
+        QueryResultCache.setLimits(maxBytes=0)
+        self.assertEqual(QueryResultCache.getStats()["entries"], 0)
+        self.assertFalse(QueryResultCache.set(keyL[0], {"x": {}}))
+        self.assertIsNone(QueryResultCache.get(keyL[0]))
+
+
+def queryResultCacheSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(QueryResultCacheTests("testCacheEvictionInvalidation"))
+    suiteSelect.addTest(QueryResultCacheTests("testCacheSizeLimit"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = queryResultCacheSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
@@ -105,10 +105,43 @@ class ReferenceSequenceAssignmentProviderTests(unittest.TestCase):
             logger.exception("Failing with %s", str(e))
             self.fail()
 
+    def testAssignmentProviderSharded(self):
+        """Test case - create and read a key sharded reference sequence data cache"""
+        try:
+            cacheKwargs = {"fmt": "shard", "numShards": 8}
+            rsaP = ReferenceSequenceAssignmentProvider(
+                self.__cfgOb,
+                databaseName="pdbx_core",
+                collectionName="pdbx_core_polymer_entity",
+                polymerType="Protein",
+                referenceDatabaseName="UniProt",
+                provSource="PDB",
+                useCache=False,
+                cachePath=self.__cachePath,
+                cacheKwargs=cacheKwargs,
+                fetchLimit=self.__fetchLimitTest,
+                siftsAbbreviated="TEST",
+            )
+            ok = rsaP.testCache()
+            self.assertTrue(ok)
+            numRef = rsaP.getRefDataCount()
+            self.assertGreaterEqual(numRef, 49)
+            self.assertTrue(os.path.isdir(os.path.join(self.__cachePath, "exdb", "UniProt-ref-sequence-data-cache-shards")))
+            #
+            # ---  Reload all shards from cache ---
+            rsaP = ReferenceSequenceAssignmentProvider(self.__cfgOb, referenceDatabaseName="UniProt", useCache=True, cachePath=self.__cachePath, cacheKwargs=cacheKwargs)
+            ok = rsaP.testCache()
+            self.assertTrue(ok)
+            self.assertEqual(rsaP.getRefDataCount(), numRef)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            self.fail()
+
 
 def referenceSequenceAssignmentProviderSuite():
     suiteSelect = unittest.TestSuite()
     suiteSelect.addTest(ReferenceSequenceAssignmentProviderTests("testAssignmentProvider"))
+    suiteSelect.addTest(ReferenceSequenceAssignmentProviderTests("testAssignmentProviderSharded"))
     return suiteSelect
 
 
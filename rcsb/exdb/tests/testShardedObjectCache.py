@@ -0,0 +1,97 @@
+##
+# File:    testShardedObjectCache.py
+# Author:  D. Piehl
+# Date:    17-Oct-2026
+#
+# Updates:
+#
+##
+"""
+Tests for the key sharded object cache.
+"""
+
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import os
+import pickle
+import shutil
+import time
+import unittest
+
+from rcsb.exdb.utils.ShardedObjectCache import ShardedObjectCache
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s]-%(module)s.%(funcName)s: %(message)s")
+logger = logging.getLogger()
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+TOPDIR = os.path.dirname(os.path.dirname(os.path.dirname(HERE)))
+
+
+class ShardedObjectCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.__dirPath = os.path.join(HERE, "test-output", "sharded-object-cache")
+        shutil.rmtree(self.__dirPath, ignore_errors=True)
+        self.__objectD = {"%04d" % ii: {"rcsb_id": "%04d" % ii, "values": list(range(ii % 7))} for ii in range(200)}
+        self.__startTime = time.time()
+        logger.debug("Starting %s at %s", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()))
+
+    def tearDown(self):
+        shutil.rmtree(self.__dirPath, ignore_errors=True)
+        endTime = time.time()
+        logger.info("Completed %s at %s (%.4f seconds)", self.id(), time.strftime("%Y %m %d %H:%M:%S", time.localtime()), endTime - self.__startTime)
+
+    def __getShardMtimes(self):
+        return {fn: os.stat(os.path.join(self.__dirPath, fn)).st_mtime_ns for fn in os.listdir(self.__dirPath) if fn.startswith("shard-")}
+
+    def testShardedWriteLoad(self):
+        """Test case - write, selective load and changed shard rewrite"""
+        sC = ShardedObjectCache(self.__dirPath, numShards=8)
+        self.assertFalse(sC.exists())
+        self.assertTrue(sC.write(self.__objectD, attributes={"refDbName": "UniProt"}))
+        #
+        sC = ShardedObjectCache(self.__dirPath, numShards=32)
+        self.assertEqual(sC.getManifest()["numShards"], 8)
+        self.assertEqual(sC.getManifest()["count"], 200)
+        self.assertEqual(sC.getAttributes()["refDbName"], "UniProt")
+        self.assertEqual(sC.load(), self.__objectD)
+        keyList = ["0003", "0150", "9999"]
+        self.assertEqual(sC.load(keyList=keyList), {ky: self.__objectD[ky] for ky in keyList[:2]})
+        #
+        mtD = self.__getShardMtimes()
+        time.sleep(0.01)
+        # Equal content with differently shared strings (e.g. objects fetched separately) does not rewrite any shard
+        self.assertTrue(sC.write({ky: pickle.loads(pickle.dumps(obj)) for ky, obj in self.__objectD.items()}))
+        self.assertEqual(self.__getShardMtimes(), mtD)
+        self.__objectD["0003"]["values"].append(100)
+        self.assertTrue(sC.write(self.__objectD))
+        changedL = [fn for fn, mt in self.__getShardMtimes().items() if mt != mtD[fn]]
+        self.assertEqual(changedL, ["shard-%s.pic" % sC.getShardId("0003")])
+        #
+        self.assertTrue(sC.update({"1000": {"rcsb_id": "1000"}}))
+        self.assertEqual(len(sC.load()), 201)
+        self.assertEqual(sC.load(keyList=["0003"])["0003"]["values"][-1], 100)
+
+    def testPrefixShardRemoval(self):
+        """Test case - prefix sharding and removal of emptied shards"""
+        sC = ShardedObjectCache(self.__dirPath, shardBy="prefix", prefixLength=2)
+        self.assertTrue(sC.write(self.__objectD))
+        self.assertEqual(sorted(sC.getManifest()["shards"]), ["00", "01"])
+        self.assertTrue(sC.write({ky: obj for ky, obj in self.__objectD.items() if ky < "0100"}))
+        self.assertEqual(sorted(self.__getShardMtimes()), ["shard-00.pic"])
+        self.assertEqual(len(sC.load(keyList=["0001", "0101"])), 1)
+
+
+def shardedObjectCacheSuite():
+    suiteSelect = unittest.TestSuite()
+    suiteSelect.addTest(ShardedObjectCacheTests("testShardedWriteLoad"))
+    suiteSelect.addTest(ShardedObjectCacheTests("testPrefixShardRemoval"))
+    return suiteSelect
+
+
+if __name__ == "__main__":
+    mySuite = shardedObjectCacheSuite()
+    unittest.TextTestRunner(verbosity=2).run(mySuite)
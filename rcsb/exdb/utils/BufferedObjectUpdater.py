@@ -0,0 +1,270 @@
+##
+# File: BufferedObjectUpdater.py
+# Date: 17-Oct-2026  dwp
+#
+# Write-behind buffer of document upserts written by a background thread.
+#
+# Updates:
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import bson
+
+from rcsb.exdb.utils.ObjectUpdater import ObjectUpdater
+from rcsb.exdb.utils.ProcessingStats import ProcessingStats
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedObjectUpdater(object):
+    """Write-behind buffer of upsert requests for a single collection.
+
+    Requests are accumulated and handed to a background writer thread (as ObjectUpdater bulk updates) when the
+    buffer holds maxCount requests or maxBytes of (BSON encoded) update content, or when the oldest buffered
+    request is older than maxSeconds.  Callers continue to fetch and buffer data while earlier requests are
+    written.  At most maxPending batches wait to be written before add() blocks.
+
+    Write errors are collected by the writer thread and raised (IOError) by the next flush() or close().
+    close() must be called (or the object used as a context manager) to write the remaining requests.
+
+    Example:
+        with BufferedObjectUpdater(cfgOb, "pubchem_exdb", "reference_entry") as bUpd:
+            for objD in objDL:
+                bUpd.add({"rcsb_id": objD["rcsb_id"]}, objD)
+    """
+
+    def __init__(self, cfgOb, databaseName, collectionName, maxCount=1000, maxBytes=8000000, maxSeconds=10.0, maxPending=2, **kwargs):
+        """Buffered updater for the input collection.
+
+        Args:
+            cfgOb (obj): configuration object
+            databaseName (str): target database name
+            collectionName (str): target collection name
+            maxCount (int, optional): number of buffered requests triggering a write. Defaults to 1000.
+            maxBytes (int, optional): size (bytes) of buffered update content triggering a write. Defaults to 8000000.
+            maxSeconds (float, optional): age (seconds) of the oldest buffered request triggering a write. Defaults to 10.0.
+            maxPending (int, optional): number of batches waiting to be written before add() blocks. Defaults to 2.
+            kwargs: ObjectUpdater options (e.g. bulkBatchSize (defaults to maxCount), useClientRegistry)
+        """
+        self.__databaseName = databaseName
+        self.__collectionName = collectionName
+        self.__maxCount = max(1, maxCount)
+        self.__maxBytes = maxBytes
+        self.__maxSeconds = maxSeconds
+        self.__maxPending = max(1, maxPending)
+        self.__bulkBatchSize = kwargs.get("bulkBatchSize", self.__maxCount)
+        self.__obUpd = ObjectUpdater(cfgOb, **kwargs)
+        self.__stats = ProcessingStats(databaseName=databaseName, collectionName=collectionName)
+        #
+        self.__cond = threading.Condition()
+        self.__bufferL = []
+        self.__bufferBytes = 0
+        self.__bufferTime = None
+        self.__pendingQ = deque()
+        self.__writing = False
+        self.__closed = False
+        self.__thread = None
+        self.__numRequested = 0
+        self.__numFlushed = 0
+        self.__errorL = []
+        self.__numErrorsReported = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        if args[0] is None:
+            self.close()
+        else:
+            # Do not mask the exception raised in the block
+            try:
+                self.close()
+            except Exception as e:
+                logger.exception("Closing buffered updater for %s %s failing with %s", self.__databaseName, self.__collectionName, str(e))
+        return False
+
+    def add(self, selectD, updateD):
+        """Buffer an upsert of the input update content for documents satisfying the selection.
+
+        Args:
+            selectD (dict): {'ky1': 'val1', 'ky2': 'val2',  ...}
+            updateD (dict): {'key1.subkey1...': 'val1', 'key2.subkey2..': 'val2', ...}
+        """
+        numBytes = self.__getSize(updateD)
+        with self.__cond:
+            if self.__closed:
+                raise ValueError("Buffered updater for %s %s is closed" % (self.__databaseName, self.__collectionName))
+            if not self.__bufferL:
+                self.__bufferTime = time.time()
+            self.__bufferL.append({"selectD": selectD, "updateD": updateD})
+            self.__bufferBytes += numBytes
+            self.__stats.increment("requestsBuffered")
+            self.__stats.increment("bytesBuffered", numBytes)
+            if len(self.__bufferL) >= self.__maxCount or self.__bufferBytes >= self.__maxBytes:
+                self.__queueBuffer()
+            self.__startWriter()
+            self.__cond.notify_all()
+            if len(self.__pendingQ) > self.__maxPending:
+                # Back pressure - the writer is behind the producer
+                with self.__stats.timePhase("addWait"):
+                    while len(self.__pendingQ) > self.__maxPending:
+                        self.__cond.wait()
+
+    def addList(self, updateDL):
+        """Buffer a list of upserts [{"selectD": ..., "updateD": ...}, ...] (see ObjectUpdater.update())."""
+        for updateD in updateDL:
+            self.add(updateD["selectD"], updateD["updateD"])
+
+    def flush(self, wait=True):
+        """Write the buffered requests and wait for all pending writes.
+
+        Args:
+            wait (bool, optional): wait for the pending writes (otherwise hand the buffered requests to the writer and return None). Defaults to True.
+
+        Returns:
+            int: count of requests written since the last flush
+
+        Raises:
+            IOError: if any request written since the last flush failed (see getErrors())
+        """
+        with self.__cond:
+            self.__queueBuffer()
+            if self.__pendingQ:
+                self.__startWriter()
+                self.__cond.notify_all()
+            if not wait:
+                return None
+            with self.__stats.timePhase("flushWait"):
+                while self.__pendingQ or self.__writing:
+                    self.__cond.wait()
+            numFlushed, self.__numFlushed = self.__numFlushed, 0
+            errL = self.__errorL[self.__numErrorsReported :]
+            self.__numErrorsReported = len(self.__errorL)
+        if errL:
+            numFailed = sum([eD["failedRequests"] for eD in errL])
+            raise IOError("Buffered update of %s %s failing for %d requests (%s)" % (self.__databaseName, self.__collectionName, numFailed, errL[0]["message"]))
+        return numFlushed
+
+    def close(self):
+        """Write the buffered requests, stop the writer thread and raise IOError for any write errors (see flush()).
+
+        Returns:
+            int: count of requests written since the last flush
+        """
+        try:
+            return self.flush()
+        finally:
+            with self.__cond:
+                self.__closed = True
+                self.__cond.notify_all()
+            if self.__thread is not None:
+                self.__thread.join()
+                self.__thread = None
+
+    def getErrors(self):
+        """Return the write errors collected by the writer thread.
+
+        Returns:
+            list: [{"requests": count, "failedRequests": count, "message": text, "batchErrors": ObjectUpdater.getBatchErrors()}, ...]
+        """
+        with self.__cond:
+            return list(self.__errorL)
+
+    def getStats(self):
+        """Return the (JSON serializable) buffer statistics.
+
+        Counts include requestsBuffered, bytesBuffered, batchesWritten, requestsWritten, documentsWritten and failedRequests
+        and phase times (seconds) cover write (background writes), addWait (add() blocked) and flushWait.
+
+        Returns:
+            dict: ProcessingStats.getStats() dictionary
+        """
+        with self.__cond:
+            return self.__stats.getStats()
+
+    def __queueBuffer(self):
+        # Called with the condition held
+        if self.__bufferL:
+            self.__pendingQ.append(self.__bufferL)
+            self.__bufferL = []
+            self.__bufferBytes = 0
+            self.__bufferTime = None
+
+    def __startWriter(self):
+        # Called with the condition held (the writer is started on first use so it is owned by the current process)
+        if self.__thread is None or not self.__thread.is_alive():
+            self.__thread = threading.Thread(target=self.__run, name="BufferedObjectUpdater-%s-%s" % (self.__databaseName, self.__collectionName), daemon=True)
+            self.__thread.start()
+
+    def __run(self):
+        with self.__cond:
+            while True:
+                if not self.__pendingQ and self.__bufferL and time.time() - self.__bufferTime >= self.__maxSeconds:
+                    self.__queueBuffer()
+                if self.__pendingQ:
+                    updateDL = self.__pendingQ.popleft()
+                    self.__writing = True
+                    self.__cond.notify_all()
+                    self.__cond.release()
+                    try:
+                        self.__writeBatch(updateDL)
+                    finally:
+                        self.__cond.acquire()
+                        self.__writing = False
+                        self.__cond.notify_all()
+                    continue
+                if self.__closed:
+                    return
+                timeout = max(0.0, self.__maxSeconds - (time.time() - self.__bufferTime)) if self.__bufferL else None
+                self.__cond.wait(timeout)
+
+    def __writeBatch(self, updateDL):
+        """Write the input requests (in the writer thread) and record the outcome."""
+        numReq = len(updateDL)
+        numModified = numAttempted = 0
+        errD = None
+        try:
+            t0 = time.perf_counter()
+            numModified = self.__obUpd.update(self.__databaseName, self.__collectionName, updateDL, bulkBatchSize=self.__bulkBatchSize)
+            tWrite = time.perf_counter() - t0
+            cD = self.__obUpd.getStats()["counts"]
+            # Updates skipped as unchanged (ObjectUpdater skipUnchanged option) are not written (updates reduced to
+            # their volatile attributes are written and counted as update requests)
+            numRequested = cD.get("updateRequests", 0) + cD.get("updatesSkipped", 0)
+            numAttempted, self.__numRequested = numRequested - self.__numRequested, numRequested
+            batchErrL = self.__obUpd.getBatchErrors()
+            if batchErrL:
+                numFailed = sum([len(bD["errors"]) for bD in batchErrL])
+                errD = {"requests": numReq, "failedRequests": numFailed, "message": batchErrL[0]["errors"][0]["message"] if batchErrL[0]["errors"] else "", "batchErrors": batchErrL}
+            elif numAttempted < numReq:
+                errD = {"requests": numReq, "failedRequests": numReq - numAttempted, "message": "collection missing or connection failing", "batchErrors": []}
+        except Exception as e:
+            tWrite = time.perf_counter() - t0
+            logger.exception("Buffered update of %s %s failing with %s", self.__databaseName, self.__collectionName, str(e))
+            errD = {"requests": numReq, "failedRequests": numReq, "message": str(e), "batchErrors": []}
+        with self.__cond:
+            self.__stats.addTime("write", tWrite)
+            self.__stats.increment("batchesWritten")
+            self.__stats.increment("requestsWritten", numReq)
+            self.__stats.increment("documentsWritten", numModified)
+            self.__numFlushed += numReq
+            if errD:
+                self.__stats.increment("failedRequests", errD["failedRequests"])
+                self.__errorL.append(errD)
+        logger.debug("Buffered update of %s %s wrote %d requests (modified %d) in %.4f secs", self.__databaseName, self.__collectionName, numReq, numModified, tWrite)
+
+    def __getSize(self, updateD):
+        try:
+            return len(bson.encode(updateD))
+        except Exception:
+            return len(json.dumps(updateD, default=str))
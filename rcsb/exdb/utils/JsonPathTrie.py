@@ -0,0 +1,133 @@
+##
+# File: JsonPathTrie.py
+# Date: 17-Oct-2026  dwp
+#
+# Prefix tree of JSON path strings recorded while walking JSON documents.
+#
+# Updates:
+# 17-Oct-2026 dwp exclude the root node (empty path) from path counts and leaf paths
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+
+class JsonPathNode(object):
+    """Path trie node holding the path string, occurrence count and child nodes of a JSON element.
+
+    Child nodes are keyed by the JSON object key or by "" for list elements.
+    """
+
+    __slots__ = ("path", "count", "children")
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self.children = {}
+
+    def getChild(self, ky):
+        """Return (creating if required) the child node for the object key ky (or "" for a list element)."""
+        try:
+            return self.children[ky]
+        except KeyError:
+            sp = self.path
+            node = self.children[ky] = JsonPathNode(sp + "[]" if not ky else (sp + "." + ky if sp else ky))
+            return node
+
+
+class JsonPathTrie(object):
+    """Prefix tree of JSON path strings (e.g. rcsb_polymer_entity_align[].aligned_regions[].length).
+
+    Path strings are built once per distinct path and paths recorded with a non-zero count are
+    reported (the root node, an empty path string, is never reported).  Leaf and prefix queries are answered in time linear in the number of distinct paths.
+    """
+
+    def __init__(self):
+        self.__root = JsonPathNode("")
+
+    def getRoot(self):
+        return self.__root
+
+    def tokenize(self, pathString):
+        """Return the list of node keys ("" for list elements) for the input path string."""
+        return ["" if tok == "[]" else tok for tok in re.findall(r"\[\]|[^.\[\]]+", pathString)]
+
+    def getNode(self, path=None, create=True):
+        """Return the node for the input path (path string or list of keys with [] for list elements).
+
+        Returns:
+            JsonPathNode: node for the path or None if the path is not present and create=False
+        """
+        node = self.__root
+        if not path:
+            return node
+        kyL = self.tokenize(path) if isinstance(path, str) else [ky if ky else "" for ky in path]
+        for ky in kyL:
+            if create:
+                node = node.getChild(ky)
+            else:
+                node = node.children.get(ky)
+                if node is None:
+                    return None
+        return node
+
+    def add(self, pathString, count=1):
+        """Record an occurrence count for the input path string."""
+        self.getNode(pathString).count += count
+
+    def __iterNodes(self, prefix=None):
+        node = self.getNode(prefix, create=False)
+        stack = [node] if node else []
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children.values())
+
+    def getPathCounts(self, prefix=None):
+        """Return a dictionary of recorded path strings and counts for the paths at or under the input prefix.
+
+        Args:
+            prefix (str, optional): path string prefix (e.g. "rcsb_polymer_entity"). Defaults to None (all paths).
+
+        Returns:
+            dict: {pathString: count, ...}
+        """
+        return {node.path: node.count for node in self.__iterNodes(prefix) if node.count and node.path}
+
+    def getLeafPaths(self, prefix=None, filterFunc=None):
+        """Return the recorded path strings at or under the input prefix satisfying the optional filterFunc(pathString)
+        that are not the prefix of another such path.
+
+        Args:
+            prefix (str, optional): path string prefix. Defaults to None (all paths).
+            filterFunc (func, optional): candidate path selection function. Defaults to None.
+
+        Returns:
+            list: leaf path strings
+        """
+        rL = []
+        top = self.getNode(prefix, create=False)
+        if top is None:
+            return rL
+        # Post-order traversal tracking whether any candidate path lies below each node
+        belowD = {}
+        stack = [(top, False)]
+        while stack:
+            node, isDone = stack.pop()
+            if not isDone:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+                continue
+            hasBelow = any(belowD.pop(id(child)) for child in node.children.values())
+            isCandidate = bool(node.count) and bool(node.path) and (filterFunc is None or filterFunc(node.path))
+            if isCandidate and not hasBelow:
+                rL.append(node.path)
+            belowD[id(node)] = hasBelow or isCandidate
+        return rL
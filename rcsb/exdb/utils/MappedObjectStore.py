@@ -0,0 +1,132 @@
+##
+# File: MappedObjectStore.py
+# Date: 17-Oct-2026  dwp
+#
+# Read-only memory-mapped object store with lazily decoded records.
+#
+# Updates:
+# 17-Oct-2026 dwp add context manager support and close the mapped file when the store is garbage collected
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import mmap
+import os
+import pickle
+import struct
+import weakref
+from collections.abc import Mapping
+
+logger = logging.getLogger(__name__)
+
+
+class MappedObjectStore(Mapping):
+    """Read-only mapping of keys to objects backed by a memory-mapped file.
+
+    The file contains individually pickled records followed by an index of record offsets.
+    Only the index is decoded on open; records are decoded on access, so startup time and
+    resident memory are proportional to the records actually used.
+
+    The mapped file is closed by close() (or on leaving a with block or when the store is garbage collected).
+    Keys remain available after close() but records can no longer be read.
+
+    File layout:  MAGIC | record ... record | index | index offset (uint64) | MAGIC
+    """
+
+    MAGIC = b"RCSBMOS1"
+    __trailerFmt = "<Q"
+
+    def __init__(self, filePath):
+        self.__filePath = filePath
+        fh = open(filePath, "rb")  # pylint: disable=consider-using-with
+        try:
+            self.__mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            fh.close()
+            raise
+        self.__finalizer = weakref.finalize(self, MappedObjectStore.__cleanup, self.__mm, fh)
+        try:
+            magicLen = len(self.MAGIC)
+            trailerLen = struct.calcsize(self.__trailerFmt) + magicLen
+            if self.__mm[:magicLen] != self.MAGIC or self.__mm[-magicLen:] != self.MAGIC:
+                raise ValueError("Not a mapped object store file %s" % filePath)
+            (indexOffset,) = struct.unpack(self.__trailerFmt, self.__mm[-trailerLen:-magicLen])
+            tD = pickle.loads(self.__mm[indexOffset:-trailerLen])
+            self.__indexD = tD["index"]
+            self.__attributeD = tD["attributes"]
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+    def __getitem__(self, key):
+        offset, length = self.__indexD[key]
+        return pickle.loads(self.__mm[offset : offset + length])
+
+    def __contains__(self, key):
+        return key in self.__indexD
+
+    def __iter__(self):
+        return iter(self.__indexD)
+
+    def __len__(self):
+        return len(self.__indexD)
+
+    def getAttributes(self):
+        """Return the dictionary of attributes (e.g. version, creation time) stored with the records."""
+        return self.__attributeD
+
+    def getFilePath(self):
+        return self.__filePath
+
+    def close(self):
+        self.__finalizer()
+
+    @staticmethod
+    def __cleanup(mm, fh):
+        mm.close()
+        fh.close()
+
+    @staticmethod
+    def write(filePath, objectD, attributes=None):
+        """Write the input dictionary of objects as a mapped object store file.
+
+        Args:
+            filePath (str): output file path
+            objectD (dict): dictionary of objects (keys must be picklable and hashable)
+            attributes (dict, optional): additional attributes stored with the records. Defaults to None.
+
+        Returns:
+            bool: True for success or False otherwise
+        """
+        tmpPath = filePath + ".tmp"
+        try:
+            indexD = {}
+            with open(tmpPath, "wb") as ofh:
+                ofh.write(MappedObjectStore.MAGIC)
+                offset = len(MappedObjectStore.MAGIC)
+                for ky, obj in objectD.items():
+                    blob = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+                    ofh.write(blob)
+                    indexD[ky] = (offset, len(blob))
+                    offset += len(blob)
+                ofh.write(pickle.dumps({"index": indexD, "attributes": attributes if attributes else {}}, protocol=pickle.HIGHEST_PROTOCOL))
+                ofh.write(struct.pack(MappedObjectStore.__trailerFmt, offset))
+                ofh.write(MappedObjectStore.MAGIC)
+            os.replace(tmpPath, filePath)
+            return True
+        except Exception as e:
+            logger.exception("Failing for %s with %s", filePath, str(e))
+            if os.access(tmpPath, os.F_OK):
+                os.remove(tmpPath)
+        return False
@@ -0,0 +1,278 @@
+##
+# File: MongoClientRegistry.py
+# Date: 17-Oct-2026  dwp
+#
+# Process-wide, fork-aware registry of shared MongoDB clients.
+#
+# Updates:
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from urllib.parse import quote_plus, urlencode, urlparse
+
+from pymongo import monitoring
+
+from rcsb.db.mongo.Connection import Connection
+
+logger = logging.getLogger(__name__)
+
+
+class PoolEventCounter(monitoring.ConnectionPoolListener):
+    """Count connection pool events (connections created, checked out and closed) for the clients of this process."""
+
+    def __init__(self):
+        self.countD = defaultdict(int)
+
+    def pool_created(self, event):
+        self.countD["poolsCreated"] += 1
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.countD["poolsCleared"] += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.countD["connectionsCreated"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.countD["connectionsClosed"] += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self.countD["checkOutsFailed"] += 1
+
+    def connection_checked_out(self, event):
+        self.countD["checkOuts"] += 1
+
+    def connection_checked_in(self, event):
+        pass
+
+
+class SharedConnection(object):
+    """Connection context returning the shared registry client (drop-in for rcsb.db.mongo.Connection).
+
+    closeConnection() releases the reference to the shared client without closing it.
+    """
+
+    def __init__(self, cfgOb, resourceName="MONGO_DB"):
+        self.__cfgOb = cfgOb
+        self.__resourceName = resourceName
+        self.__client = None
+
+    def openConnection(self):
+        self.__client = MongoClientRegistry.getClient(self.__cfgOb, resourceName=self.__resourceName)
+        return self.__client is not None
+
+    def getClientConnection(self):
+        return self.__client
+
+    def closeConnection(self):
+        if self.__client is not None:
+            self.__client = None
+            return True
+        return False
+
+    def __enter__(self):
+        self.openConnection()
+        return self.getClientConnection()
+
+    def __exit__(self, *args):
+        self.closeConnection()
+        return False
+
+
+class MongoClientRegistry(object):
+    """Process-wide registry of MongoDB clients shared by the object extractors and updaters.
+
+    Clients are keyed by the resource name and the connection settings read from the configuration object, so
+    callers with equivalent configurations share one client (and its connection pool) within a process.  Each client
+    records the process in which it was created.  Clients inherited across a fork (e.g. MultiProcUtil workers) are
+    discarded without closing the parent sockets and are created again on first use in the child process.
+
+    Pool options (e.g. maxPoolSize, minPoolSize, maxIdleTimeMS, waitQueueTimeoutMS) are applied as connection
+    URI options to clients created after they are set.
+    """
+
+    __lock = threading.RLock()
+    __clientD = {}
+    __poolOptionD = {}
+    __countD = defaultdict(int)
+    __poolCounter = None
+
+    @classmethod
+    def getConnection(cls, cfgOb, resourceName="MONGO_DB"):
+        """Return a connection context for the shared client of the input configuration and resource.
+
+        Example:
+            with MongoClientRegistry.getConnection(cfgOb) as client:
+                mg = MongoDbUtil(client)
+        """
+        return SharedConnection(cfgOb, resourceName=resourceName)
+
+    @classmethod
+    def getClient(cls, cfgOb, resourceName="MONGO_DB"):
+        """Return the shared client (pymongo MongoClient) for the input configuration and resource.
+
+        Returns:
+            MongoClient: shared client or None if the connection fails
+        """
+        conn = Connection(cfgOb=cfgOb, resourceName=resourceName)
+        infoD = conn.getPreferences()
+        pid = os.getpid()
+        with cls.__lock:
+            poolOptionD = dict(cls.__poolOptionD)
+            key = cls.__getKey(resourceName, infoD, poolOptionD)
+            client = cls.__getShared(key, pid)
+            if client is not None:
+                return client
+            cls.__registerPoolCounter()
+        #
+        # The connection is opened without holding the lock so other threads are not blocked by a slow server
+        if poolOptionD:
+            infoD["DB_URI"] = cls.__getPoolUri(infoD, poolOptionD)
+            conn.setPreferences(infoD)
+        if not conn.openConnection():
+            with cls.__lock:
+                cls.__countD["connectFailures"] += 1
+            return None
+        with cls.__lock:
+            client = cls.__getShared(key, pid)
+            if client is not None:
+                # Another thread created the shared client in the meantime
+                conn.closeConnection()
+                return client
+            cls.__clientD[key] = {"client": conn.getClientConnection(), "connection": conn, "pid": pid, "resourceName": resourceName, "uses": 1}
+            cls.__countD["clientsCreated"] += 1
+            logger.debug("Created shared client for resource %s (pid %d) pool options %r", resourceName, pid, poolOptionD)
+            return cls.__clientD[key]["client"]
+
+    @classmethod
+    def setPoolOptions(cls, maxPoolSize=None, minPoolSize=None, maxIdleTimeMS=None, waitQueueTimeoutMS=None):
+        """Set the connection pool options of clients created after this call (None values are not applied)."""
+        optD = {"maxPoolSize": maxPoolSize, "minPoolSize": minPoolSize, "maxIdleTimeMS": maxIdleTimeMS, "waitQueueTimeoutMS": waitQueueTimeoutMS}
+        with cls.__lock:
+            cls.__poolOptionD = {ky: int(val) for ky, val in optD.items() if val is not None}
+
+    @classmethod
+    def getPoolOptions(cls):
+        with cls.__lock:
+            return dict(cls.__poolOptionD)
+
+    @classmethod
+    def getStats(cls):
+        """Return the client reuse and connection pool counters of the current process.
+
+        Returns:
+            dict: {"pid": process id, "openClients": count, "poolOptions": {...},
+                   "counts": {"clientsCreated": count, "clientsReused": count, "clientsDiscardedAfterFork": count, "connectFailures": count},
+                   "poolEvents": {"poolsCreated": count, "connectionsCreated": count, "checkOuts": count, "connectionsClosed": count, ...}}
+        """
+        with cls.__lock:
+            pid = os.getpid()
+            return {
+                "pid": pid,
+                "openClients": len([tD for tD in cls.__clientD.values() if tD["pid"] == pid]),
+                "poolOptions": dict(cls.__poolOptionD),
+                "counts": dict(cls.__countD),
+                "poolEvents": dict(cls.__poolCounter.countD) if cls.__poolCounter else {},
+            }
+
+    @classmethod
+    def closeAll(cls):
+        """Close the shared clients created in the current process.
+
+        Returns:
+            int: number of clients closed
+        """
+        numClosed = 0
+        with cls.__lock:
+            pid = os.getpid()
+            for tD in cls.__clientD.values():
+                if tD["pid"] == pid:
+                    try:
+                        tD["connection"].closeConnection()
+                        numClosed += 1
+                    except Exception as e:
+                        logger.exception("Closing client for resource %s failing with %s", tD["resourceName"], str(e))
+            cls.__clientD.clear()
+        return numClosed
+
+    @classmethod
+    def __getShared(cls, key, pid):
+        """Return the registered client for the input key created in the current process (pid) or None (called with the lock held)."""
+        tD = cls.__clientD.get(key)
+        if tD is None:
+            return None
+        if tD["pid"] != pid:
+            # Inherited from a parent process - pymongo clients are not fork safe
+            del cls.__clientD[key]
+            cls.__countD["clientsDiscardedAfterFork"] += 1
+            return None
+        tD["uses"] += 1
+        cls.__countD["clientsReused"] += 1
+        return tD["client"]
+
+    @classmethod
+    def __getKey(cls, resourceName, infoD, poolOptionD):
+        kS = json.dumps([resourceName, infoD, poolOptionD], sort_keys=True, default=str)
+        return hashlib.sha256(kS.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def __getPoolUri(cls, infoD, poolOptionD):
+        """Return the connection URI of the input settings (built as in rcsb.db.mongo.ConnectionBase) with the pool options."""
+        uri = infoD.get("DB_URI")
+        if not uri:
+            host = infoD.get("DB_HOST") or "localhost"
+            port = infoD.get("DB_PORT")
+            user = infoD.get("DB_USER")
+            pw = infoD.get("DB_PW")
+            adminDb = infoD.get("DB_ADMIN_DB_NAME") or "admin"
+            if user and pw and port:
+                uri = "mongodb://%s:%s@%s:%d/%s" % (quote_plus(user), quote_plus(pw), host, int(port), adminDb)
+            elif user and pw:
+                uri = "mongodb://%s:%s@%s/%s" % (quote_plus(user), quote_plus(pw), host, adminDb)
+            else:
+                uri = "mongodb://%s:%d" % (host, int(port) if port else 27017)
+        sep = "&" if "?" in uri else "?" if urlparse(uri).path else "/?"
+        return uri + sep + urlencode(poolOptionD)
+
+    @classmethod
+    def __registerPoolCounter(cls):
+        if cls.__poolCounter is None:
+            cls.__poolCounter = PoolEventCounter()
+            monitoring.register(cls.__poolCounter)
+
+    @classmethod
+    def _resetAfterFork(cls):
+        # Drop (without closing) the clients and counters inherited from the parent process
+        cls.__lock = threading.RLock()
+        numInherited = len(cls.__clientD)
+        cls.__clientD = {}
+        cls.__countD = defaultdict(int)
+        if numInherited:
+            cls.__countD["clientsDiscardedAfterFork"] = numInherited
+        if cls.__poolCounter is not None:
+            cls.__poolCounter.countD.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=MongoClientRegistry._resetAfterFork)  # pylint: disable=protected-access
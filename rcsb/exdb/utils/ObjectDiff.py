@@ -0,0 +1,153 @@
+##
+# File: ObjectDiff.py
+# Date: 17-Oct-2026  dwp
+#
+# Field level ($set/$unset) update patches between document object versions.
+#
+# Updates:
+# 17-Oct-2026 dwp add getSnapshot() and writePatch() shared by ObjectTransformer and ObjectValidator
+# 17-Oct-2026 dwp remove the stored content hash (ObjectUpdater skipUnchanged option) from documents changed by writePatch()
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+
+import bson
+
+from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectDiff(object):
+    """Build minimal MongoDB update documents ($set and $unset operators) transforming one version of a
+    document object into another.
+
+    Nested dictionaries present in both versions are compared attribute by attribute and changes are reported
+    with dot notation paths.  Lists and values of different types are replaced as a whole.  Subtrees with keys
+    that cannot be addressed in dot notation (empty, containing '.' or starting with '$') are replaced as a whole.
+    Values are compared by type and value, so an integer replaced by an equal float is reported as changed.
+    """
+
+    def __init__(self, maxPaths=None):
+        """Patch builder.
+
+        Args:
+            maxPaths (int, optional): maximum number of changed paths in a patch (None for no limit). Defaults to None.
+        """
+        self.__maxPaths = maxPaths
+
+    def getPatch(self, oldObj, newObj):
+        """Return the update document transforming oldObj into newObj.
+
+        Args:
+            oldObj (dict): stored document object
+            newObj (dict): updated document object
+
+        Returns:
+            dict: {"$set": {path: value, ...}, "$unset": {path: "", ...}} (operators without changes are omitted),
+                  {} if the objects are identical or None if the patch exceeds maxPaths or the objects have top-level
+                  keys that cannot be addressed in dot notation (replace the document instead)
+        """
+        if not (self.__isAddressable(oldObj) and self.__isAddressable(newObj)):
+            return None
+        setD = {}
+        unsetD = {}
+        self.__diff(oldObj, newObj, "", setD, unsetD)
+        if self.__maxPaths is not None and len(setD) + len(unsetD) > self.__maxPaths:
+            return None
+        patchD = {}
+        if setD:
+            patchD["$set"] = setD
+        if unsetD:
+            patchD["$unset"] = unsetD
+        return patchD
+
+    def getSnapshot(self, obj):
+        """Return an independent copy of the input document object (BSON types are preserved).
+
+        Object adapters may modify fetched objects in place so the stored version is kept as a snapshot for getPatch().
+        """
+        return bson.decode(bson.encode(obj))
+
+    def writePatch(self, client, databaseName, collectionName, oldObj, newObj, selectD, stats=None, hashAttribute="rcsb_content_hash"):
+        """Write the changed attributes of newObj relative to the stored object (oldObj) as a field level patch
+        or replace the stored document (if oldObj is None, the patch is too large or matches no document).
+
+        The content hash stored by ObjectUpdater(skipUnchanged=True) is not recomputed and is removed from changed documents.
+
+        Args:
+            client (obj): MongoDB client object
+            databaseName (str): target database name
+            collectionName (str): target collection name
+            oldObj (dict): stored document object (or None to replace the document)
+            newObj (dict): updated document object
+            selectD (dict): selection of the stored document
+            stats (obj, optional): ProcessingStats object counting roundTrips, documentsWritten, documentsPatched,
+                                   patchPaths and documentsUnchanged. Defaults to None.
+            hashAttribute (str, optional): stored content hash attribute (None to retain it). Defaults to "rcsb_content_hash".
+
+        Returns:
+            True if the object is unchanged or patched, the replacement status (see MongoDbUtil.replace()) otherwise or None on failure
+        """
+        patchD = self.getPatch(oldObj, newObj) if oldObj is not None else None
+        if patchD is not None and not patchD:
+            self.__increment(stats, "documentsUnchanged")
+            return True
+        if patchD:
+            numPaths = len(patchD.get("$set", {})) + len(patchD.get("$unset", {}))
+            if hashAttribute and hashAttribute in oldObj and hashAttribute not in patchD.get("$set", {}) and hashAttribute not in patchD.get("$unset", {}):
+                patchD.setdefault("$unset", {})[hashAttribute] = ""
+            try:
+                rV = client[databaseName].get_collection(collectionName).update_one(selectD, patchD)
+                self.__increment(stats, "roundTrips")
+                if rV.matched_count:
+                    self.__increment(stats, "documentsWritten")
+                    self.__increment(stats, "documentsPatched")
+                    self.__increment(stats, "patchPaths", numPaths)
+                    return True
+            except Exception as e:
+                logger.warning("%s %s patch failing (replacing document) with %s", databaseName, collectionName, str(e))
+        if hashAttribute and hashAttribute in newObj:
+            newObj = {ky: val for ky, val in newObj.items() if ky != hashAttribute}
+        rOk = MongoDbUtil(client).replace(databaseName, collectionName, newObj, selectD)
+        self.__increment(stats, "roundTrips")
+        if rOk is not None:
+            self.__increment(stats, "documentsWritten")
+        return rOk
+
+    def isEqual(self, val1, val2):
+        """Return True if the input values are equal with matching types (recursively)."""
+        if type(val1) is not type(val2):
+            return False
+        if isinstance(val1, dict):
+            return len(val1) == len(val2) and all(ky in val2 and self.isEqual(val, val2[ky]) for ky, val in val1.items())
+        if isinstance(val1, (list, tuple)):
+            return len(val1) == len(val2) and all(self.isEqual(v1, v2) for v1, v2 in zip(val1, val2))
+        return val1 == val2
+
+    def __diff(self, oldD, newD, prefix, setD, unsetD):
+        for ky in oldD:
+            if ky not in newD:
+                unsetD[prefix + ky] = ""
+        for ky, newVal in newD.items():
+            pth = prefix + ky
+            if ky not in oldD:
+                setD[pth] = newVal
+                continue
+            oldVal = oldD[ky]
+            if isinstance(oldVal, dict) and isinstance(newVal, dict) and self.__isAddressable(oldVal) and self.__isAddressable(newVal):
+                self.__diff(oldVal, newVal, pth + ".", setD, unsetD)
+            elif not self.isEqual(oldVal, newVal):
+                setD[pth] = newVal
+
+    def __increment(self, stats, name, value=1):
+        if stats is not None:
+            stats.increment(name, value)
+
+    def __isAddressable(self, dD):
+        return all(isinstance(ky, str) and ky and "." not in ky and not ky.startswith("$") for ky in dD)
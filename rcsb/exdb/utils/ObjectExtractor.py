@@ -6,6 +6,28 @@
 #
 # Updates:
 # 27-Jun-2019  jdw add JSON path tracking utilities.
+# 17-Oct-2026  dwp add iterObjects() to stream (key, object) pairs from a server-side cursor
+# 17-Oct-2026  dwp replace per-document fetchOne() calls in __selectObjects() with a single batched cursor
+# 17-Oct-2026  dwp add numProc/numPartitions options for parallel extraction over _id key ranges
+# 17-Oct-2026  dwp add incremental (watermarkAttribute) cache updates merging only changed and deleted objects
+# 17-Oct-2026  dwp add memory-mapped lazily decoded cache format (cacheKwargs={"fmt": "mmap"})
+# 17-Oct-2026  dwp add cache validation (validateCache) using a stored selection and collection fingerprint
+# 17-Oct-2026  dwp replace the recursive JSON path walker with an iterative walker and compiled path prefixes
+# 17-Oct-2026  dwp record paths in a JsonPathTrie for linear time leaf path filtering and prefix queries
+# 17-Oct-2026  dwp add getColumns() for columnar (NumPy) extraction of scalar attribute paths
+# 17-Oct-2026  dwp add internStrings option sharing repeated keys and low cardinality string values
+# 17-Oct-2026  dwp add aggregate(), getDistinctValues() and getGroupedValues() for server-side reductions
+# 17-Oct-2026  dwp add useQueryCache option sharing selection results through the process-wide QueryResultCache
+# 17-Oct-2026  dwp add maxMemoryMB option spilling extracted objects to sorted on-disk segments
+# 17-Oct-2026  dwp add key sharded cache format (cacheKwargs={"fmt": "shard"}) with selective loading (cacheKeyList)
+# 17-Oct-2026  dwp add getStats() reporting document and round trip counts and query, decode, key, cache and callback timings
+# 17-Oct-2026  dwp add explainQueries diagnostic option recording selection query plans in the QueryPlanAdvisor
+# 17-Oct-2026  dwp add rawBson option returning lazily decoded RawBSONDocument objects and materializeObject()
+# 17-Oct-2026  dwp add asyncio variants of the extraction entry points (createAsync(), iterObjectsAsync(), ...)
+# 17-Oct-2026  dwp add sortByKey option returning objects in server-side sorted unique attribute order
+# 17-Oct-2026  dwp add discoverPaths() estimating path frequencies from a random or stratified document sample
+# 17-Oct-2026  dwp reuse process-wide shared clients from MongoClientRegistry (useClientRegistry option)
+# 17-Oct-2026  dwp add close() and context manager support releasing memory-mapped and spilled object stores
 #
 ##
 __docformat__ = "google en"
@@ -13,13 +35,36 @@ __author__ = "John Westbrook"
 __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
-import copy
+import asyncio
+import functools
+import hashlib
+import itertools
+import json
 import logging
+import math
 import os
+import time
+from collections.abc import Mapping
+
+import bson
+import numpy as np
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
 
 from rcsb.db.mongo.Connection import Connection
 from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
+from rcsb.exdb.utils.JsonPathTrie import JsonPathTrie
+from rcsb.exdb.utils.MappedObjectStore import MappedObjectStore
+from rcsb.exdb.utils.MongoClientRegistry import MongoClientRegistry
+from rcsb.exdb.utils.ObjectInterner import ObjectInterner
+from rcsb.exdb.utils.ProcessingStats import ProcessingStats
+from rcsb.exdb.utils.QueryPlanAdvisor import QueryPlanAdvisor
+from rcsb.exdb.utils.QueryResultCache import QueryResultCache
+from rcsb.exdb.utils.ShardedObjectCache import ShardedObjectCache
+from rcsb.exdb.utils.SpilledObjectStore import SpilledObjectStore
+from rcsb.utils.io.IoUtil import getObjSize
 from rcsb.utils.io.MarshalUtil import MarshalUtil
+from rcsb.utils.multiproc.MultiProcUtil import MultiProcUtil
 
 
 logger = logging.getLogger(__name__)
@@ -32,160 +77,949 @@ class ObjectExtractor(object):
         self.__cfgOb = cfgOb
         self.__resourceName = "MONGO_DB"
         self.__mU = MarshalUtil()
+        self.__kwargs = kwargs
+        # internStrings=True shares repeated keys and string values of attributes with at most internCardinalityLimit distinct values
+        self.__interner = ObjectInterner(cardinalityLimit=kwargs.get("internCardinalityLimit", 1000)) if kwargs.get("internStrings", False) else None
+        self.__stats = ProcessingStats(databaseName=kwargs.get("databaseName", "pdbx_core"), collectionName=kwargs.get("collectionName", "pdbx_core_entry"))
+        # explainQueries=True records the plan (COLLSCAN/IXSCAN, documents examined and returned) of each selection query
+        # in the process-wide QueryPlanAdvisor (see QueryPlanAdvisor.getRecommendedIndexes())
+        self.__explainQueries = kwargs.get("explainQueries", False)
+        # useClientRegistry=False opens (and closes) a new client connection for each query
+        self.__useClientRegistry = kwargs.get("useClientRegistry", True)
+        # rawBson=True returns read-only RawBSONDocument objects decoded lazily on access (see materializeObject())
+        if kwargs.get("rawBson", False) and self.__interner:
+            logger.warning("String interning is not applied to raw BSON objects")
         #
-        self.__objectD = self.__rebuildCache(**kwargs)
+        self.__objectD = {} if kwargs.get("streamObjects", False) else self.__rebuildCache(**kwargs)
+        if self.__interner and self.__objectD:
+            iD = self.__interner.getStats()
+            logger.info("Object size %.2f MB (interning saved %.2f MB) %r", getObjSize(self.__objectD) / 1000000.0, iD["bytesSaved"] / 1000000.0, iD)
         self.__objPathD = {}
         self.__stringPathList = []
         self.__objValD = {}
+        self.__pathTrie = JsonPathTrie()
+        self.__prefixS = None
         #
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
     def getObjects(self):
         return self.__objectD
 
-    def getPathList(self, filterList=True):
+    def close(self):
+        """Release the extracted objects closing memory-mapped (cacheKwargs={"fmt": "mmap"}) and spilled (maxMemoryMB)
+        object stores.  Objects read from these stores are not available after close().
+        """
+        if isinstance(self.__objectD, (MappedObjectStore, SpilledObjectStore)):
+            self.__objectD.close()
+        self.__objectD = {}
+
+    def iterObjects(self, **kwargs):
+        """Stream (key, object) pairs for the current selection from a server-side cursor.
+
+        Objects are not retained by the extractor, so memory use is independent of the size
+        of the selection. Construct the extractor with streamObjects=True to skip the in-memory
+        extraction.  Keyword arguments override the selection options provided to the constructor.
+
+        Args:
+            batchSize (int, optional): number of documents returned in each cursor batch. Defaults to 1000.
+            rawBson (bool, optional): return read-only RawBSONDocument objects decoded lazily on access
+                (the object id is returned as an ObjectId unless stripObjectId is set). Defaults to False.
+            sortByKey (bool, optional): return objects sorted on the server by the uniqueAttributes values. Defaults to False.
+
+        Yields:
+            tuple: (key, object) for each selected document
+        """
+        kwD = dict(self.__kwargs)
+        kwD.update(kwargs)
+        yield from self.__iterSelect(**kwD)
+
+    def getColumns(self, pathList, **kwargs):
+        """Stream the values of scalar attributes (dot notation) for the current selection into columns.
+
+        Only the unique attributes and the input paths are fetched and no per-object dictionaries are
+        retained.  Construct the extractor with streamObjects=True to skip the in-memory extraction.
+        Keyword arguments override the selection options provided to the constructor.
+
+        Args:
+            pathList (list): scalar attribute paths in dot notation (e.g. rcsb_entry_info.polymer_entity_count)
+
+        Returns:
+            dict: {"keys": array of object keys,
+                   "columns": {path: array (integer, float or boolean values) or list (other values), ...},
+                   "masks": {path: boolean array (True for missing values), ...}}
+
+        Example:
+            cD = obEx.getColumns(["rcsb_entry_info.polymer_entity_count"])
+            idL = cD["keys"][cD["columns"]["rcsb_entry_info.polymer_entity_count"] == 1].tolist()
+        """
+        kwD = dict(self.__kwargs)
+        kwD.update(kwargs)
+        uniqueAttributes = kwD.get("uniqueAttributes", ["rcsb_id"])
+        kwD["selectionList"] = list(dict.fromkeys(uniqueAttributes + list(pathList)))
+        kwD["stripObjectId"] = True
         kL = []
+        vLL = [[] for _ in pathList]
+        for stKey, rObj in self.__iterSelect(**kwD):
+            kL.append(stKey)
+            for pth, vL in zip(pathList, vLL):
+                vL.append(self.__getScalarValue(rObj, pth))
+        #
+        rD = {"keys": np.array(kL, dtype=str), "columns": {}, "masks": {}}
+        for pth, vL in zip(pathList, vLL):
+            rD["columns"][pth], rD["masks"][pth] = self.__toColumn(vL)
+        logger.info("Extracted %d columns for %d objects", len(pathList), len(kL))
+        return rD
+
+    def aggregate(self, pipeline, **kwargs):
+        """Stream the results of an aggregation pipeline evaluated on the server for the current selection.
+
+        The selectionQuery is applied as the leading $match stage.  Keyword arguments override the
+        selection options provided to the constructor.
+
+        Args:
+            pipeline (list): aggregation pipeline stages following the selection
+            allowDiskUse (bool, optional): allow pipeline stages to use temporary files on the server. Defaults to True.
+            batchSize (int, optional): number of results returned in each cursor batch. Defaults to 1000.
+
+        Yields:
+            dict: aggregation result documents
+        """
+        kwD = dict(self.__kwargs)
+        kwD.update(kwargs)
+        databaseName = kwD.get("databaseName", "pdbx_core")
+        collectionName = kwD.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = kwD.get("selectionQuery", {})
+        pL = ([{"$match": selectionQueryD}] if selectionQueryD else []) + list(pipeline)
+        #
+        conn = self.__getConnection()
+        try:
+            if not conn.openConnection():
+                return
+            client = conn.getClientConnection()
+            mg = MongoDbUtil(client)
+            if not mg.collectionExists(databaseName, collectionName):
+                return
+            logger.debug("%s %s aggregation pipeline %r", databaseName, collectionName, pL)
+            if self.__explainQueries and selectionQueryD:
+                # The leading $match stage is planned as the equivalent find() query
+                QueryPlanAdvisor.explain(client[databaseName].get_collection(collectionName), databaseName, collectionName, selectionQueryD)
+            with self.__stats.timePhase("query"):
+                cursor = client[databaseName].get_collection(collectionName).aggregate(pL, allowDiskUse=kwD.get("allowDiskUse", True), batchSize=kwD.get("batchSize", 1000))
+            numResults = 0
+            try:
+                for rObj in cursor:
+                    numResults += 1
+                    yield rObj
+            finally:
+                cursor.close()
+                self.__stats.increment("aggregateResults", numResults)
+                self.__stats.increment("roundTrips", 1 + max(1, math.ceil(numResults / kwD.get("batchSize", 1000))))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        finally:
+            conn.closeConnection()
+
+    @classmethod
+    async def createAsync(cls, cfgOb, **kwargs):
+        """Construct an extractor (performing the extraction unless streamObjects=True) in a worker thread.
+
+        The extraction entry points are offloaded to the default executor of the running event loop, so the
+        server latency of several extractions overlaps when they are awaited together (e.g. asyncio.gather()).
+
+        Example:
+            obEx1, obEx2 = await asyncio.gather(ObjectExtractor.createAsync(cfgOb, **kw1), ObjectExtractor.createAsync(cfgOb, **kw2))
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(cls, cfgOb, **kwargs))
+
+    async def iterObjectsAsync(self, **kwargs):
+        """Asynchronous generator of (key, object) pairs (see iterObjects()) read in batches of batchSize objects in a worker thread."""
+        batchSize = kwargs.get("batchSize", self.__kwargs.get("batchSize", 1000))
+        loop = asyncio.get_running_loop()
+        objIt = self.iterObjects(**kwargs)
+        try:
+            while True:
+                tL = await loop.run_in_executor(None, list, itertools.islice(objIt, batchSize))
+                if not tL:
+                    break
+                for tup in tL:
+                    yield tup
+        finally:
+            try:
+                objIt.close()
+            except ValueError:
+                # Cancelled while a worker thread is still reading a batch - the cursor is closed when the generator is released
+                pass
+
+    async def getColumnsAsync(self, pathList, **kwargs):
+        """Asynchronous variant of getColumns()."""
+        return await self.__runAsync(self.getColumns, pathList, **kwargs)
+
+    async def aggregateAsync(self, pipeline, **kwargs):
+        """Asynchronous variant of aggregate() returning the list of aggregation result documents."""
+        return await self.__runAsync(lambda: list(self.aggregate(pipeline, **kwargs)))
+
+    async def getDistinctValuesAsync(self, attributePath, elementQuery=None, **kwargs):
+        """Asynchronous variant of getDistinctValues()."""
+        return await self.__runAsync(self.getDistinctValues, attributePath, elementQuery=elementQuery, **kwargs)
+
+    async def getGroupedValuesAsync(self, keyPath, valuePath, elementQuery=None, **kwargs):
+        """Asynchronous variant of getGroupedValues()."""
+        return await self.__runAsync(self.getGroupedValues, keyPath, valuePath, elementQuery=elementQuery, **kwargs)
+
+    async def __runAsync(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    def getDistinctValues(self, attributePath, elementQuery=None, **kwargs):
+        """Return the unique values of the input attribute (dot notation) for the current selection computed on the server.
+
+        Lists along the attribute path are unwound, so values are collected from all nested list elements.
+
+        Args:
+            attributePath (str): attribute path in dot notation (e.g. rcsb_entity_source_organism.ncbi_taxonomy_id)
+            elementQuery (dict, optional): condition applied to the unwound list elements (e.g. {"rcsb_polymer_entity_annotation.type": "GO"}).
+                                           Defaults to None.
+
+        Returns:
+            list: unique attribute values
+        """
+        pipeline = self.__getUnwindStages([attributePath], elementQuery) + [{"$group": {"_id": "$" + attributePath}}]
+        rL = [rD["_id"] for rD in self.aggregate(pipeline, **kwargs)]
+        logger.info("Unique values of %s (%d)", attributePath, len(rL))
+        return rL
+
+    def getGroupedValues(self, keyPath, valuePath, elementQuery=None, **kwargs):
+        """Return the values of valuePath grouped by the values of keyPath (dot notation) for the current selection computed on the server.
+
+        Lists along both attribute paths are unwound, so pairs are collected from all nested list elements.
+
+        Args:
+            keyPath (str): grouping attribute path in dot notation (e.g. rcsb_chem_comp_related.resource_accession_code)
+            valuePath (str): grouped attribute path in dot notation (e.g. rcsb_chem_comp_related.comp_id)
+            elementQuery (dict, optional): condition applied to the unwound list elements. Defaults to None.
+
+        Returns:
+            dict: {keyValue: [value, ...], ...}
+        """
+        pipeline = self.__getUnwindStages([keyPath, valuePath], elementQuery) + [{"$group": {"_id": "$" + keyPath, "values": {"$push": "$" + valuePath}}}]
+        rD = {tD["_id"]: tD["values"] for tD in self.aggregate(pipeline, **kwargs)}
+        logger.info("Grouped values of %s by %s (%d)", valuePath, keyPath, len(rD))
+        return rD
+
+    def __getUnwindStages(self, attributePathList, elementQuery=None):
+        """Return the pipeline stages projecting the input attributes and unwinding each level of their paths.
+
+        Unwinding a scalar value is a no-op and documents lacking an attribute are dropped.
+        """
+        prefixL = []
+        for attributePath in attributePathList:
+            kyL = attributePath.split(".")
+            for ii in range(1, len(kyL) + 1):
+                prefix = ".".join(kyL[:ii])
+                if prefix not in prefixL:
+                    prefixL.append(prefix)
+        # Only the attributes and the (top-level) element query attributes are carried through the pipeline
+        qL = list(elementQuery.keys()) if elementQuery else []
+        # Paths within another projected path are dropped (overlapping projections fail with a path collision error)
+        projL = list(dict.fromkeys(attributePathList + qL))
+        projL = [pth for pth in projL if not any(pth.startswith(tPth + ".") for tPth in projL)]
+        pL = [] if any(ky.startswith("$") for ky in qL) else [{"$project": {**{ky: 1 for ky in projL}, "_id": 0}}]
+        pL.extend({"$unwind": "$" + prefix} for prefix in sorted(prefixL, key=lambda x: x.count(".")))
+        if elementQuery:
+            pL.append({"$match": elementQuery})
+        return pL
+
+    def __getScalarValue(self, dct, keyName):
+        """Return the scalar value of the dot notation key in the input dictionary or None if missing or not scalar."""
+        for key in keyName.split("."):
+            try:
+                dct = dct[key]
+            except (KeyError, TypeError, IndexError):
+                return None
+        return None if isinstance(dct, (Mapping, list)) else dct
+
+    def __toColumn(self, vL):
+        """Return the (column, mask) for the input value list (missing values as None).
+
+        Integer and boolean columns use 0/False and float columns NaN for missing values.  Columns with
+        other (e.g. string) values are returned as lists with missing values as None.
+        """
+        mask = np.fromiter((v is None for v in vL), dtype=bool, count=len(vL))
+        tS = {type(v) for v in vL if v is not None}
+        if tS and tS <= {bool}:
+            return np.array([bool(v) for v in vL], dtype=bool), mask
+        if tS and tS <= {int}:
+            return np.array([v if v is not None else 0 for v in vL], dtype=np.int64), mask
+        if tS and tS <= {int, float}:
+            return np.array([v if v is not None else np.nan for v in vL], dtype=np.float64), mask
+        return vL, mask
+
+    def getPathList(self, filterList=True, prefix=None):
+        """Return the sorted list of recorded path strings.
+
+        Args:
+            filterList (bool, optional): return only the leaf paths (nested or "_" prefixed paths which are
+                                         not the prefix of another such path). Defaults to True.
+            prefix (str, optional): return only paths at or under this path (e.g. "rcsb_polymer_entity"). Defaults to None.
+
+        Returns:
+            list: path strings
+        """
         if filterList:
-            tL = []
-            for ky in self.__objPathD:
-                if ky and (ky.find(".") != -1 or ky.startswith("_")) and ky not in ["_id"] and not ky.endswith("[]"):
-                    tL.append(ky)
-            for ky in tL:
-                for tky in tL:
-                    ok = True
-                    if ky in tky and ky != tky:
-                        ok = False
-                        break
-                if ok:
-                    kL.append(ky)
+            kL = self.__pathTrie.getLeafPaths(prefix=prefix, filterFunc=lambda ky: (ky.find(".") != -1 or ky.startswith("_")) and ky not in ["_id"] and not ky.endswith("[]"))
+        elif prefix:
+            kL = list(self.__pathTrie.getPathCounts(prefix=prefix).keys())
         else:
             kL = list(self.__objPathD.keys())
         #
         return sorted(kL)
 
+    def discoverPaths(self, sampleSize=1000, stratifyAttribute=None, confidenceZ=1.96, rareFrequency=0.01, countRarePaths=False, maxRarePaths=100, **kwargs):
+        """Estimate the fraction of documents in the current selection containing each JSON path from a document sample.
+
+        Documents are drawn with the $sample aggregation stage, either from the whole selection or (with stratifyAttribute)
+        from each distinct value of the attribute in proportion to its document count (at least one document per value).
+        Sampled documents are recorded as in genPathList(), so getPathList() and getPathCounts() cover the sampled paths.
+        Frequencies of stratified samples are weighted by the stratum sizes.  Confidence intervals are Wilson score
+        intervals for the number of sampled documents and paths absent from the sample have an estimated frequency
+        below unseenUpperBound (3 / sample size at 95% confidence).  With countRarePaths=True the exact frequency of up
+        to maxRarePaths paths with estimated frequency below rareFrequency is counted on the server in a second pass.
+
+        Args:
+            sampleSize (int, optional): number of sampled documents. Defaults to 1000.
+            stratifyAttribute (str, optional): attribute (dot notation) defining the sample strata. Defaults to None.
+            confidenceZ (float, optional): standard normal quantile of the confidence level. Defaults to 1.96 (95%).
+            rareFrequency (float, optional): estimated frequency below which paths are rare. Defaults to 0.01.
+            countRarePaths (bool, optional): count the exact frequency of rare paths. Defaults to False.
+            maxRarePaths (int, optional): maximum number of counted rare paths. Defaults to 100.
+
+        Returns:
+            dict: {"populationSize": count, "sampleSize": count, "unseenUpperBound": frequency,
+                   "paths": {pathString: {"documents": count, "frequency": estimate, "lower": bound, "upper": bound, "exact": bool}, ...}}
+        """
+        kwD = dict(self.__kwargs)
+        kwD.update(kwargs)
+        kwD.pop("sortByKey", None)
+        rD = {"populationSize": 0, "sampleSize": 0, "unseenUpperBound": 1.0, "paths": {}}
+        try:
+            if stratifyAttribute:
+                strataL = [(tD["_id"], tD["count"]) for tD in self.aggregate([{"$group": {"_id": "$" + stratifyAttribute, "count": {"$sum": 1}}}], **kwD)]
+            else:
+                strataL = [(None, sum(tD["count"] for tD in self.aggregate([{"$count": "count"}], **kwD)))]
+            numPop = sum(num for _, num in strataL)
+            if not numPop:
+                return rD
+            #
+            weightD = {}
+            numSample = 0
+            for val, num in strataL:
+                numDoc = min(num, max(1, round(sampleSize * num / numPop)))
+                pL = [{"$match": {stratifyAttribute: val}}] if stratifyAttribute else []
+                numDrawn = 0
+                pathS = set()
+                tD = {}
+                for dObj in self.aggregate(pL + [{"$sample": {"size": numDoc}}, {"$project": {"_id": 0}}], **kwD):
+                    pathS.clear()
+                    self.__walkPaths(dObj, pathS=pathS)
+                    for sp in pathS:
+                        tD[sp] = tD[sp] + 1 if sp in tD else 1
+                    numDrawn += 1
+                # Each sampled document represents num / numDrawn documents of its stratum
+                for sp, cnt in tD.items():
+                    docW = weightD.setdefault(sp, [0, 0.0])
+                    docW[0] += cnt
+                    docW[1] += cnt * num / numDrawn
+                numSample += numDrawn
+            #
+            rD.update({"populationSize": numPop, "sampleSize": numSample, "unseenUpperBound": min(1.0, 3.0 / numSample)})
+            for sp, (cnt, wCnt) in weightD.items():
+                if not sp:
+                    continue
+                freq = wCnt / numPop
+                lower, upper = self.__getWilsonInterval(freq, numSample, confidenceZ)
+                rD["paths"][sp] = {"documents": cnt, "frequency": freq, "lower": lower, "upper": upper, "exact": False}
+            #
+            if countRarePaths:
+                rareL = sorted((pD["frequency"], sp) for sp, pD in rD["paths"].items() if pD["frequency"] < rareFrequency and not sp.endswith("[]") and sp != "_id")
+                for _, sp in rareL[:maxRarePaths]:
+                    attributePath = sp.replace("[]", "")
+                    num = sum(tD["count"] for tD in self.aggregate([{"$match": {attributePath: {"$exists": True}}}, {"$count": "count"}], **kwD))
+                    rD["paths"][sp].update({"frequency": num / numPop, "lower": num / numPop, "upper": num / numPop, "exact": True})
+                logger.info("Counted %d of %d rare paths", min(len(rareL), maxRarePaths), len(rareL))
+            logger.info("Discovered %d paths from %d of %d documents (%d strata)", len(rD["paths"]), numSample, numPop, len(strataL))
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return rD
+
+    def __getWilsonInterval(self, freq, num, zV):
+        """Return the Wilson score interval (lower, upper) for the input observed frequency in num trials."""
+        z2 = zV * zV
+        center = (freq + z2 / (2.0 * num)) / (1.0 + z2 / num)
+        halfWidth = zV * math.sqrt(freq * (1.0 - freq) / num + z2 / (4.0 * num * num)) / (1.0 + z2 / num)
+        # The interval contains the observed frequency (clamped against rounding at 0 and 1)
+        return max(0.0, min(freq, center - halfWidth)), min(1.0, max(freq, center + halfWidth))
+
+    def getPathCounts(self, prefix=None):
+        """Return a dictionary of recorded path strings and occurrence counts at or under the optional path prefix."""
+        return self.__pathTrie.getPathCounts(prefix=prefix)
+
+    def getPathTrie(self):
+        """Return the JsonPathTrie of recorded paths."""
+        return self.__pathTrie
+
     def getValues(self):
         return self.__objValD
 
     def setPathList(self, stringPathList):
         self.__objPathD = {k: True for k in stringPathList}
+        self.__pathTrie = JsonPathTrie()
+        for sP in stringPathList:
+            self.__pathTrie.add(sP)
+        self.__prefixS = None
         return True
 
     def getCount(self):
         return len(self.__objectD)
 
+    def materializeObject(self, rObj, stripObjectId=None):
+        """Return a fully decoded dictionary for the input (rawBson) RawBSONDocument object.
+
+        The object id is removed or converted to a string following the stripObjectId option. Objects which
+        are already decoded are returned unchanged.  The JSON path walkers (genPathList(), genValueList()) require decoded objects.
+
+        Args:
+            rObj (RawBSONDocument): raw BSON object
+            stripObjectId (bool, optional): remove the object id. Defaults to the extractor stripObjectId option.
+
+        Returns:
+            dict: decoded object
+        """
+        if not isinstance(rObj, RawBSONDocument):
+            return rObj
+        stripObjectId = self.__kwargs.get("stripObjectId", False) if stripObjectId is None else stripObjectId
+        dD = bson.decode(rObj.raw)
+        if "_id" in dD:
+            if stripObjectId:
+                dD.pop("_id")
+            else:
+                dD["_id"] = str(dD["_id"])
+        return dD
+
+    def getStats(self):
+        """Return the (JSON serializable) extraction statistics accumulated by this extractor.
+
+        Counts include documentsRead, bytesDecoded (estimated from the BSON size of every sampleIncrement-th document),
+        roundTrips (estimated server requests including cursor batches) and cacheObjectsRead/cacheObjectsWritten.
+        Phase times (seconds) cover query (server requests and driver decoding), decode (object id conversion and
+        string interning), keyBuilding, cacheIo and callback (time spent by consumers of the extracted objects).
+
+        Returns:
+            dict: ProcessingStats.getStats() dictionary
+        """
+        return self.__stats.getStats()
+
+    def getInternStats(self):
+        """Return the string interning counts and estimated bytes saved (empty if internStrings is not set)."""
+        return self.__interner.getStats() if self.__interner else {}
+
     def __rebuildCache(self, **kwargs):
+        """Return the dictionary of selected objects from the cache file or from the object store.
+
+        With a watermarkAttribute (e.g. rcsb_last_update) an existing cache is updated incrementally.  The high-water
+        mark of the attribute is stored next to the cache file and on subsequent reads only objects with values at or after
+        the mark are fetched and merged into the cached objects (objects sharing the high-water mark value are re-read as
+        the attribute may be too coarse to order updates).  Objects no longer in the selection are removed using an id-only diff.
+
+        With cacheKwargs={"fmt": "mmap"} the cache is stored as a MappedObjectStore and a cached result is returned
+        as a read-only mapping with records decoded on access.
+
+        With validateCache=True a fingerprint of the selection options and of the current collection statistics
+        (document count, maximum _id and maximum value of the optional fingerprintAttribute) is stored with the cache.
+        Without a fingerprintAttribute (or watermarkAttribute) documents updated in place are not detected.
+        A cache is used only if its fingerprint matches the collection; otherwise it is updated incrementally (with
+        a watermarkAttribute) or rebuilt.
+
+        With useQueryCache=True results read from the object store are shared through the process-wide QueryResultCache,
+        so repeated selections within a process are served from memory until the collection is updated.  Each caller
+        receives a shallow copy of the cached result whose objects are shared with the cache and must not be modified.
+
+        With maxMemoryMB set, objects exceeding the (estimated) memory budget are spilled to key-sorted segment files
+        in spillPath (default a temporary directory) and a read-only SpilledObjectStore mapping is returned.  The
+        extraction is then serial (numProc is ignored).
+
+        With numProc > 1 the selection is extracted over _id partitions in worker processes.  Partition results are
+        returned to the parent process as a single pickled result list before the objects are collected, so peak
+        memory use is about twice the size of the extracted objects.
+
+        With cacheKwargs={"fmt": "shard", "numShards": 16, "shardBy": "hash"} (or shardBy="prefix" and prefixLength)
+        the cache is stored in the directory cacheFilePath as a ShardedObjectCache.  Only the shards with changed
+        content are rewritten and with cacheKeyList only the shards (and objects) covering the listed keys are loaded.
+
+        With sortByKey=True objects are read in the server-side sort order of the uniqueAttributes values and returned
+        in that (insertion) order.  The order is preserved by the pickle, json and mmap caches but not by incremental
+        (watermarkAttribute) updates or hash sharded caches.
+        """
         cacheFilePath = kwargs.get("cacheFilePath", None)
         cacheKwargs = kwargs.get("cacheKwargs", {"fmt": "pickle"})
         useCache = kwargs.get("useCache", True)
         keyAttribute = kwargs.get("keyAttribute", "entry")
-        selectL = kwargs.get("selectionList", [])
+        watermarkAttribute = kwargs.get("watermarkAttribute", None)
+        validateCache = kwargs.get("validateCache", False)
+        isSharded = cacheKwargs.get("fmt") == "shard"
+        cacheKeyList = kwargs.get("cacheKeyList", None) if isSharded else None
         #
         cD = {keyAttribute: {}}
         try:
-            if useCache and cacheFilePath and os.access(cacheFilePath, os.R_OK):
-                cD = self.__mU.doImport(cacheFilePath, **cacheKwargs)
-            else:
-                if selectL:
-                    objectD = self.__select(**kwargs)
-                else:
-                    objectD = self.__selectObjects(**kwargs)
-                cD[keyAttribute] = objectD
-                if cacheFilePath:
-                    pth, _ = os.path.split(cacheFilePath)
-                    ok = self.__mU.mkdir(pth)
-                    ok = self.__mU.doExport(cacheFilePath, cD, **cacheKwargs)
-                    logger.info("Saved object results (%d) status %r in %s", len(objectD), ok, cacheFilePath)
+            objectD = None
+            watermark = None
+            fingerprint = None
+            isValid = True
+            if watermarkAttribute and cacheFilePath:
+                # Capture the high-water mark before reading so any concurrent updates are fetched in the next pass
+                watermark = self.__getWatermark(**kwargs)
+            if validateCache and cacheFilePath:
+                fingerprint = self.__getFingerprint(**kwargs)
+                fpFilePath = self.__getSidecarFilePath(cacheFilePath, "fingerprint")
+                fpD = self.__mU.doImport(fpFilePath, fmt="json") if os.access(fpFilePath, os.R_OK) else {}
+                isValid = fingerprint is not None and fpD.get("fingerprint") == fingerprint
+                logger.info("Cache %s fingerprint valid %r", cacheFilePath, isValid)
+            hasCache = cacheFilePath and os.access(cacheFilePath, os.R_OK) and (not isSharded or self.__getShardedCache(cacheFilePath, cacheKwargs).exists())
+            if useCache and hasCache and (isValid or watermarkAttribute):
+                with self.__stats.timePhase("cacheIo"):
+                    if cacheKwargs.get("fmt") == "mmap":
+                        cD[keyAttribute] = MappedObjectStore(cacheFilePath)
+                    elif isSharded:
+                        # Selective loading only for a cache returned as is (incremental updates require all cached objects)
+                        keyList = cacheKeyList if isValid and (validateCache or not watermarkAttribute) else None
+                        cD[keyAttribute] = self.__getShardedCache(cacheFilePath, cacheKwargs).load(keyList=keyList)
+                    else:
+                        cD = self.__mU.doImport(cacheFilePath, **cacheKwargs)
+                        if self.__interner:
+                            for obj in cD[keyAttribute].values():
+                                self.__interner.internObject(obj)
+                self.__stats.increment("cacheObjectsRead", len(cD[keyAttribute]))
+                if isValid and (validateCache or not watermarkAttribute):
+                    return cD[keyAttribute]
+                objectD = self.__mergeDelta(dict(cD[keyAttribute]), **kwargs)
+                if isinstance(cD[keyAttribute], MappedObjectStore):
+                    cD[keyAttribute].close()
+            if objectD is None:
+                objectD = self.__selectAllCached(**kwargs) if kwargs.get("useQueryCache", False) else self.__selectAll(**kwargs)
+            cD[keyAttribute] = objectD
+            if cacheFilePath:
+                pth, _ = os.path.split(cacheFilePath)
+                ok = self.__mU.mkdir(pth)
+                with self.__stats.timePhase("cacheIo"):
+                    if cacheKwargs.get("fmt") == "mmap":
+                        ok = MappedObjectStore.write(cacheFilePath, objectD, attributes={"keyAttribute": keyAttribute})
+                    elif isinstance(objectD, SpilledObjectStore):
+                        ok = False
+                        logger.warning("Spilled objects are cached only with cacheKwargs fmt mmap - skipping %s", cacheFilePath)
+                    elif isSharded:
+                        ok = self.__getShardedCache(cacheFilePath, cacheKwargs).write(objectD, attributes={"keyAttribute": keyAttribute})
+                    elif kwargs.get("rawBson", False) and cacheKwargs.get("fmt") == "json":
+                        ok = self.__mU.doExport(cacheFilePath, {keyAttribute: {ky: self.materializeObject(obj) for ky, obj in objectD.items()}}, **cacheKwargs)
+                    else:
+                        ok = self.__mU.doExport(cacheFilePath, cD, **cacheKwargs)
+                if ok:
+                    self.__stats.increment("cacheObjectsWritten", len(objectD))
+                logger.info("Saved object results (%d) status %r in %s", len(objectD), ok, cacheFilePath)
+                if watermarkAttribute:
+                    ok = self.__mU.doExport(self.__getSidecarFilePath(cacheFilePath, "watermark"), {"attribute": watermarkAttribute, "watermark": watermark}, fmt="pickle")
+                    logger.info("Saved %s watermark %r status %r", watermarkAttribute, watermark, ok)
+                if fingerprint:
+                    ok = self.__mU.doExport(self.__getSidecarFilePath(cacheFilePath, "fingerprint"), {"fingerprint": fingerprint}, fmt="json")
+                    logger.info("Saved cache fingerprint %s status %r", fingerprint, ok)
+            if cacheKeyList is not None:
+                cD[keyAttribute] = {ky: objectD[ky] for ky in cacheKeyList if ky in objectD}
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return cD[keyAttribute]
 
-    def __selectObjects(self, **kwargs):
-        """Return a dictionary of objects satisfying the input conditions (e.g. method, resolution limit)"""
+    def __getShardedCache(self, cacheFilePath, cacheKwargs):
+        return ShardedObjectCache(cacheFilePath, numShards=cacheKwargs.get("numShards", 16), shardBy=cacheKwargs.get("shardBy", "hash"), prefixLength=cacheKwargs.get("prefixLength", 2))
+
+    def __selectAll(self, **kwargs):
+        numProc = kwargs.get("numProc", 1)
+        if kwargs.get("maxMemoryMB", None):
+            if numProc > 1:
+                logger.warning("Ignoring numProc %d with maxMemoryMB (partitioned extraction results are held in memory)", numProc)
+            return self.__selectSpilled(**kwargs)
+        elif numProc > 1:
+            return self.__selectPartitioned(**kwargs)
+        elif kwargs.get("selectionList", []):
+            return self.__select(**kwargs)
+        return self.__selectObjects(**kwargs)
+
+    def __selectAllCached(self, **kwargs):
+        """Return a shallow copy of the selection result from the QueryResultCache reading it on a cache miss.
+
+        Keys may be added to or removed from the returned dictionary, but the objects are shared with the cache entry
+        (and any other callers) and must be treated as read-only.
+        """
+        qcKey = QueryResultCache.getKey(
+            kwargs.get("databaseName", "pdbx_core"),
+            kwargs.get("collectionName", "pdbx_core_entry"),
+            query=kwargs.get("selectionQuery", {}),
+            projection=kwargs.get("selectionList", []),
+            uniqueAttributes=kwargs.get("uniqueAttributes", ["rcsb_id"]),
+            objectLimit=kwargs.get("objectLimit", None),
+            stripObjectId=kwargs.get("stripObjectId", False),
+            rawBson=kwargs.get("rawBson", False),
+            sortByKey=kwargs.get("sortByKey", False),
+            internStrings=kwargs.get("internStrings", False),
+            internCardinalityLimit=kwargs.get("internCardinalityLimit", 1000),
+        )
+        objectD = QueryResultCache.get(qcKey)
+        if objectD is None:
+            objectD = self.__selectAll(**kwargs)
+            if not isinstance(objectD, dict):
+                return objectD
+            if objectD:
+                QueryResultCache.set(qcKey, objectD)
+        else:
+            logger.info("Using %d cached query results for %s %s", len(objectD), qcKey[0], qcKey[1])
+        return dict(objectD)
+
+    def __getSidecarFilePath(self, cacheFilePath, label):
+        """Return the path of the file storing the watermark or fingerprint (label) details for the input cache file."""
+        ext = "pic" if label == "watermark" else "json"
+        pth, fn = os.path.split(cacheFilePath)
+        return os.path.join(pth, os.path.splitext(fn)[0] + "-" + label + "." + ext)
+
+    def __getFingerprint(self, **kwargs):
+        """Return a fingerprint (hex digest) combining the selection options with the document count, maximum _id and
+        maximum fingerprintAttribute value of the current selection or None on failure.
+
+        The maxima are read with sorted single document (index) lookups and the count from the collection metadata
+        when there is no selection query.  Without a fingerprintAttribute documents updated in place (same count and
+        maximum _id) are not detected.
+        """
         databaseName = kwargs.get("databaseName", "pdbx_core")
         collectionName = kwargs.get("collectionName", "pdbx_core_entry")
         selectionQueryD = kwargs.get("selectionQuery", {})
+        fingerprintAttribute = kwargs.get("fingerprintAttribute", kwargs.get("watermarkAttribute", None))
         #
+        try:
+            with self.__getConnection() as client:
+                mg = MongoDbUtil(client)
+                if not mg.collectionExists(databaseName, collectionName):
+                    return None
+                clt = client[databaseName].get_collection(collectionName)
+                qD = selectionQueryD if selectionQueryD else {}
+                statD = {"count": clt.count_documents(qD) if qD else clt.estimated_document_count()}
+                for dD in clt.find(filter=qD, projection={"_id": 1}, sort=[("_id", -1)], limit=1):
+                    statD["maxId"] = dD["_id"]
+                if fingerprintAttribute:
+                    fD = {fingerprintAttribute: {"$exists": True}}
+                    fD = {"$and": [qD, fD]} if qD else fD
+                    for dD in clt.find(filter=fD, projection={fingerprintAttribute: 1, "_id": 0}, sort=[(fingerprintAttribute, -1)], limit=1):
+                        statD["maxValue"] = self.__getKeyValue(dD, fingerprintAttribute)
+            optD = {ky: kwargs.get(ky, None) for ky in ["databaseName", "collectionName", "selectionQuery", "selectionList", "uniqueAttributes", "objectLimit", "stripObjectId"]}
+            fpS = json.dumps([optD, fingerprintAttribute, statD.get("count", 0), statD.get("maxId"), statD.get("maxValue")], sort_keys=True, default=str)
+            return hashlib.sha256(fpS.encode("utf-8")).hexdigest()
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        return None
+
+    def __getWatermark(self, **kwargs):
+        """Return the maximum value of the watermark attribute over the current selection (or None)."""
+        databaseName = kwargs.get("databaseName", "pdbx_core")
+        collectionName = kwargs.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = kwargs.get("selectionQuery", {})
+        watermarkAttribute = kwargs.get("watermarkAttribute", None)
+        #
+        with self.__getConnection() as client:
+            mg = MongoDbUtil(client)
+            if mg.collectionExists(databaseName, collectionName):
+                qD = {watermarkAttribute: {"$exists": True}}
+                if selectionQueryD:
+                    qD = {"$and": [selectionQueryD, qD]}
+                clt = client[databaseName].get_collection(collectionName)
+                for dD in clt.find(filter=qD, projection={watermarkAttribute: 1, "_id": 0}, sort=[(watermarkAttribute, -1)], limit=1):
+                    return self.__getKeyValue(dD, watermarkAttribute)
+        return None
+
+    def __mergeDelta(self, objectD, **kwargs):
+        """Merge objects changed since the stored watermark into the input cached objects and remove
+        objects no longer in the selection.  Returns None if a full extraction is required.
+
+        Objects with the watermark value itself are included, since documents updated within the same time stamp tick
+        after the watermark was read would otherwise be missed (re-merging these objects is idempotent).
+        """
+        cacheFilePath = kwargs.get("cacheFilePath", None)
+        selectionQueryD = kwargs.get("selectionQuery", {})
         uniqueAttributes = kwargs.get("uniqueAttributes", ["rcsb_id"])
+        watermarkAttribute = kwargs.get("watermarkAttribute", None)
         #
-        tV = kwargs.get("objectLimit", None)
-        objLimit = int(tV) if tV is not None else None
-        stripObjectId = kwargs.get("stripObjectId", False)
+        wmFilePath = self.__getSidecarFilePath(cacheFilePath, "watermark")
+        wmD = self.__mU.doImport(wmFilePath, fmt="pickle") if os.access(wmFilePath, os.R_OK) else None
+        if not wmD or wmD.get("attribute") != watermarkAttribute or wmD.get("watermark") is None:
+            logger.info("No %s watermark for %s (full extraction)", watermarkAttribute, cacheFilePath)
+            return None
+        #
+        qD = {watermarkAttribute: {"$gte": wmD["watermark"]}}
+        if selectionQueryD:
+            qD = {"$and": [selectionQueryD, qD]}
+        numUpd = 0
+        for stKey, rObj in self.__iterSelect(**{**kwargs, "selectionQuery": qD, "objectLimit": None}):
+            objectD[stKey] = rObj
+            numUpd += 1
+        #
+        keyS = {stKey for stKey, _ in self.__iterSelect(**{**kwargs, "selectionList": uniqueAttributes, "objectLimit": None})}
+        if not keyS:
+            logger.warning("Empty key selection for %s (full extraction)", cacheFilePath)
+            return None
+        delL = [stKey for stKey in objectD if stKey not in keyS]
+        for stKey in delL:
+            del objectD[stKey]
+        logger.info("Incremental update since %s %r merged %d deleted %d (total %d)", watermarkAttribute, wmD["watermark"], numUpd, len(delL), len(objectD))
+        return objectD
+
+    def __selectObjects(self, **kwargs):
+        """Return a dictionary of objects satisfying the input conditions (e.g. method, resolution limit)
+
+        Complete documents are read from a single server-side cursor in batches of batchSize
+        documents (rather than one fetch per document identifier).
+        """
         logIncrement = kwargs.get("logIncrement", 10000)
         #
         objectD = {}
+        for ii, (stKey, rObj) in enumerate(self.__iterSelect(**kwargs), 1):
+            objectD[stKey] = rObj
+            logger.debug("Saving %d %s", ii, stKey)
+            if ii % logIncrement == 0:
+                logger.info("Extracting object (%d)", ii)
+        logger.info("Extracted object count %d", len(objectD))
+        return objectD
+        #
+
+    def __selectSpilled(self, **kwargs):
+        """Return a dictionary of objects satisfying the input conditions if their estimated size is within
+        maxMemoryMB or otherwise a SpilledObjectStore with batches of objects written to key-sorted segment files.
+
+        Object sizes are estimated from getObjSize() of every sampleIncrement-th object.
+        """
+        maxBytes = kwargs.get("maxMemoryMB") * 1000000.0
+        spillPath = kwargs.get("spillPath", None)
+        sampleIncrement = kwargs.get("sampleIncrement", 100)
+        logIncrement = kwargs.get("logIncrement", 10000)
+        #
+        objStore = None
+        objectD = {}
+        numBytes = 0
+        numSampled = 0
+        sampledBytes = 0
+        for ii, (stKey, rObj) in enumerate(self.__iterSelect(**kwargs)):
+            if ii % sampleIncrement == 0:
+                numSampled += 1
+                sampledBytes += getObjSize(rObj) + getObjSize(stKey)
+            objectD[stKey] = rObj
+            numBytes += sampledBytes / numSampled
+            if numBytes > maxBytes:
+                if objStore is None:
+                    objStore = SpilledObjectStore(dirPath=spillPath)
+                    logger.info("Extraction exceeds %.1f MB spilling objects to %s", maxBytes / 1000000.0, objStore.getDirPath())
+                if not objStore.addSegment(objectD):
+                    raise IOError("Spilling objects failing in %s" % objStore.getDirPath())
+                objectD = {}
+                numBytes = 0
+            if (ii + 1) % logIncrement == 0:
+                logger.info("Extracting object (%d)", ii + 1)
+        if objStore is None:
+            logger.info("Extracted object count %d", len(objectD))
+            return objectD
+        if objectD and not objStore.addSegment(objectD):
+            raise IOError("Spilling objects failing in %s" % objStore.getDirPath())
+        logger.info("Extracted object count %d in %d spilled segments", len(objStore), objStore.getSegmentCount())
+        return objStore
+
+    def __selectPartitioned(self, **kwargs):
+        """Return a dictionary of objects satisfying the input conditions and selection options extracted
+        in parallel.  The _id key space of the selection is split into numPartitions contiguous ranges
+        (default numProc) and each range is extracted by a separate worker process with its own connection.
+        The pickled partition results and the collected objects are held in memory together (about twice the
+        size of the extracted objects).
+        """
+        numProc = kwargs.get("numProc", 1)
+        #
+        objectD = {}
         try:
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
-                mg = MongoDbUtil(client)
-                if mg.collectionExists(databaseName, collectionName):
-                    logger.info("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
-                    qD = {}
-                    if selectionQueryD:
-                        qD.update(selectionQueryD)
-                    selectL = ["_id"]
-                    dL = mg.fetch(databaseName, collectionName, selectL, queryD=qD)
-                    numDoc = len(dL) if dL else 0
-                    logger.info("Selection %r fetch result count %d", selectL, numDoc)
-                    #
-                    for ii, dD in enumerate(dL, 1):
-                        if "_id" not in dD:
-                            continue
-                        rObj = mg.fetchOne(databaseName, collectionName, "_id", dD["_id"])
-                        if stripObjectId and rObj and "_id" in rObj:
-                            rObj.pop("_id")
-                        else:
-                            rObj["_id"] = str(rObj["_id"])
-                        #
-                        stKey = ".".join([rObj[ky] for ky in uniqueAttributes])
-                        objectD[stKey] = copy.copy(rObj)
-                        if objLimit and ii >= objLimit:
-                            break
-                        logger.debug("Saving %d %s", ii, stKey)
-                        if ii % logIncrement == 0 or ii == numDoc:
-                            logger.info("Extracting object (%d of %d)", ii, numDoc)
+            rangeL = self.__getIdPartitions(**kwargs)
+            if not rangeL:
+                return objectD
+            logger.info("Extracting %d _id partitions with numProc %d", len(rangeL), numProc)
+            rWorker = ObjectExtractorWorker(self.__cfgOb, **kwargs)
+            mpu = MultiProcUtil(verbose=True)
+            mpu.setOptions({})
+            mpu.set(workerObj=rWorker, workerMethod="extractList")
+            ok, failList, resultList, diagList = mpu.runMulti(dataList=rangeL, numProc=numProc, numResults=1, chunkSize=1)
+            if not ok:
+                logger.error("Extraction failing for %d of %d partitions", len(failList), len(rangeL))
+            # Worker diagnostics are the extraction statistics and query plans (explainQueries) for each partition
+            for diagD in diagList:
+                self.__stats.merge(diagD["stats"])
+                QueryPlanAdvisor.merge(diagD["plans"])
+            if kwargs.get("sortByKey", False):
+                # Partition results are sorted runs so this (stable) sort is close to linear
+                resultList[0].sort(key=lambda tup: tup[0])
+            for stKey, rObj in resultList[0]:
+                # Objects returned from separate processes are re-interned to share strings across partitions
+                objectD[stKey] = self.__interner.internObject(rObj) if self.__interner else rObj
+            logger.info("Partitioned extraction status %r object count %d", ok, len(objectD))
         except Exception as e:
             logger.exception("Failing with %s", str(e))
         return objectD
+
+    def __getIdPartitions(self, **kwargs):
+        """Return a list of (lowerId, upperId, isLast) _id ranges splitting the current selection into numPartitions
+        parts of approximately equal document count.  Ranges include the lower bound and exclude the upper bound
+        except for the last range which includes both.
+        """
+        databaseName = kwargs.get("databaseName", "pdbx_core")
+        collectionName = kwargs.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = kwargs.get("selectionQuery", {})
+        numPartitions = kwargs.get("numPartitions", kwargs.get("numProc", 1))
+        tV = kwargs.get("objectLimit", None)
+        objLimit = int(tV) if tV is not None else None
         #
+        rangeL = []
+        with self.__getConnection() as client:
+            mg = MongoDbUtil(client)
+            if mg.collectionExists(databaseName, collectionName):
+                qD = {}
+                if selectionQueryD:
+                    qD.update(selectionQueryD)
+                if self.__explainQueries:
+                    QueryPlanAdvisor.explain(client[databaseName].get_collection(collectionName), databaseName, collectionName, qD, projection={"_id": 1})
+                cursor = client[databaseName].get_collection(collectionName).find(filter=qD, projection={"_id": 1}, sort=[("_id", 1)])
+                if objLimit:
+                    cursor = cursor.limit(objLimit)
+                idL = [dD["_id"] for dD in cursor]
+                numDoc = len(idL)
+                logger.info("Selection %s %s _id count %d", databaseName, collectionName, numDoc)
+                if numDoc:
+                    numPartitions = max(1, min(numPartitions, numDoc))
+                    bL = [idL[(ii * numDoc) // numPartitions] for ii in range(numPartitions)]
+                    for ii, loId in enumerate(bL):
+                        isLast = ii == len(bL) - 1
+                        rangeL.append((loId, idL[-1] if isLast else bL[ii + 1], isLast))
+        return rangeL
 
     def __select(self, **kwargs):
         """Return a dictionary of object content satisfying the input conditions
         (e.g. method, resolution limit) and selection options.
         """
+        objectD = {}
+        for stKey, rObj in self.__iterSelect(**kwargs):
+            objectD[stKey] = rObj
+        logger.info("Selection %r fetch result count %d", kwargs.get("selectionList", []), len(objectD))
+        return objectD
+        #
+
+    def __iterSelect(self, **kwargs):
+        """Generator of (key, object) pairs satisfying the input conditions and selection options
+        read from a server-side cursor in batches of batchSize documents.
+        """
         databaseName = kwargs.get("databaseName", "pdbx_core")
         collectionName = kwargs.get("collectionName", "pdbx_core_entry")
         selectionQueryD = kwargs.get("selectionQuery", {})
         uniqueAttributes = kwargs.get("uniqueAttributes", ["rcsb_id"])
         selectL = kwargs.get("selectionList", [])
         stripObjectId = kwargs.get("stripObjectId", False)
+        batchSize = kwargs.get("batchSize", 1000)
+        sampleIncrement = kwargs.get("sampleIncrement", 100)
+        rawBson = kwargs.get("rawBson", False)
+        interner = None if rawBson else self.__interner
+        stats = self.__stats
+        perfCounter = time.perf_counter
         #
         tV = kwargs.get("objectLimit", None)
         objLimit = int(tV) if tV is not None else None
         #
-        objectD = {}
+        conn = self.__getConnection()
         try:
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
-                mg = MongoDbUtil(client)
-                if mg.collectionExists(databaseName, collectionName):
-                    logger.info("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
-                    qD = {}
-                    if selectionQueryD:
-                        qD.update(selectionQueryD)
-                    dL = mg.fetch(databaseName, collectionName, selectL, queryD=qD, suppressId=True)
-                    logger.info("Selection %r fetch result count %d", selectL, len(dL))
-                    #
-                    for ii, rObj in enumerate(dL, 1):
-                        stKey = ".".join([rObj[ky] for ky in uniqueAttributes])
-                        if stripObjectId and rObj and "_id" in rObj:
+            if not conn.openConnection():
+                return
+            client = conn.getClientConnection()
+            mg = MongoDbUtil(client)
+            tS = perfCounter()
+            if not mg.collectionExists(databaseName, collectionName):
+                return
+            logger.info("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
+            stats.increment("roundTrips", 2)
+            qD = {}
+            if selectionQueryD:
+                qD.update(selectionQueryD)
+            # Selected content is fetched without the object id (matching the MongoDbUtil.fetch() suppressId option)
+            pD = {**{ky: 1 for ky in selectL}, "_id": 0} if selectL else None
+            if self.__explainQueries:
+                QueryPlanAdvisor.explain(client[databaseName].get_collection(collectionName), databaseName, collectionName, qD, projection=pD)
+            if rawBson:
+                # Raw documents are read-only - the object id is excluded on the server or returned as an ObjectId
+                pD = pD if pD else {"_id": 0} if stripObjectId else None
+                clt = client[databaseName].get_collection(collectionName, codec_options=CodecOptions(document_class=RawBSONDocument))
+            else:
+                clt = client[databaseName].get_collection(collectionName)
+            if kwargs.get("sortByKey", False):
+                # Sort on the server (using the unique attribute index when present) rather than re-sorting a copy of the result
+                cursor = clt.find(filter=qD, projection=pD, batch_size=batchSize, sort=[(ky, 1) for ky in uniqueAttributes], allow_disk_use=True)
+            else:
+                cursor = clt.find(filter=qD, projection=pD, batch_size=batchSize)
+            # Phase times are accumulated locally and recorded when the cursor is exhausted or closed
+            ii = numSampled = sampledBytes = 0
+            tQuery = tDecode = tKey = tCallback = 0.0
+            try:
+                for ii, rObj in enumerate(cursor, 1):
+                    t1 = perfCounter()
+                    tQuery += t1 - tS
+                    if rawBson:
+                        numSampled += 1
+                        sampledBytes += len(rObj.raw)
+                    elif (ii - 1) % sampleIncrement == 0:
+                        numSampled += 1
+                        sampledBytes += len(bson.encode(rObj))
+                        t1 = perfCounter()
+                    if "_id" in rObj and not rawBson:
+                        if stripObjectId:
                             rObj.pop("_id")
-                        objectD[stKey] = copy.copy(rObj)
-                        if objLimit and ii >= objLimit:
-                            break
-                        # logger.debug("Saving %d %s", ii, stKey)
-                        # logger.debug("Current objectD keys %r", list(objectD.keys()))
-
+                        else:
+                            rObj["_id"] = str(rObj["_id"])
+                    if interner:
+                        interner.internObject(rObj)
+                    t2 = perfCounter()
+                    tDecode += t2 - t1
+                    stKey = ".".join([rObj[ky] for ky in uniqueAttributes])
+                    t3 = perfCounter()
+                    tKey += t3 - t2
+                    yield stKey, rObj
+                    tS = perfCounter()
+                    tCallback += tS - t3
+                    if objLimit and ii >= objLimit:
+                        break
+                else:
+                    tQuery += perfCounter() - tS
+            finally:
+                cursor.close()
+                stats.increment("documentsRead", ii)
+                stats.increment("bytesDecoded", int(sampledBytes * ii / numSampled) if numSampled else 0)
+                stats.increment("roundTrips", max(1, math.ceil(ii / batchSize)))
+                for phase, seconds in (("query", tQuery), ("decode", tDecode), ("keyBuilding", tKey), ("callback", tCallback)):
+                    stats.addTime(phase, seconds)
         except Exception as e:
             logger.exception("Failing with %s", str(e))
-        return objectD
-        #
+        finally:
+            conn.closeConnection()
+
+    def __getConnection(self):
+        if self.__useClientRegistry:
+            return MongoClientRegistry.getConnection(self.__cfgOb, resourceName=self.__resourceName)
+        return Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName)
 
     def __getKeyValues(self, dct, keyNames):
         """Return the tuple of values of corresponding to the input dictionary key names expressed in dot notation.
@@ -222,55 +1056,104 @@ class ObjectExtractor(object):
 
         return None
 
-    def __toJsonPathString(self, path):
-        pL = [ky if ky else "[]" for ky in path]
-        sp = ".".join(pL)
-        sp = sp.replace(".[", "[")
-        return sp
-
-    def __pathCallBack(self, path, value):
-        sp = self.__toJsonPathString(path)
-        self.__objPathD[sp] = self.__objPathD[sp] + 1 if sp in self.__objPathD else 1
-        return value
-
-    def __saveCallBack(self, path, value):
-        sP = self.__toJsonPathString(path)
-        if sP in self.__objPathD:
-            ky = sP.replace("[]", "")
-            if sP.find("[") != -1:  # multivalued
-                if isinstance(value, list):
-                    self.__objValD.setdefault(ky, []).extend(value)
-                else:
-                    self.__objValD.setdefault(ky, []).append(value)
+    def __compilePathPrefixes(self):
+        """Return the set of path strings of all elements leading to (and including) the current path list."""
+        prefixS = set()
+        for sP in self.__objPathD:
+            node = self.__pathTrie.getRoot()
+            prefixS.add(node.path)
+            for ky in self.__pathTrie.tokenize(sP):
+                node = node.getChild(ky)
+                prefixS.add(node.path)
+        return prefixS
+
+    def __saveValue(self, sP, value):
+        ky = sP.replace("[]", "")
+        if sP.find("[") != -1:  # multivalued
+            if isinstance(value, list):
+                self.__objValD.setdefault(ky, []).extend(value)
             else:
-                self.__objValD[ky] = value
-        return value
+                self.__objValD.setdefault(ky, []).append(value)
+        else:
+            self.__objValD[ky] = value
 
     def genPathList(self, dObj, path=None):
-        return self.__walk(dObj, jsonPath=path, funct=self.__pathCallBack)
+        """Record the JSON path string (and count) of every element of the input object.
 
-    def genValueList(self, dObj, path=None, clear=True):
-        self.__objValD = {} if clear else self.__objValD
-        return self.__walk(dObj, jsonPath=path, funct=self.__saveCallBack)
+        Args:
+            dObj (dict): JSON object
+            path (list, optional): path of the input object within its parent document (list elements as []). Defaults to None.
 
-    def __walk(self, jsonObj, jsonPath=None, funct=None):
-        """Walk JSON data types. An optional funct() is called to mutate
-        the value of each element. The jsonPath is updated at each element.
+        Returns:
+            dict: the input object (unchanged)
         """
-        if jsonPath is None:
-            jsonPath = []
+        self.__walkPaths(dObj, path=path)
+        return dObj
 
-        if isinstance(jsonObj, dict):
-            value = {k: self.__walk(v, jsonPath + [k], funct) for k, v in jsonObj.items()}
-        elif isinstance(jsonObj, list):
-            value = [self.__walk(elem, jsonPath + [[]], funct) for elem in jsonObj]
-        else:
-            value = jsonObj
+    def __walkPaths(self, dObj, path=None, pathS=None):
+        """Record the path string (and count) of every element of the input object adding the path strings to the optional set pathS.
 
-        if funct is None:
-            return value
-        else:
-            return funct(jsonPath, value)
+        The root element of a document (empty path string) is not recorded.
+        """
+        self.__prefixS = None
+        pathD = self.__objPathD
+        # Trie nodes carry the path strings so each distinct path string is built only once
+        stack = [(dObj, self.__pathTrie.getNode(path))]
+        while stack:
+            obj, node = stack.pop()
+            sp = node.path
+            if sp:
+                node.count += 1
+                pathD[sp] = pathD[sp] + 1 if sp in pathD else 1
+                if pathS is not None:
+                    pathS.add(sp)
+            if isinstance(obj, dict):
+                for ky, val in obj.items():
+                    stack.append((val, node.getChild(ky)))
+            elif isinstance(obj, list):
+                cNode = node.getChild("")
+                for val in obj:
+                    stack.append((val, cNode))
+
+    def genValueList(self, dObj, path=None, clear=True):
+        """Save the values of the elements of the input object on the current path list (see getValues()).
+
+        Only the branches of the input object leading to paths in the path list are visited. Values are
+        saved in document order with multivalued paths accumulated in lists.
+
+        Args:
+            dObj (dict): JSON object
+            path (list, optional): path of the input object within its parent document (list elements as []). Defaults to None.
+            clear (bool, optional): clear previously saved values. Defaults to True.
+
+        Returns:
+            dict: the input object (unchanged)
+        """
+        self.__objValD = {} if clear else self.__objValD
+        if self.__prefixS is None:
+            self.__prefixS = self.__compilePathPrefixes()
+        prefixS = self.__prefixS
+        pathD = self.__objPathD
+        # Elements are saved after their descendants (isSave=True) matching a post-order traversal
+        stack = [(dObj, self.__pathTrie.getNode(path), False)]
+        while stack:
+            obj, node, isSave = stack.pop()
+            if isSave:
+                self.__saveValue(node.path, obj)
+                continue
+            if node.path in pathD:
+                stack.append((obj, node, True))
+            if isinstance(obj, dict):
+                for ky, val in reversed(list(obj.items())):
+                    cNode = node.getChild(ky)
+                    if cNode.path in prefixS:
+                        stack.append((val, cNode, False))
+            elif isinstance(obj, list):
+                cNode = node.getChild("")
+                if cNode.path in prefixS:
+                    for val in reversed(obj):
+                        stack.append((val, cNode, False))
+        return dObj
 
     def __toPath(self, path):
         """Convert path strings into path lists."""
@@ -284,3 +1167,44 @@ class ObjectExtractor(object):
                 yield []
 
         return list(_iterPath(path))[:-1]
+
+
+class ObjectExtractorWorker(object):
+    """A skeleton worker class that implements the interface expected by the multiprocessing module
+    for extracting objects within ranges of the document _id key space.
+    """
+
+    def __init__(self, cfgOb, **kwargs):
+        self.__cfgOb = cfgOb
+        self.__kwargs = kwargs
+
+    def extractList(self, dataList, procName, optionsD, workingDir):
+        """Extract the objects within each input _id range (lowerId, upperId, isLast).
+
+        Returns:
+            (list, list, list): successful ranges, list of extracted (key, object) pairs,
+                                and {"stats": extraction statistics, "plans": query plan summaries} for each range
+        """
+        _ = optionsD
+        _ = workingDir
+        successList = []
+        retList = []
+        diagList = []
+        databaseName = self.__kwargs.get("databaseName", "pdbx_core")
+        collectionName = self.__kwargs.get("collectionName", "pdbx_core_entry")
+        selectionQueryD = self.__kwargs.get("selectionQuery", {})
+        for loId, hiId, isLast in dataList:
+            try:
+                rangeQueryD = {"_id": {"$gte": loId, "$lte" if isLast else "$lt": hiId}}
+                qD = {"$and": [selectionQueryD, rangeQueryD]} if selectionQueryD else rangeQueryD
+                obEx = ObjectExtractor(self.__cfgOb, **{**self.__kwargs, "streamObjects": True})
+                tL = list(obEx.iterObjects(selectionQuery=qD, objectLimit=None))
+                retList.extend(tL)
+                # Plans recorded in this process are returned to the parent process QueryPlanAdvisor
+                planD = QueryPlanAdvisor.getPlan(databaseName, collectionName, qD) if self.__kwargs.get("explainQueries", False) else None
+                diagList.append({"stats": obEx.getStats(), "plans": [planD] if planD else []})
+                successList.append((loId, hiId, isLast))
+                logger.info("%s extracted %d objects for _id range %s - %s", procName, len(tL), loId, hiId)
+            except Exception as e:
+                logger.exception("%s failing for _id range %s - %s with %s", procName, loId, hiId, str(e))
+        return successList, retList, diagList
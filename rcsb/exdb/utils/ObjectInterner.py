@@ -0,0 +1,99 @@
+##
+# File: ObjectInterner.py
+# Date: 17-Oct-2026  dwp
+#
+# Shared string storage for the keys and low cardinality values of JSON objects.
+#
+# Updates:
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+
+class ObjectInterner(object):
+    """Replace repeated dictionary keys and string values in JSON objects with shared string instances.
+
+    Dictionary keys are interned with sys.intern().  String values are shared per attribute name
+    (e.g. provenance_source, database_name) until the number of distinct values of an attribute exceeds
+    cardinalityLimit, after which values of that attribute are left as is.
+    """
+
+    def __init__(self, cardinalityLimit=1000):
+        self.__cardinalityLimit = cardinalityLimit
+        # attribute name -> {value: shared value} or None for attributes exceeding the cardinality limit
+        self.__valueD = {}
+        self.__statsD = {"keys": 0, "values": 0, "bytesSaved": 0}
+
+    def internObject(self, obj):
+        """Intern (in place) the dictionary keys and low cardinality string values of the input object.
+
+        Args:
+            obj (dict or list): JSON object
+
+        Returns:
+            (dict or list): the input object
+        """
+        statsD = self.__statsD
+        valueD = self.__valueD
+        limit = self.__cardinalityLimit
+        stack = [(obj, None)]
+        while stack:
+            cObj, cKy = stack.pop()
+            if isinstance(cObj, dict):
+                itemL = list(cObj.items())
+                cObj.clear()
+                for ky, val in itemL:
+                    if isinstance(ky, str):
+                        iKy = sys.intern(ky)
+                        if iKy is not ky:
+                            statsD["keys"] += 1
+                            statsD["bytesSaved"] += sys.getsizeof(ky)
+                        ky = iKy
+                    if isinstance(val, str):
+                        val = self.__internValue(val, ky, valueD, limit)
+                    elif isinstance(val, (dict, list)):
+                        stack.append((val, ky))
+                    cObj[ky] = val
+            elif isinstance(cObj, list):
+                for ii, val in enumerate(cObj):
+                    if isinstance(val, str):
+                        cObj[ii] = self.__internValue(val, cKy, valueD, limit)
+                    elif isinstance(val, (dict, list)):
+                        stack.append((val, cKy))
+        return obj
+
+    def __internValue(self, val, ky, valueD, limit):
+        try:
+            tD = valueD[ky]
+        except KeyError:
+            tD = valueD[ky] = {}
+        if tD is None:
+            return val
+        iVal = tD.get(val)
+        if iVal is None:
+            if len(tD) >= limit:
+                # High cardinality attribute - release the table and leave subsequent values unchanged
+                valueD[ky] = None
+                return val
+            tD[val] = val
+            return val
+        if iVal is not val:
+            self.__statsD["values"] += 1
+            self.__statsD["bytesSaved"] += sys.getsizeof(val)
+        return iVal
+
+    def getStats(self):
+        """Return the counts of replaced keys and values and the estimated bytes saved.
+
+        Returns:
+            dict: {"keys": count, "values": count, "bytesSaved": bytes, "sharedAttributes": count}
+        """
+        return {**self.__statsD, "sharedAttributes": sum(1 for tD in self.__valueD.values() if tD is not None)}
@@ -5,6 +5,9 @@
 # Utilities to extract and update object from the document object server.
 #
 # Updates:
+# 17-Oct-2026 dwp invalidate process-wide QueryResultCache entries for transformed collections
+# 17-Oct-2026 dwp add getStats() reporting document and round trip counts and query, callback and write timings
+# 17-Oct-2026 dwp write field level ($set/$unset) patches of transformed objects rather than full replacements
 #
 ##
 __docformat__ = "google en"
@@ -18,6 +21,9 @@ from rcsb.db.mongo.Connection import Connection
 from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
 from rcsb.db.processors.DataExchangeStatus import DataExchangeStatus
 from rcsb.db.utils.TimeUtil import TimeUtil
+from rcsb.exdb.utils.ObjectDiff import ObjectDiff
+from rcsb.exdb.utils.ProcessingStats import ProcessingStats
+from rcsb.exdb.utils.QueryResultCache import QueryResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -29,8 +35,11 @@ class ObjectTransformer(object):
         self.__cfgOb = cfgOb
         self.__oAdapt = objectAdapter
         self.__resourceName = "MONGO_DB"
-        _ = kwargs
+        # usePatch=False replaces each transformed document rather than writing the changed attributes ($set/$unset)
+        self.__usePatch = kwargs.get("usePatch", True)
+        self.__objDiff = ObjectDiff(maxPaths=kwargs.get("maxPatchPaths", None))
         self.__statusList = []
+        self.__stats = ProcessingStats()
 
     def doTransform(self, **kwargs):
         desp = DataExchangeStatus()
@@ -42,6 +51,7 @@ class ObjectTransformer(object):
         fetchLimit = kwargs.get("fetchLimit", None)
         tU = TimeUtil()
         updateId = kwargs.get("updateId", tU.getCurrentWeekSignature())
+        self.__stats.setAttributes(databaseName=databaseName, collectionName=collectionName, updateId=updateId)
         #
         docSelectList = self.__selectObjectIds(databaseName, collectionName, selectionQueryD)
         docSelectList = docSelectList[:fetchLimit] if fetchLimit else docSelectList
@@ -63,7 +73,9 @@ class ObjectTransformer(object):
                     if selectionQueryD:
                         qD.update(selectionQueryD)
                     selectL = ["_id"]
-                    dL = mg.fetch(databaseName, collectionName, selectL, queryD=qD)
+                    with self.__stats.timePhase("query"):
+                        dL = mg.fetch(databaseName, collectionName, selectL, queryD=qD)
+                    self.__stats.increment("roundTrips", 3)
                     logger.info("Selection %r fetch result count %d", selectL, len(dL))
 
         except Exception as e:
@@ -83,14 +95,20 @@ class ObjectTransformer(object):
                     for ii, dD in enumerate(docSelectList, 1):
                         if "_id" not in dD:
                             continue
-                        rObj = mg.fetchOne(databaseName, collectionName, "_id", dD["_id"])
+                        with self.__stats.timePhase("query"):
+                            rObj = mg.fetchOne(databaseName, collectionName, "_id", dD["_id"])
+                        self.__stats.increment("documentsRead")
+                        self.__stats.increment("roundTrips")
                         del rObj["_id"]
+                        oldObj = self.__objDiff.getSnapshot(rObj) if self.__usePatch and self.__oAdapt else rObj
                         #
                         fOk = True
                         if self.__oAdapt:
-                            fOk, rObj = self.__oAdapt.filter(rObj)
+                            with self.__stats.timePhase("callback"):
+                                fOk, rObj = self.__oAdapt.filter(rObj)
                         if fOk:
-                            rOk = mg.replace(databaseName, collectionName, rObj, dD)
+                            with self.__stats.timePhase("write"):
+                                rOk = self.__objDiff.writePatch(client, databaseName, collectionName, oldObj if self.__usePatch else None, rObj, dD, stats=self.__stats)
                             if rOk is None:
                                 tId = rObj["rcsb_id"] if "rcsb_id" in rObj else "anonymous"
                                 logger.error("%r %r (%r) failing", databaseName, collectionName, tId)
@@ -104,11 +122,24 @@ class ObjectTransformer(object):
                         #
         except Exception as e:
             logger.exception("Failing with %s", str(e))
+        QueryResultCache.invalidate(databaseName, collectionName)
         return ok
 
     def getLoadStatus(self):
         return self.__statusList
 
+    def getStats(self):
+        """Return the (JSON serializable) transformation statistics (e.g. to store with the getLoadStatus() records).
+
+        Counts include documentsRead, documentsWritten (documentsPatched, patchPaths), documentsUnchanged and roundTrips
+        and phase times (seconds) cover query (selection and document fetch), callback (object adapter filter) and write
+        (patch or replacement) requests.
+
+        Returns:
+            dict: ProcessingStats.getStats() dictionary
+        """
+        return self.__stats.getStats()
+
     def __updateStatus(self, updateId, databaseName, collectionName, status, startTimestamp):
         try:
             sFlag = "Y" if status else "N"
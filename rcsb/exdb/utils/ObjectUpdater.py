@@ -5,7 +5,11 @@
 # Utilities to update document features from the document object server.
 #
 # Updates:
-#
+# 17-Oct-2026 dwp invalidate process-wide QueryResultCache entries for updated collections
+# 17-Oct-2026 dwp add getStats() reporting update request, document and round trip counts and query and write timings
+# 17-Oct-2026 dwp add bulkBatchSize option grouping update() requests into unordered bulk write batches
+# 17-Oct-2026 dwp reuse process-wide shared clients from MongoClientRegistry (useClientRegistry option)
+# 17-Oct-2026 dwp add skipUnchanged option skipping updates matching the stored content hash
 #
 ##
 __docformat__ = "google en"
@@ -13,10 +17,19 @@ __author__ = "John Westbrook"
 __email__ = "jwest@rcsb.rutgers.edu"
 __license__ = "Apache 2.0"
 
+import hashlib
+import json
 import logging
+import math
+
+from pymongo import UpdateMany
+from pymongo.errors import BulkWriteError
 
 from rcsb.db.mongo.Connection import Connection
 from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
+from rcsb.exdb.utils.MongoClientRegistry import MongoClientRegistry
+from rcsb.exdb.utils.ProcessingStats import ProcessingStats
+from rcsb.exdb.utils.QueryResultCache import QueryResultCache
 
 
 logger = logging.getLogger(__name__)
@@ -28,38 +41,229 @@ class ObjectUpdater(object):
     def __init__(self, cfgOb, **kwargs):
         self.__cfgOb = cfgOb
         self.__resourceName = "MONGO_DB"
-        _ = kwargs
+        # bulkBatchSize groups update() requests into unordered bulk writes of this size (None for one request per document)
+        self.__bulkBatchSize = kwargs.get("bulkBatchSize", None)
+        # useClientRegistry=False opens (and closes) a new client connection for each request
+        self.__useClientRegistry = kwargs.get("useClientRegistry", True)
+        # skipUnchanged=True stores a content hash (hashAttribute) of each update (excluding volatileAttributes)
+        # and reduces updates matching the hash stored in the selected documents to their volatileAttributes
+        # (otherwise updates remove any stored hash as it is not recomputed for the updated documents)
+        self.__skipUnchanged = kwargs.get("skipUnchanged", False)
+        self.__hashAttribute = kwargs.get("hashAttribute", "rcsb_content_hash")
+        self.__volatileAttributeS = set(kwargs.get("volatileAttributes", ["rcsb_last_update", "rcsb_latest_update"])) | {"_id", self.__hashAttribute}
+        self.__hashBatchSize = kwargs.get("hashBatchSize", 1000)
+        self.__batchErrorList = []
+        self.__stats = ProcessingStats()
         #
 
-    def update(self, databaseName, collectionName, updateDL):
+    def update(self, databaseName, collectionName, updateDL, bulkBatchSize=None):
         """Update documents satisfying the selection details with the content of updateDL.
 
+        With bulkBatchSize (or the bulkBatchSize constructor option) the updates are sent as unordered bulk writes
+        of up to bulkBatchSize requests.  Requests repeating a selection within a batch start a new batch so repeated
+        updates are applied in order.  Errors are logged and recorded for each batch (see getBatchErrors()) and the
+        remaining batches are written.
+
+        With the skipUnchanged constructor option a content hash of each update (excluding the volatileAttributes,
+        e.g. rcsb_last_update) is stored in the hashAttribute of the updated documents and updates matching the hash
+        stored in every selected document are reduced to the volatile attributes of the update (so time stamps used
+        in expiry selections are refreshed) or skipped if there are none (stored hashes are fetched in batches of
+        hashBatchSize selections).  Without skipUnchanged any stored content hash is removed from the updated documents
+        so a later skipUnchanged update is not compared with a hash of out of date content.
+
         Args:
             databaseName (str): Target database name
             collectionName (str): Target collection name
             updateDL = [{selectD: ..., updateD: ... }, ....]
                 selectD    = {'ky1': 'val1', 'ky2': 'val2',  ...}
                 updateD = {'key1.subkey1...': 'val1', 'key2.subkey2..': 'val2', ...}
+            bulkBatchSize (int, optional): number of update requests in each bulk write. Defaults to None (constructor option).
 
+        Returns:
+            int: count of modified documents
         """
+        self.__batchErrorList = []
+        if self.__skipUnchanged:
+            updateDL = self.__getChangedUpdates(databaseName, collectionName, updateDL)
+            if not updateDL:
+                return 0
+        bulkBatchSize = bulkBatchSize if bulkBatchSize else self.__bulkBatchSize
+        if bulkBatchSize:
+            return self.__updateBulk(databaseName, collectionName, updateDL, bulkBatchSize)
         try:
             numUpdated = 0
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__getConnection() as client:
                 mg = MongoDbUtil(client)
-                if mg.collectionExists(databaseName, collectionName):
-                    logger.debug("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
-                    for updateD in updateDL:
-                        num = mg.update(databaseName, collectionName, updateD["updateD"], updateD["selectD"], upsertFlag=True)
-                        numUpdated += num
+                with self.__stats.timePhase("query"):
+                    isOk = mg.collectionExists(databaseName, collectionName)
+                    if isOk:
+                        logger.debug("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
+                self.__stats.increment("roundTrips", 2 if isOk else 1)
+                if isOk:
+                    clt = client[databaseName].get_collection(collectionName)
+                    with self.__stats.timePhase("write"):
+                        for updateD in updateDL:
+                            try:
+                                rV = clt.update_many(updateD["selectD"], self.__getUpdateOperators(updateD["updateD"]), upsert=True)
+                                numUpdated += rV.modified_count
+                            except Exception as e:
+                                logger.exception("Failing update %s %s selectD %r with %s", databaseName, collectionName, updateD["selectD"], str(e))
+                            self.__stats.increment("updateRequests")
+                            self.__stats.increment("roundTrips")
 
         except Exception as e:
             logger.exception("Failing with %s", str(e))
+        QueryResultCache.invalidate(databaseName, collectionName)
+        self.__stats.increment("documentsWritten", numUpdated)
         return numUpdated
 
+    def __updateBulk(self, databaseName, collectionName, updateDL, bulkBatchSize):
+        numModified = 0
+        try:
+            with self.__getConnection() as client:
+                mg = MongoDbUtil(client)
+                with self.__stats.timePhase("query"):
+                    isOk = mg.collectionExists(databaseName, collectionName)
+                self.__stats.increment("roundTrips")
+                if isOk:
+                    clt = client[databaseName].get_collection(collectionName)
+                    numBatches = 0
+                    for opL in self.__getBulkBatches(updateDL, bulkBatchSize):
+                        numModified += self.__writeBatch(clt, numBatches, opL)
+                        numBatches += 1
+                    logger.info("%s %s bulk update batches %d (failing %d) modified %d", databaseName, collectionName, numBatches, len(self.__batchErrorList), numModified)
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+        QueryResultCache.invalidate(databaseName, collectionName)
+        self.__stats.increment("documentsWritten", numModified)
+        return numModified
+
+    def __getBulkBatches(self, updateDL, bulkBatchSize):
+        """Generate lists of upsert requests of up to bulkBatchSize requests with distinct selections."""
+        opL = []
+        selectS = set()
+        for updateD in updateDL:
+            sKey = json.dumps(updateD["selectD"], sort_keys=True, default=str)
+            if len(opL) >= bulkBatchSize or sKey in selectS:
+                yield opL
+                opL = []
+                selectS = set()
+            selectS.add(sKey)
+            opL.append(UpdateMany(updateD["selectD"], self.__getUpdateOperators(updateD["updateD"]), upsert=True))
+        if opL:
+            yield opL
+
+    def __getUpdateOperators(self, updateD):
+        """Return the update operators for the input update content (removing any stored content hash unless the
+        update is checked and hashed with skipUnchanged)."""
+        if self.__skipUnchanged or self.__hashAttribute in updateD:
+            return {"$set": updateD}
+        return {"$set": updateD, "$unset": {self.__hashAttribute: ""}}
+
+    def __writeBatch(self, clt, iBatch, opL):
+        """Write the input bulk batch and return the count of modified documents (recording any batch errors)."""
+        numMatched = numModified = numUpserted = 0
+        try:
+            with self.__stats.timePhase("write"):
+                rV = clt.bulk_write(opL, ordered=False)
+            numMatched, numModified, numUpserted = rV.matched_count, rV.modified_count, rV.upserted_count
+        except BulkWriteError as e:
+            # Unordered batches apply every request without an error
+            dD = e.details
+            numMatched, numModified, numUpserted = dD.get("nMatched", 0), dD.get("nModified", 0), dD.get("nUpserted", 0)
+            errL = [{"index": tD.get("index"), "code": tD.get("code"), "message": tD.get("errmsg")} for tD in dD.get("writeErrors", [])]
+            self.__batchErrorList.append({"batch": iBatch, "requests": len(opL), "errors": errL})
+            logger.error("Bulk update batch %d failing for %d of %d requests (first error %r)", iBatch, len(errL), len(opL), errL[0] if errL else None)
+        except Exception as e:
+            self.__batchErrorList.append({"batch": iBatch, "requests": len(opL), "errors": [{"index": None, "code": None, "message": str(e)}]})
+            logger.exception("Bulk update batch %d failing with %s", iBatch, str(e))
+        self.__stats.increment("roundTrips")
+        self.__stats.increment("updateRequests", len(opL))
+        self.__stats.increment("documentsMatched", numMatched)
+        self.__stats.increment("documentsUpserted", numUpserted)
+        return numModified
+
+    def __getChangedUpdates(self, databaseName, collectionName, updateDL):
+        """Return the input updates (with the content hash added) with updates matching the stored content hash reduced
+        to their volatile attributes (or excluded if there are none)."""
+        rL = []
+        numUnchanged = 0
+        try:
+            with self.__stats.timePhase("hash"):
+                hashL = [self.__getContentHash(updateD["updateD"]) for updateD in updateDL]
+            with self.__getConnection() as client:
+                mg = MongoDbUtil(client)
+                storedD = {}
+                if mg.collectionExists(databaseName, collectionName):
+                    clt = client[databaseName].get_collection(collectionName)
+                    for ii in range(0, len(updateDL), self.__hashBatchSize):
+                        storedD.update(self.__getStoredHashes(clt, [updateD["selectD"] for updateD in updateDL[ii : ii + self.__hashBatchSize]]))
+                self.__stats.increment("roundTrips", 1 + math.ceil(len(updateDL) / self.__hashBatchSize))
+            # Repeated selections are compared with the hash of the preceding update of the same selection
+            for updateD, hashS in zip(updateDL, hashL):
+                sKey = json.dumps(updateD["selectD"], sort_keys=True, default=str)
+                if storedD.get(sKey) == hashS:
+                    numUnchanged += 1
+                    volD = {ky: val for ky, val in updateD["updateD"].items() if ky in self.__volatileAttributeS and ky not in ("_id", self.__hashAttribute)}
+                    if volD:
+                        self.__stats.increment("updatesReduced")
+                        rL.append({"selectD": updateD["selectD"], "updateD": volD})
+                    else:
+                        self.__stats.increment("updatesSkipped")
+                    continue
+                storedD[sKey] = hashS
+                rL.append({"selectD": updateD["selectD"], "updateD": {**updateD["updateD"], self.__hashAttribute: hashS}})
+        except Exception as e:
+            logger.exception("Failing with %s", str(e))
+            return updateDL
+        logger.info("%s %s skipping or reducing %d unchanged of %d updates", databaseName, collectionName, numUnchanged, len(updateDL))
+        return rL
+
+    def __getStoredHashes(self, clt, selectDL):
+        """Return {selection key: stored content hash or None (if the selected documents differ)} for the input selections."""
+        keyS = {ky for selectD in selectDL for ky in selectD}
+        if all(len(selectD) == 1 for selectD in selectDL) and len(keyS) == 1:
+            ky = keyS.pop()
+            qD = {ky: {"$in": [selectD[ky] for selectD in selectDL]}}
+            keyL = [ky]
+        else:
+            qD = {"$or": selectDL}
+            keyL = sorted(keyS)
+        hashSD = {}
+        for dD in clt.find(filter=qD, projection={**{ky: 1 for ky in keyL}, self.__hashAttribute: 1, "_id": 0}):
+            tD = {}
+            for ky in keyL:
+                val = self.__getKeyValue(dD, ky)
+                if val is not None:
+                    tD[ky] = val
+            hashSD.setdefault(json.dumps(tD, sort_keys=True, default=str), set()).add(dD.get(self.__hashAttribute))
+        selectS = {json.dumps(selectD, sort_keys=True, default=str) for selectD in selectDL}
+        return {sKey: hashS.pop() if len(hashS) == 1 else None for sKey, hashS in hashSD.items() if sKey in selectS}
+
+    def __getContentHash(self, updateD):
+        tD = {ky: val for ky, val in updateD.items() if ky not in self.__volatileAttributeS}
+        return hashlib.sha256(json.dumps(tD, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def __getKeyValue(self, dD, keyName):
+        val = dD
+        for ky in keyName.split("."):
+            if not isinstance(val, dict) or ky not in val:
+                return None
+            val = val[ky]
+        return val
+
+    def getBatchErrors(self):
+        """Return the list of batch errors of the last update() call.
+
+        Returns:
+            list: [{"batch": batch index, "requests": count, "errors": [{"index": request index in batch, "code": code, "message": text}, ...]}, ...]
+        """
+        return self.__batchErrorList
+
     def count(self, databaseName, collectionName):
         try:
             numTotal = 0
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__getConnection() as client:
                 mg = MongoDbUtil(client)
                 if mg.collectionExists(databaseName, collectionName):
                     numTotal = mg.count(databaseName, collectionName)
@@ -80,9 +284,10 @@ class ObjectUpdater(object):
         Returns:
             (bool): True for success or False otherwise
         """
+        QueryResultCache.invalidate(databaseName, collectionName)
         try:
             logger.debug("Create database %s collection %s", databaseName, collectionName)
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__getConnection() as client:
                 mg = MongoDbUtil(client)
                 if checkExists and mg.databaseExists(databaseName) and mg.collectionExists(databaseName, collectionName):
                     ok1 = True
@@ -111,11 +316,31 @@ class ObjectUpdater(object):
         """
         try:
             numDeleted = 0
-            with Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName) as client:
+            with self.__getConnection() as client:
                 mg = MongoDbUtil(client)
                 if mg.collectionExists(databaseName, collectionName):
                     logger.info("%s %s document count is %d", databaseName, collectionName, mg.count(databaseName, collectionName))
-                    numDeleted = mg.delete(databaseName, collectionName, selectD)
+                    with self.__stats.timePhase("write"):
+                        numDeleted = mg.delete(databaseName, collectionName, selectD)
+                    self.__stats.increment("roundTrips")
         except Exception as e:
             logger.exception("Failing with %s", str(e))
+        QueryResultCache.invalidate(databaseName, collectionName)
+        self.__stats.increment("documentsDeleted", numDeleted)
         return numDeleted
+
+    def __getConnection(self):
+        if self.__useClientRegistry:
+            return MongoClientRegistry.getConnection(self.__cfgOb, resourceName=self.__resourceName)
+        return Connection(cfgOb=self.__cfgOb, resourceName=self.__resourceName)
+
+    def getStats(self):
+        """Return the (JSON serializable) statistics accumulated by update() and delete() calls.
+
+        Counts include updateRequests, updatesSkipped, updatesReduced, documentsWritten, documentsDeleted and roundTrips and phase
+        times (seconds) cover query (collection checks), hash (content hashes) and write requests.
+
+        Returns:
+            dict: ProcessingStats.getStats() dictionary
+        """
+        return self.__stats.getStats()
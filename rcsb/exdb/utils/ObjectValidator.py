@@ -5,6 +5,8 @@
 # Utilities to extract and update object from the document object server including validation.
 #
 # Updates:
+# 17-Oct-2026 dwp invalidate process-wide QueryResultCache entries for transformed collections
+# 17-Oct-2026 dwp write field level ($set/$unset) patches of transformed objects rather than full replacements
 #
 ##
 __docformat__ = "google en"
@@ -22,6 +24,8 @@ from rcsb.db.mongo.MongoDbUtil import MongoDbUtil
 from rcsb.db.processors.DataExchangeStatus import DataExchangeStatus
 from rcsb.db.utils.SchemaProvider import SchemaProvider
 from rcsb.db.utils.TimeUtil import TimeUtil
+from rcsb.exdb.utils.ObjectDiff import ObjectDiff
+from rcsb.exdb.utils.QueryResultCache import QueryResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +37,9 @@ class ObjectValidator(object):
         self.__cfgOb = cfgOb
         self.__oAdapt = objectAdapter
         self.__resourceName = "MONGO_DB"
-        _ = kwargs
+        # usePatch=False replaces each transformed document rather than writing the changed attributes ($set/$unset)
+        self.__usePatch = kwargs.get("usePatch", True)
+        self.__objDiff = ObjectDiff(maxPaths=kwargs.get("maxPatchPaths", None))
         self.__statusList = []
         self.__schP = SchemaProvider(self.__cfgOb, cachePath, useCache=useCache)
         self.__valInst = None
@@ -118,6 +124,7 @@ class ObjectValidator(object):
                             continue
                         rObj = mg.fetchOne(databaseName, collectionName, "_id", dD["_id"])
                         del rObj["_id"]
+                        oldObj = self.__objDiff.getSnapshot(rObj) if self.__usePatch and self.__oAdapt else rObj
                         #
                         fOk = True
 
@@ -126,7 +133,7 @@ class ObjectValidator(object):
                             fOk, rObj = self.__oAdapt.filter(rObj)
                             self.__validateObj(databaseName, collectionName, rObj, label="Updated")
                         if fOk:
-                            rOk = mg.replace(databaseName, collectionName, rObj, dD)
+                            rOk = self.__objDiff.writePatch(client, databaseName, collectionName, oldObj if self.__usePatch else None, rObj, dD)
                             if rOk is None:
                                 tId = rObj["rcsb_id"] if rObj and "rcsb_id" in rObj else "anonymous"
                                 logger.error("%r %r (%r) failing", databaseName, collectionName, tId)
@@ -140,6 +147,7 @@ class ObjectValidator(object):
                         #
         except Exception as e:
             logger.exception("Failing with %s", str(e))
+        QueryResultCache.invalidate(databaseName, collectionName)
         return ok
 
     def getLoadStatus(self):
@@ -0,0 +1,84 @@
+##
+# File: ProcessingStats.py
+# Date: 17-Oct-2026  dwp
+#
+# Counters and phase timings collected while reading and writing document objects.
+#
+# Updates:
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import logging
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessingStats(object):
+    """Accumulate named counters (e.g. documentsRead, documentsWritten, bytesDecoded, roundTrips) and
+    the elapsed time spent in named processing phases (e.g. query, decode, keyBuilding, cacheIo, callback).
+
+    Phase times are wall clock seconds and phases may overlap (e.g. cacheIo includes a full query on a cache miss).
+    """
+
+    def __init__(self, **attributes):
+        self.__attributeD = dict(attributes)
+        self.__countD = defaultdict(int)
+        self.__timeD = defaultdict(float)
+        self.__startTime = time.time()
+
+    def setAttributes(self, **attributes):
+        """Set descriptive attributes reported with the statistics (e.g. databaseName, collectionName)."""
+        self.__attributeD.update(attributes)
+
+    def increment(self, name, count=1):
+        self.__countD[name] += count
+
+    def addTime(self, phase, seconds):
+        self.__timeD[phase] += seconds
+
+    @contextmanager
+    def timePhase(self, phase):
+        """Context manager adding the elapsed time of the enclosed block to the input phase."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__timeD[phase] += time.perf_counter() - t0
+
+    def merge(self, statsD):
+        """Add the counters and phase times of a getStats() dictionary (e.g. from a worker process)."""
+        for name, count in statsD.get("counts", {}).items():
+            self.__countD[name] += count
+        for phase, seconds in statsD.get("phaseSeconds", {}).items():
+            self.__timeD[phase] += seconds
+
+    def reset(self):
+        self.__countD.clear()
+        self.__timeD.clear()
+        self.__startTime = time.time()
+
+    def getStats(self):
+        """Return a JSON serializable dictionary of the accumulated statistics.
+
+        Returns:
+            dict: {"attributes": {...}, "counts": {name: count, ...}, "phaseSeconds": {phase: seconds, ...},
+                   "elapsedSeconds": seconds since creation or reset, "documentsPerSecond": {"read": rate, "written": rate}}
+        """
+        elapsed = time.time() - self.__startTime
+        return {
+            "attributes": dict(self.__attributeD),
+            "counts": dict(self.__countD),
+            "phaseSeconds": {phase: round(seconds, 6) for phase, seconds in self.__timeD.items()},
+            "elapsedSeconds": round(elapsed, 6),
+            "documentsPerSecond": {
+                "read": round(self.__countD.get("documentsRead", 0) / elapsed, 3) if elapsed > 0 else 0.0,
+                "written": round(self.__countD.get("documentsWritten", 0) / elapsed, 3) if elapsed > 0 else 0.0,
+            },
+        }
@@ -0,0 +1,238 @@
+##
+# File: QueryPlanAdvisor.py
+# Date: 17-Oct-2026  dwp
+#
+# Process-wide record of query execution plans and index recommendations.
+#
+# Updates:
+# 17-Oct-2026 dwp run the explain command with executionStats verbosity and add merge() for worker process plans
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class QueryPlanAdvisor(object):
+    """Process-wide record of the execution plans of selection queries with recommended indexes.
+
+    Each distinct query (database, collection and filter) is explained once with the executionStats verbosity
+    and the plan summary (COLLSCAN or IXSCAN, index name, documents and keys examined and documents returned)
+    is recorded with the number of times the query was issued.  Indexes are recommended for queries
+    answered by a collection scan or by an index scan examining more than examineRatio documents per
+    returned document.  Recommended index keys list equality attributes followed by range attributes.
+    """
+
+    __lock = threading.RLock()
+    __planD = OrderedDict()
+    __examineRatio = 10.0
+
+    @classmethod
+    def explain(cls, collection, databaseName, collectionName, query=None, projection=None):
+        """Explain (once) and record the plan of the input query on the input collection (pymongo Collection).
+
+        The explain command is run with the executionStats verbosity (the winning plan only, rather than
+        the allPlansExecution verbosity of Cursor.explain()).
+
+        Returns:
+            dict: plan summary or None if the query plan is not available
+        """
+        qS = json.dumps(query if query else {}, sort_keys=True, default=str)
+        key = (databaseName, collectionName, qS)
+        with cls.__lock:
+            planD = cls.__planD.get(key)
+            if planD is not None:
+                planD["queryCount"] += 1
+                return planD
+        try:
+            cmdD = {"find": collection.name, "filter": query if query else {}}
+            if projection:
+                cmdD["projection"] = projection
+            explainD = collection.database.command("explain", cmdD, verbosity="executionStats")
+        except Exception as e:
+            logger.warning("Explain failing for %s %s %s with %s", databaseName, collectionName, qS, str(e))
+            return None
+        return cls.record(databaseName, collectionName, query, explainD)
+
+    @classmethod
+    def record(cls, databaseName, collectionName, query, explainD):
+        """Record the plan summary of the input explain() result for the input query.
+
+        Returns:
+            dict: plan summary
+        """
+        qS = json.dumps(query if query else {}, sort_keys=True, default=str)
+        planD = cls.getPlanSummary(explainD)
+        planD.update({"databaseName": databaseName, "collectionName": collectionName, "query": json.loads(qS), "queryCount": 1})
+        with cls.__lock:
+            planD = cls.__planD.setdefault((databaseName, collectionName, qS), planD)
+        logger.info(
+            "%s %s query %s plan %s (index %r) examined %d returned %d",
+            databaseName,
+            collectionName,
+            qS,
+            planD["stage"],
+            planD["indexName"],
+            planD["docsExamined"],
+            planD["nReturned"],
+        )
+        return planD
+
+    @classmethod
+    def getPlanSummary(cls, explainD):
+        """Return the plan summary for the input explain() result.
+
+        Returns:
+            dict: {"stage": "COLLSCAN"|"IXSCAN"|..., "stages": [...], "indexName": name or None,
+                   "docsExamined": count, "keysExamined": count, "nReturned": count, "executionTimeMillis": msec}
+        """
+        planD = explainD.get("queryPlanner", {}).get("winningPlan", {})
+        # Slot based execution engine plans are nested below the queryPlan element
+        planD = planD.get("queryPlan", planD)
+        stageL = []
+        indexName = None
+        stack = [planD]
+        while stack:
+            sD = stack.pop()
+            if not isinstance(sD, dict) or "stage" not in sD:
+                continue
+            stageL.append(sD["stage"])
+            indexName = sD.get("indexName", indexName)
+            stack.extend(sD.get("inputStages", []))
+            if "inputStage" in sD:
+                stack.append(sD["inputStage"])
+        stage = "COLLSCAN" if "COLLSCAN" in stageL else "IXSCAN" if "IXSCAN" in stageL else stageL[-1] if stageL else "UNKNOWN"
+        esD = explainD.get("executionStats", {})
+        return {
+            "stage": stage,
+            "stages": stageL,
+            "indexName": indexName,
+            "docsExamined": esD.get("totalDocsExamined", 0),
+            "keysExamined": esD.get("totalKeysExamined", 0),
+            "nReturned": esD.get("nReturned", 0),
+            "executionTimeMillis": esD.get("executionTimeMillis", 0),
+        }
+
+    @classmethod
+    def getIndexKeys(cls, query):
+        """Return the list of candidate index attributes (equality attributes followed by range attributes) for the input query."""
+        eqL = []
+        rangeL = []
+        stack = [query if query else {}]
+        while stack:
+            qD = stack.pop(0)
+            for ky, val in qD.items():
+                if ky in ["$and", "$or", "$nor"]:
+                    stack.extend([tD for tD in val if isinstance(tD, dict)])
+                elif ky.startswith("$") or ky == "_id":
+                    continue
+                elif isinstance(val, dict) and any(tK.startswith("$") for tK in val) and not ("$eq" in val and len(val) == 1):
+                    rangeL.append(ky)
+                else:
+                    eqL.append(ky)
+        return list(dict.fromkeys(eqL + [ky for ky in rangeL if ky not in eqL]))
+
+    @classmethod
+    def getPlans(cls):
+        """Return the list of recorded plan summaries."""
+        with cls.__lock:
+            return [dict(planD) for planD in cls.__planD.values()]
+
+    @classmethod
+    def getPlan(cls, databaseName, collectionName, query=None):
+        """Return (a copy of) the recorded plan summary for the input query or None."""
+        qS = json.dumps(query if query else {}, sort_keys=True, default=str)
+        with cls.__lock:
+            planD = cls.__planD.get((databaseName, collectionName, qS))
+            return dict(planD) if planD is not None else None
+
+    @classmethod
+    def merge(cls, planL):
+        """Add the input plan summaries (e.g. getPlan() results from worker processes) to the recorded plans.
+
+        Query counts of plans already recorded for the same query are added.
+        """
+        with cls.__lock:
+            for planD in planL:
+                key = (planD["databaseName"], planD["collectionName"], json.dumps(planD["query"], sort_keys=True, default=str))
+                if key in cls.__planD:
+                    cls.__planD[key]["queryCount"] += planD["queryCount"]
+                else:
+                    cls.__planD[key] = dict(planD)
+
+    @classmethod
+    def getRecommendedIndexes(cls):
+        """Return the list of recommended indexes ordered by the number of documents examined by the affected queries.
+
+        Returns:
+            list: [{"databaseName": ..., "collectionName": ..., "keys": [attribute, ...], "reason": "COLLSCAN"|"IXSCAN selectivity",
+                    "queryCount": count, "docsExamined": count, "nReturned": count}, ...]
+        """
+        rD = OrderedDict()
+        for planD in cls.getPlans():
+            keyL = cls.getIndexKeys(planD["query"])
+            if not keyL:
+                continue
+            if planD["stage"] == "COLLSCAN":
+                reason = "COLLSCAN"
+            elif planD["docsExamined"] > cls.__examineRatio * max(1, planD["nReturned"]):
+                reason = "IXSCAN selectivity"
+            else:
+                continue
+            key = (planD["databaseName"], planD["collectionName"], tuple(keyL))
+            if key not in rD:
+                rD[key] = {"databaseName": key[0], "collectionName": key[1], "keys": keyL, "reason": reason, "queryCount": 0, "docsExamined": 0, "nReturned": 0}
+            # Plans are explained once so examined and returned counts are scaled by the number of issued queries
+            rD[key]["queryCount"] += planD["queryCount"]
+            rD[key]["docsExamined"] += planD["docsExamined"] * planD["queryCount"]
+            rD[key]["nReturned"] += planD["nReturned"] * planD["queryCount"]
+        return sorted(rD.values(), key=lambda x: x["docsExamined"], reverse=True)
+
+    @classmethod
+    def getReport(cls):
+        """Return a JSON serializable report of the recorded plans and recommended indexes."""
+        return {"plans": cls.getPlans(), "recommendedIndexes": cls.getRecommendedIndexes()}
+
+    @classmethod
+    def logRecommendations(cls):
+        """Log and return the recommended indexes."""
+        rL = cls.getRecommendedIndexes()
+        for rD in rL:
+            logger.warning(
+                "Recommended index on %s %s %r (%s, %d queries examined %d returned %d)",
+                rD["databaseName"],
+                rD["collectionName"],
+                rD["keys"],
+                rD["reason"],
+                rD["queryCount"],
+                rD["docsExamined"],
+                rD["nReturned"],
+            )
+        return rL
+
+    @classmethod
+    def setExamineRatio(cls, examineRatio):
+        """Set the ratio of documents examined to documents returned above which an index scan is reported."""
+        cls.__examineRatio = examineRatio
+
+    @classmethod
+    def clear(cls):
+        with cls.__lock:
+            cls.__planD.clear()
+
+    @classmethod
+    def _resetLock(cls):
+        cls.__lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=QueryPlanAdvisor._resetLock)  # pylint: disable=protected-access
@@ -0,0 +1,148 @@
+##
+# File: QueryResultCache.py
+# Date: 17-Oct-2026  dwp
+#
+# Process-wide cache of document object server query results.
+#
+# Updates:
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from rcsb.utils.io.IoUtil import getObjSize
+
+logger = logging.getLogger(__name__)
+
+
+class QueryResultCache(object):
+    """Process-wide least recently used cache of query results keyed by (database, collection, query, projection, options).
+
+    The cache is bounded by the number of entries and by the total estimated size (getObjSize() bytes) of the
+    cached results (default 256 MB, maxBytes=0 disables caching).  Entries for a
+    collection are invalidated by writes through ObjectUpdater, ObjectTransformer and ObjectValidator in the same
+    process.  Writes made by other processes (e.g. MultiProcUtil workers) must be followed by an explicit
+    invalidate() in the parent process.  Cached results are shared and should be treated as read-only.
+    """
+
+    __lock = threading.RLock()
+    __cacheD = OrderedDict()
+    __numBytes = 0
+    __maxEntries = 64
+    __maxBytes = 256 * 1000000
+    __statsD = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    @classmethod
+    def getKey(cls, databaseName, collectionName, query=None, projection=None, **kwargs):
+        """Return the cache key for the input query details (kwargs are any further options affecting the result)."""
+        return (
+            databaseName,
+            collectionName,
+            json.dumps(query if query else {}, sort_keys=True, default=str),
+            json.dumps(projection if projection else [], sort_keys=True, default=str),
+            json.dumps(kwargs, sort_keys=True, default=str),
+        )
+
+    @classmethod
+    def get(cls, key):
+        """Return the cached result for the input key or None."""
+        with cls.__lock:
+            result = cls.__cacheD.get(key)
+            if result is None:
+                cls.__statsD["misses"] += 1
+                return None
+            cls.__cacheD.move_to_end(key)
+            cls.__statsD["hits"] += 1
+            logger.debug("Query result cache hit for %s %s", key[0], key[1])
+            return result[0]
+
+    @classmethod
+    def set(cls, key, value, size=None):
+        """Store the input result (size in bytes defaults to the getObjSize() estimate for the result).
+
+        Returns:
+            bool: True if the result is cached or False if it exceeds the cache size limit
+        """
+        if cls.__maxBytes <= 0:
+            return False
+        size = size if size is not None else getObjSize(value)
+        with cls.__lock:
+            if size > cls.__maxBytes:
+                logger.debug("Query result for %s %s (%.2f MB) exceeds the cache size limit", key[0], key[1], size / 1000000.0)
+                return False
+            cls.__discard(key)
+            cls.__cacheD[key] = (value, size)
+            cls.__numBytes += size
+            while len(cls.__cacheD) > cls.__maxEntries or cls.__numBytes > cls.__maxBytes:
+                tKey, _ = next(iter(cls.__cacheD.items()))
+                cls.__discard(tKey)
+                cls.__statsD["evictions"] += 1
+        return True
+
+    @classmethod
+    def invalidate(cls, databaseName, collectionName=None):
+        """Remove the cached results for the input collection (or for all collections of the input database).
+
+        Returns:
+            int: number of removed results
+        """
+        with cls.__lock:
+            keyL = [key for key in cls.__cacheD if key[0] == databaseName and (collectionName is None or key[1] == collectionName)]
+            for key in keyL:
+                cls.__discard(key)
+            cls.__statsD["invalidations"] += len(keyL)
+        if keyL:
+            logger.debug("Invalidated %d cached query results for %s %s", len(keyL), databaseName, collectionName)
+        return len(keyL)
+
+    @classmethod
+    def clear(cls):
+        with cls.__lock:
+            cls.__cacheD.clear()
+            cls.__numBytes = 0
+
+    @classmethod
+    def setLimits(cls, maxEntries=None, maxBytes=None):
+        """Set the maximum number of cached results and the maximum total size in bytes of the cached results (0 disables caching)."""
+        with cls.__lock:
+            cls.__maxEntries = maxEntries if maxEntries is not None else cls.__maxEntries
+            cls.__maxBytes = maxBytes if maxBytes is not None else cls.__maxBytes
+            while cls.__cacheD and (len(cls.__cacheD) > cls.__maxEntries or cls.__numBytes > cls.__maxBytes):
+                tKey, _ = next(iter(cls.__cacheD.items()))
+                cls.__discard(tKey)
+                cls.__statsD["evictions"] += 1
+
+    @classmethod
+    def getLimits(cls):
+        """Return the maximum number of cached results and the maximum total size in bytes of the cached results."""
+        with cls.__lock:
+            return {"maxEntries": cls.__maxEntries, "maxBytes": cls.__maxBytes}
+
+    @classmethod
+    def getStats(cls):
+        """Return the cache hit, miss, eviction and invalidation counts and the current number of results and their size in bytes."""
+        with cls.__lock:
+            return {**cls.__statsD, "entries": len(cls.__cacheD), "bytes": cls.__numBytes}
+
+    @classmethod
+    def __discard(cls, key):
+        result = cls.__cacheD.pop(key, None)
+        if result is not None:
+            cls.__numBytes -= result[1]
+
+    @classmethod
+    def _resetLock(cls):
+        cls.__lock = threading.RLock()
+
+
+if hasattr(os, "register_at_fork"):
+    # A lock held by another thread at fork time would never be released in the child process
+    os.register_at_fork(after_in_child=QueryResultCache._resetLock)  # pylint: disable=protected-access
@@ -0,0 +1,179 @@
+##
+# File: ShardedObjectCache.py
+# Date: 17-Oct-2026  dwp
+#
+# Object cache stored as key-sharded files with a manifest.
+#
+# Updates:
+# 17-Oct-2026 dwp serialize shards without the pickle memo so shard digests depend only on content
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+import re
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedObjectCache(object):
+    """Dictionary of objects cached as shard files in a directory described by a manifest (manifest.json).
+
+    Objects are assigned to shards by a stable hash of their key (shardBy="hash", numShards shards) or by the
+    leading prefixLength characters of their key (shardBy="prefix").  Readers load only the shards covering
+    the keys they require and writers rewrite only the shards whose content has changed.
+    """
+
+    def __init__(self, dirPath, numShards=16, shardBy="hash", prefixLength=2):
+        self.__dirPath = dirPath
+        self.__manifestPath = os.path.join(dirPath, "manifest.json")
+        self.__manifestD = self.__readManifest()
+        if self.__manifestD:
+            # The shard layout of an existing cache takes precedence
+            numShards = self.__manifestD["numShards"]
+            shardBy = self.__manifestD["shardBy"]
+            prefixLength = self.__manifestD["prefixLength"]
+        self.__numShards = numShards
+        self.__shardBy = shardBy
+        self.__prefixLength = prefixLength
+
+    def exists(self):
+        return bool(self.__manifestD)
+
+    def getManifest(self):
+        return self.__manifestD
+
+    def getAttributes(self):
+        """Return the dictionary of attributes stored in the manifest."""
+        return self.__manifestD.get("attributes", {}) if self.__manifestD else {}
+
+    def getShardId(self, key):
+        """Return the identifier of the shard containing the input key."""
+        if self.__shardBy == "prefix":
+            return re.sub(r"[^A-Za-z0-9_-]", "_", str(key)[: self.__prefixLength]) or "_"
+        return "%04d" % (zlib.crc32(str(key).encode("utf-8")) % self.__numShards)
+
+    def load(self, keyList=None):
+        """Load the cached objects for the input keys (or all cached objects).
+
+        Args:
+            keyList (list, optional): keys of the required objects. Defaults to None (all objects).
+
+        Returns:
+            dict: {key: object, ...} for the cached keys (in keyList)
+        """
+        objectD = {}
+        if not self.__manifestD:
+            return objectD
+        shardD = self.__manifestD["shards"]
+        shardIdS = set(shardD) if keyList is None else {self.getShardId(ky) for ky in keyList} & set(shardD)
+        objectD = self.__loadShards(shardIdS)
+        if keyList is not None:
+            objectD = {ky: objectD[ky] for ky in keyList if ky in objectD}
+        logger.info("Loaded %d objects from %d of %d shards in %s", len(objectD), len(shardIdS), len(shardD), self.__dirPath)
+        return objectD
+
+    def __dumps(self, obj):
+        """Serialize the input object without the pickle memo, so equal content has the same serialization (and digest)
+        regardless of which strings and sub-objects are shared (e.g. cached objects merged with newly fetched objects).
+        """
+        bIo = io.BytesIO()
+        pk = pickle.Pickler(bIo, protocol=pickle.HIGHEST_PROTOCOL)
+        pk.fast = True
+        pk.dump(obj)
+        return bIo.getvalue()
+
+    def __loadShards(self, shardIdS):
+        objectD = {}
+        shardD = self.__manifestD["shards"]
+        for shardId in sorted(shardIdS):
+            with open(os.path.join(self.__dirPath, shardD[shardId]["fileName"]), "rb") as ifh:
+                objectD.update(pickle.load(ifh))
+        return objectD
+
+    def update(self, objectD):
+        """Add (or replace) the input objects rewriting only the shards covering their keys.
+
+        Args:
+            objectD (dict): dictionary of new or changed objects
+
+        Returns:
+            bool: True for success or False otherwise
+        """
+        if not self.__manifestD:
+            return self.write(objectD)
+        shardIdS = {self.getShardId(ky) for ky in objectD} & set(self.__manifestD["shards"])
+        tD = self.__loadShards(shardIdS)
+        tD.update(objectD)
+        return self.write(tD, attributes=self.getAttributes(), partial=True)
+
+    def write(self, objectD, attributes=None, partial=False):
+        """Write the input objects rewriting only shards with changed content and removing empty shards.
+
+        Args:
+            objectD (dict): complete dictionary of cached objects (or the complete content of the shards covering its keys if partial=True)
+            attributes (dict, optional): JSON serializable attributes stored in the manifest. Defaults to None.
+            partial (bool, optional): retain the shards not covered by the input objects. Defaults to False.
+
+        Returns:
+            bool: True for success or False otherwise
+        """
+        try:
+            if not os.path.isdir(self.__dirPath):
+                os.makedirs(self.__dirPath)
+            tD = {}
+            for ky, obj in objectD.items():
+                tD.setdefault(self.getShardId(ky), {})[ky] = obj
+            oldShardD = self.__manifestD.get("shards", {}) if self.__manifestD else {}
+            shardD = {shardId: sD for shardId, sD in oldShardD.items() if shardId not in tD} if partial else {}
+            numWritten = 0
+            for shardId in sorted(tD):
+                blob = self.__dumps({ky: tD[shardId][ky] for ky in sorted(tD[shardId])})
+                digest = hashlib.sha256(blob).hexdigest()
+                fileName = "shard-%s.pic" % shardId
+                filePath = os.path.join(self.__dirPath, fileName)
+                shardD[shardId] = {"fileName": fileName, "count": len(tD[shardId]), "digest": digest}
+                if shardId in oldShardD and oldShardD[shardId]["digest"] == digest and os.access(filePath, os.R_OK):
+                    continue
+                with open(filePath + ".tmp", "wb") as ofh:
+                    ofh.write(blob)
+                os.replace(filePath + ".tmp", filePath)
+                numWritten += 1
+            #
+            manifestD = {
+                "numShards": self.__numShards,
+                "shardBy": self.__shardBy,
+                "prefixLength": self.__prefixLength,
+                "count": sum(sD["count"] for sD in shardD.values()),
+                "attributes": attributes if attributes else {},
+                "shards": shardD,
+            }
+            with open(self.__manifestPath + ".tmp", "w", encoding="utf-8") as ofh:
+                json.dump(manifestD, ofh, indent=3)
+            os.replace(self.__manifestPath + ".tmp", self.__manifestPath)
+            self.__manifestD = manifestD
+            for shardId in set(oldShardD) - set(shardD):
+                os.remove(os.path.join(self.__dirPath, oldShardD[shardId]["fileName"]))
+            logger.info("Wrote %d of %d shards (%d objects) in %s", numWritten, len(shardD), manifestD["count"], self.__dirPath)
+            return True
+        except Exception as e:
+            logger.exception("Failing for %s with %s", self.__dirPath, str(e))
+        return False
+
+    def __readManifest(self):
+        try:
+            if os.access(self.__manifestPath, os.R_OK):
+                with open(self.__manifestPath, "r", encoding="utf-8") as ifh:
+                    return json.load(ifh)
+        except Exception as e:
+            logger.exception("Failing reading %s with %s", self.__manifestPath, str(e))
+        return {}
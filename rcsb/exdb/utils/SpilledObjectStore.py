@@ -0,0 +1,91 @@
+##
+# File: SpilledObjectStore.py
+# Date: 17-Oct-2026  dwp
+#
+# Read-only mapping over key-sorted object segments spilled to disk.
+#
+# Updates:
+#
+##
+__docformat__ = "google en"
+__author__ = "Dennis Piehl"
+__email__ = "dennis.piehl@rcsb.org"
+__license__ = "Apache 2.0"
+
+import heapq
+import logging
+import os
+import shutil
+import tempfile
+import weakref
+from collections.abc import Mapping
+
+from rcsb.exdb.utils.MappedObjectStore import MappedObjectStore
+
+logger = logging.getLogger(__name__)
+
+
+class SpilledObjectStore(Mapping):
+    """Read-only mapping of keys to objects stored in key-sorted MappedObjectStore segment files.
+
+    Segments are added with addSegment() as batches of objects exceed a memory budget.  Lookups check the
+    in-memory index of each segment and iteration merges the sorted segment keys, so keys are returned in
+    sorted order.  Keys must be unique across segments.  The segment directory is removed on close() (or
+    when the store is garbage collected) if it was created by the store.
+    """
+
+    def __init__(self, dirPath=None):
+        self.__ownsDir = dirPath is None
+        self.__dirPath = tempfile.mkdtemp(prefix="object-store-spill-") if dirPath is None else dirPath
+        if not os.path.isdir(self.__dirPath):
+            os.makedirs(self.__dirPath)
+        self.__segmentL = []
+        self.__finalizer = weakref.finalize(self, SpilledObjectStore.__cleanup, self.__segmentL, self.__dirPath if self.__ownsDir else None)
+
+    def addSegment(self, objectD):
+        """Write the input objects as a key-sorted segment file.
+
+        Args:
+            objectD (dict): dictionary of objects with keys not present in previous segments
+
+        Returns:
+            bool: True for success or False otherwise
+        """
+        filePath = os.path.join(self.__dirPath, "segment-%06d.dat" % len(self.__segmentL))
+        ok = MappedObjectStore.write(filePath, {ky: objectD[ky] for ky in sorted(objectD)})
+        if ok:
+            self.__segmentL.append(MappedObjectStore(filePath))
+            logger.debug("Spilled segment %s (%d objects)", filePath, len(objectD))
+        return ok
+
+    def getSegmentCount(self):
+        return len(self.__segmentL)
+
+    def getDirPath(self):
+        return self.__dirPath
+
+    def __getitem__(self, key):
+        for seg in self.__segmentL:
+            if key in seg:
+                return seg[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        return any(key in seg for seg in self.__segmentL)
+
+    def __iter__(self):
+        return heapq.merge(*[iter(seg) for seg in self.__segmentL])
+
+    def __len__(self):
+        return sum(len(seg) for seg in self.__segmentL)
+
+    def close(self):
+        self.__finalizer()
+
+    @staticmethod
+    def __cleanup(segmentL, dirPath):
+        for seg in segmentL:
+            seg.close()
+        del segmentL[:]
+        if dirPath:
+            shutil.rmtree(dirPath, ignore_errors=True)